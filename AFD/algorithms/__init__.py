@@ -1,7 +1,25 @@
+import logging
+
 from .shunting_yard import shunting_yard
 from .thompson import regexp_a_afn
+from .glushkov import construir_afn_glushkov, regexp_a_afn_glushkov
+from .derivatives import afd_complemento, afd_diferencia, afd_interseccion, regexp_a_afd_derivadas
 from .subset_construction import afn_a_afd
 from .hopcroft import minimizar_afd_hopcroft
-from .simulation import simular_afd_detallado
+from .simulation import simular_afd_detallado, simular_afn, simular_lote, simular_lote_numpy
+from .lazy_dfa import AFDPerezoso, regexp_a_afd_perezoso
+from .search import Buscador, construir_buscador
+from .compiler import Patron, compilar, establecer_directorio_cache, purgar
+from .alphabet import clases_equivalencia, comprimir_alfabeto
+from .syntax_tree import regexp_a_arbol, simplificar_postfix
+
+__all__ = ['shunting_yard', 'regexp_a_afn', 'construir_afn_glushkov', 'regexp_a_afn_glushkov',
+           'regexp_a_afd_derivadas', 'afd_interseccion', 'afd_complemento', 'afd_diferencia',
+           'afn_a_afd', 'minimizar_afd_hopcroft', 'simular_afd_detallado',
+           'simular_afn', 'simular_lote', 'simular_lote_numpy', 'AFDPerezoso', 'regexp_a_afd_perezoso',
+           'Buscador', 'construir_buscador',
+           'Patron', 'compilar', 'establecer_directorio_cache', 'purgar', 'clases_equivalencia', 'comprimir_alfabeto',
+           'regexp_a_arbol', 'simplificar_postfix']
 
-__all__ = ['shunting_yard', 'regexp_a_afn', 'afn_a_afd', 'minimizar_afd_hopcroft', 'simular_afd_detallado']
\ No newline at end of file
+# Los algoritmos registran su detalle con logging; sin configuración no se muestra nada
+logging.getLogger(__name__).addHandler(logging.NullHandler())
\ No newline at end of file
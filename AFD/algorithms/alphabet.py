@@ -0,0 +1,74 @@
+'''
+Compresión del alfabeto: clases de equivalencia de símbolos
+Dos símbolos son equivalentes si etiquetan exactamente los mismos pares
+(origen, destino) en todo el autómata; los algoritmos pueden trabajar con un
+representante por clase y la simulación traduce cada carácter a su clase
+'''
+from collections import defaultdict
+from typing import Dict, Tuple
+
+from models.automata import AFD, Automata, EPSILON
+
+def clases_equivalencia(automata: Automata) -> Dict[str, str]:
+    """
+    Calcula las clases de equivalencia de los símbolos del alfabeto
+    
+    Returns:
+        Mapa símbolo -> representante de su clase (el símbolo menor de la clase)
+    """
+    firmas = defaultdict(set)
+    for origen, simbolo, destino in automata.transiciones.tuplas():
+        if simbolo != EPSILON:
+            firmas[simbolo].add((origen, destino))
+    
+    representantes = {}
+    clases = {}
+    for simbolo in sorted(automata.alfabeto):
+        firma = frozenset(firmas.get(simbolo, ()))
+        clases[simbolo] = representantes.setdefault(firma, simbolo)
+    
+    return clases
+
+def componer_clases(primeras: Dict[str, str], segundas: Dict[str, str]) -> Dict[str, str]:
+    """Aplica 'segundas' (calculadas sobre los representantes de 'primeras') a cada símbolo"""
+    return {simbolo: segundas.get(representante, representante)
+            for simbolo, representante in primeras.items()}
+
+def copiar_con_transiciones(automata: Automata, transiciones) -> Automata:
+    """Crea un autómata del mismo tipo, con los mismos estados (e ids) y las transiciones dadas"""
+    copia = type(automata)()
+    for id_estado in sorted(automata.estados):
+        copia.contador_estados = id_estado
+        copia.agregar_estado(id_estado in automata.estados_aceptacion)
+    copia.contador_estados = automata.contador_estados
+    copia.establecer_inicial(automata.estado_inicial)
+    
+    for origen, simbolo, destino in transiciones:
+        copia.agregar_transicion(origen, simbolo, destino)
+    return copia
+
+def comprimir_alfabeto(automata: Automata) -> Tuple[Automata, Dict[str, str]]:
+    """
+    Retorna el autómata sobre el alfabeto comprimido (solo las transiciones de
+    los representantes) y el mapa símbolo -> representante. Si no hay símbolos
+    equivalentes retorna el mismo autómata.
+    """
+    clases = clases_equivalencia(automata)
+    if all(simbolo == representante for simbolo, representante in clases.items()):
+        return automata, clases
+    
+    transiciones = ((origen, simbolo, destino)
+                    for origen, simbolo, destino in automata.transiciones.tuplas()
+                    if simbolo == EPSILON or clases[simbolo] == simbolo)
+    return copiar_con_transiciones(automata, transiciones), clases
+
+def expandir_alfabeto(afd: AFD, clases: Dict[str, str]) -> AFD:
+    """Inverso de comprimir_alfabeto: replica cada transición para todos los símbolos de su clase"""
+    miembros = defaultdict(list)
+    for simbolo, representante in sorted(clases.items()):
+        miembros[representante].append(simbolo)
+    
+    transiciones = ((origen, miembro, destino)
+                    for origen, simbolo, destino in afd.transiciones.tuplas()
+                    for miembro in miembros.get(simbolo, [simbolo]))
+    return copiar_con_transiciones(afd, transiciones)
@@ -0,0 +1,304 @@
+'''
+Punto de entrada de compilación: regexp -> AFD (minimizado) compilado
+Los resultados se guardan en una caché LRU en memoria (como la de re.compile) y,
+si se activa con establecer_directorio_cache, en una caché en disco (formato
+binario de AFDCompilado) direccionada por contenido, para no repetir los
+algoritmos ni dentro de un proceso ni entre ejecuciones
+'''
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from models.automata import AFD, AFDCompilado, AFN, VERSION_BINARIO
+from .shunting_yard import shunting_yard
+from .syntax_tree import simplificar_postfix
+from .thompson import construir_afn_thompson
+from .glushkov import construir_afn_glushkov
+from .derivatives import construir_afd_derivadas
+from .subset_construction import afn_a_afd, optimizar_nombres_estados
+from .hopcroft import minimizar_afd_hopcroft
+from .alphabet import comprimir_alfabeto, componer_clases
+
+logger = logging.getLogger(__name__)
+
+# Cambiar al modificar cualquier algoritmo del pipeline: invalida la caché existente
+VERSION_ALGORITMOS = 4
+EXTENSION_CACHE = '.afdc'
+TAMANO_CACHE_POR_DEFECTO = 64 * 1024 * 1024
+# Máximo de patrones compilados que se conservan en memoria
+MAXIMO_CACHE_MEMORIA = 512
+# Estados del AFD a partir de los cuales se detiene la compilación (None: sin límite)
+MAXIMO_ESTADOS_AFD = 1_000_000
+# Construcciones del AFN disponibles (postfix -> AFN)
+CONSTRUCCIONES: Dict[str, Callable[[str], AFN]] = {
+    'thompson': construir_afn_thompson,
+    'glushkov': construir_afn_glushkov,
+}
+# Construcciones que producen el AFD directamente, sin AFN ((postfix, maximo_estados) -> AFD)
+CONSTRUCCIONES_AFD: Dict[str, Callable[[str, Optional[int]], AFD]] = {
+    'brzozowski': construir_afd_derivadas,
+}
+CONSTRUCCION_POR_DEFECTO = 'thompson'
+
+class CacheCompilacion:
+    """
+    Caché en disco de AFD compilados
+    
+    Cada entrada es un archivo '<sha256>.afdc' cuyo nombre se deriva de la
+    regexp normalizada (su forma postfix) y de las versiones del pipeline y del
+    formato. Los accesos actualizan la fecha de modificación y, al superar
+    'tamano_maximo' bytes, se borran las entradas usadas hace más tiempo (LRU).
+    """
+    def __init__(self, directorio: str, tamano_maximo: int = TAMANO_CACHE_POR_DEFECTO):
+        self.directorio = directorio
+        self.tamano_maximo = tamano_maximo
+    
+    @staticmethod
+    def clave(postfix: str, minimizar: bool = True, construccion: str = CONSTRUCCION_POR_DEFECTO) -> str:
+        """Clave de contenido de una regexp normalizada"""
+        contenido = f"{VERSION_ALGORITMOS}\0{VERSION_BINARIO}\0{int(minimizar)}\0{construccion}\0{postfix}"
+        return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+    
+    def ruta(self, clave: str) -> str:
+        return os.path.join(self.directorio, clave + EXTENSION_CACHE)
+    
+    def obtener(self, clave: str) -> Optional[AFDCompilado]:
+        """Retorna el AFD compilado de la caché o None si no está (o está dañado)"""
+        ruta = self.ruta(clave)
+        try:
+            compilado = AFDCompilado.cargar(ruta)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Entrada de caché descartada (%s): %s", ruta, e)
+            self._borrar(ruta)
+            return None
+        
+        try:
+            os.utime(ruta)
+        except OSError:
+            pass
+        return compilado
+    
+    def guardar(self, clave: str, compilado: AFDCompilado):
+        """Guarda una entrada (escritura atómica) y aplica el límite de tamaño"""
+        try:
+            os.makedirs(self.directorio, exist_ok=True)
+            descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix='.tmp')
+            os.close(descriptor)
+            try:
+                compilado.guardar(temporal)
+                os.replace(temporal, self.ruta(clave))
+            except BaseException:
+                self._borrar(temporal)
+                raise
+        except OSError as e:
+            logger.warning("No se pudo escribir en la caché %s: %s", self.directorio, e)
+            return
+        
+        self.recortar()
+    
+    def recortar(self, tamano_maximo: Optional[int] = None):
+        """Borra las entradas menos usadas hasta quedar dentro de tamano_maximo (por defecto el de la caché)"""
+        if tamano_maximo is None:
+            tamano_maximo = self.tamano_maximo
+        
+        entradas = []
+        try:
+            with os.scandir(self.directorio) as iterador:
+                for entrada in iterador:
+                    if entrada.name.endswith(EXTENSION_CACHE):
+                        estado = entrada.stat()
+                        entradas.append((estado.st_mtime, estado.st_size, entrada.path))
+        except OSError:
+            return
+        
+        total = sum(tamano for _, tamano, _ in entradas)
+        for _, tamano, ruta in sorted(entradas):
+            if total <= tamano_maximo:
+                break
+            self._borrar(ruta)
+            total -= tamano
+    
+    def limpiar(self):
+        """Borra todas las entradas de la caché"""
+        self.recortar(tamano_maximo=0)
+    
+    @staticmethod
+    def _borrar(ruta: str):
+        try:
+            os.remove(ruta)
+        except OSError:
+            pass
+
+# La caché en disco está desactivada hasta que se elija un directorio
+_cache_por_defecto: Optional[CacheCompilacion] = None
+
+def establecer_directorio_cache(directorio: Optional[str], tamano_maximo: int = TAMANO_CACHE_POR_DEFECTO):
+    """
+    Activa la caché en disco que usa compilar() cuando no se le pasa una,
+    en 'directorio'; con None (el valor inicial) se desactiva
+    """
+    global _cache_por_defecto
+    _cache_por_defecto = CacheCompilacion(directorio, tamano_maximo) if directorio else None
+
+def cache_por_defecto() -> Optional[CacheCompilacion]:
+    """Caché en disco activada con establecer_directorio_cache (None si está desactivada)"""
+    return _cache_por_defecto
+
+class Patron:
+    """
+    Regexp compilada e inmutable (análoga a re.Pattern)
+    
+    Guarda una copia inmutable del AFDCompilado recibido (ver
+    AFDCompilado.solo_lectura), de modo que el mismo objeto se puede compartir
+    entre hilos y desde la caché sin que nadie modifique sus tablas.
+    Como compilar() retorna ese AFD compilado, se puede pasar a las funciones
+    que esperan un AFD (simular_lote, simular_flujo, Buscador, ...).
+    """
+    __slots__ = ('patron', 'minimizado', '_afd')
+    
+    def __init__(self, patron: str, minimizado: bool, afd: AFDCompilado):
+        afd = afd.solo_lectura()
+        object.__setattr__(self, 'patron', patron)
+        object.__setattr__(self, 'minimizado', minimizado)
+        object.__setattr__(self, '_afd', afd)
+    
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("Patron es inmutable")
+    
+    def __delattr__(self, nombre):
+        raise AttributeError("Patron es inmutable")
+    
+    def __repr__(self):
+        return f"Patron({self.patron!r}, estados={self.num_estados})"
+    
+    @property
+    def num_estados(self) -> int:
+        return len(self._afd.estados)
+    
+    def compilar(self) -> AFDCompilado:
+        """Retorna el AFD compilado (inmutable)"""
+        return self._afd
+    
+    def acepta(self, cadena: str) -> bool:
+        """Retorna si la cadena completa pertenece al lenguaje"""
+        return self._afd.acepta(cadena)
+    
+    def simular(self, cadena: str) -> Tuple[bool, List[int]]:
+        """Retorna si es aceptada y la secuencia de estados (ver AFDCompilado.simular)"""
+        return self._afd.simular(cadena)
+
+_cache_memoria: 'OrderedDict[Tuple[str, bool, str], Patron]' = OrderedDict()
+_candado_cache = threading.Lock()
+
+def construir_afn(postfix: str, construccion: str = CONSTRUCCION_POR_DEFECTO) -> AFN:
+    """Construye el AFN de una regexp en postfix con la construcción indicada ('thompson' o 'glushkov')"""
+    try:
+        construir = CONSTRUCCIONES[construccion]
+    except KeyError:
+        raise ValueError(f"Construcción desconocida: {construccion} "
+                         f"(disponibles: {', '.join(CONSTRUCCIONES)})") from None
+    return construir(postfix)
+
+def construir_afd_compilado(postfix: str, minimizar: bool = True,
+                            construccion: str = CONSTRUCCION_POR_DEFECTO,
+                            maximo_estados: Optional[int] = MAXIMO_ESTADOS_AFD) -> AFDCompilado:
+    """
+    Thompson (o Glushkov) -> Subconjuntos (-> Hopcroft) sobre una regexp en postfix;
+    con construccion='brzozowski' el AFD sale directamente de las derivadas
+    
+    Ambos algoritmos trabajan sobre el alfabeto comprimido (un representante
+    por clase de símbolos equivalentes). Las clases se recalculan después de
+    cada etapa, porque al fusionarse estados se vuelven equivalentes más
+    símbolos, y el AFD compilado traduce cada carácter a la columna de su clase
+    
+    Si el AFD sin minimizar supera maximo_estados la construcción se detiene
+    con ValueError, antes de terminar de crecer
+    """
+    if construccion in CONSTRUCCIONES_AFD:
+        afd = optimizar_nombres_estados(CONSTRUCCIONES_AFD[construccion](postfix, maximo_estados))
+        afd, clases = comprimir_alfabeto(afd)
+    else:
+        afn, clases = comprimir_alfabeto(construir_afn(postfix, construccion))
+        afd = optimizar_nombres_estados(afn_a_afd(afn, maximo_estados=maximo_estados))
+    if minimizar:
+        afd, clases_afd = comprimir_alfabeto(afd)
+        clases = componer_clases(clases, clases_afd)
+        afd = optimizar_nombres_estados(minimizar_afd_hopcroft(afd))
+    
+    afd, clases_afd = comprimir_alfabeto(afd)
+    clases = componer_clases(clases, clases_afd)
+    return AFDCompilado(afd, clases)
+
+def compilar_afd(regexp: str, minimizar: bool = True, cache: Optional[CacheCompilacion] = None,
+                 construccion: str = CONSTRUCCION_POR_DEFECTO,
+                 maximo_estados: Optional[int] = MAXIMO_ESTADOS_AFD) -> AFDCompilado:
+    """Compila una regexp a AFDCompilado consultando primero la caché en disco"""
+    # La forma postfix simplificada normaliza la regexp (paréntesis redundantes,
+    # alternativas repetidas, etc.): expresiones equivalentes comparten entrada
+    postfix = simplificar_postfix(shunting_yard(regexp))
+    
+    if cache is None:
+        cache = cache_por_defecto()
+    if cache is None:
+        return construir_afd_compilado(postfix, minimizar, construccion, maximo_estados)
+    
+    clave = CacheCompilacion.clave(postfix, minimizar, construccion)
+    compilado = cache.obtener(clave)
+    if compilado is not None:
+        logger.debug("Caché: %s encontrado (%s)", regexp, clave[:12])
+        return compilado
+    
+    logger.debug("Caché: %s no encontrado, compilando", regexp)
+    compilado = construir_afd_compilado(postfix, minimizar, construccion, maximo_estados)
+    cache.guardar(clave, compilado)
+    return compilado
+
+def compilar(regexp: str, minimizar: bool = True, cache: Optional[CacheCompilacion] = None,
+             construccion: str = CONSTRUCCION_POR_DEFECTO,
+             maximo_estados: Optional[int] = MAXIMO_ESTADOS_AFD) -> Patron:
+    """
+    Compila una regexp a un Patron inmutable, reutilizando compilaciones previas
+    
+    Primero se busca en la caché LRU en memoria (segura entre hilos); si no
+    está, en la caché en disco (si hay una activa), y solo si tampoco está se
+    ejecutan los algoritmos.
+    
+    Args:
+        regexp: Expresión regular a compilar
+        minimizar: Si minimizar el AFD con Hopcroft
+        cache: Caché en disco a usar (por defecto la de establecer_directorio_cache, si está activa)
+        construccion: 'thompson', 'glushkov' (AFN sin transiciones ε) o 'brzozowski'
+                      (AFD directo por derivadas, sin AFN)
+        maximo_estados: Máximo de estados del AFD antes de detener la compilación
+                        con ValueError (None: sin límite)
+    
+    Returns:
+        Patron con el AFD compilado, listo para simular
+    """
+    clave = (regexp, minimizar, construccion)
+    with _candado_cache:
+        patron = _cache_memoria.get(clave)
+        if patron is not None:
+            _cache_memoria.move_to_end(clave)
+            return patron
+    
+    # Se compila fuera del candado; si otro hilo compiló lo mismo, se usa el suyo
+    patron = Patron(regexp, minimizar, compilar_afd(regexp, minimizar, cache, construccion, maximo_estados))
+    
+    with _candado_cache:
+        patron = _cache_memoria.setdefault(clave, patron)
+        _cache_memoria.move_to_end(clave)
+        while len(_cache_memoria) > MAXIMO_CACHE_MEMORIA:
+            _cache_memoria.popitem(last=False)
+    return patron
+
+def purgar():
+    """Vacía la caché en memoria de patrones compilados (como re.purge)"""
+    with _candado_cache:
+        _cache_memoria.clear()
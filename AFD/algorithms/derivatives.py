@@ -0,0 +1,438 @@
+'''
+Construcción directa de AFD con derivadas de Brzozowski
+Árbol sintáctico -> AFD, sin pasar por un AFN
+
+La derivada de r respecto de a es la expresión del resto de las cadenas de r
+que empiezan con a; cada estado del AFD es una expresión distinta, y es de
+aceptación si acepta la cadena vacía. Los constructores normalizan las
+expresiones (asociatividad, conmutatividad e idempotencia de la unión y la
+intersección, ∅ y ε como neutros o absorbentes) para que el número de
+derivadas distintas sea finito y cercano al del AFD mínimo. A diferencia de
+Thompson, admite directamente intersección y complemento.
+'''
+import logging
+
+from collections import deque
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from models.automata import AFD
+from .shunting_yard import shunting_yard
+from .subset_construction import LIMITE_ADVERTENCIA_AFD
+from .syntax_tree import (CONCAT, ESTRELLA, MAS, NODO_EPSILON, UNION, Nodo, construir_arbol,
+                          simplificar)
+from .tokenizer import CLASE, REPETICION, SIMBOLO, UNIVERSO, Token, tokenizar
+
+logger = logging.getLogger(__name__)
+
+VACIO = 'VACIO'
+INTERSECCION = 'INTERSECCION'
+COMPLEMENTO = 'COMPLEMENTO'
+
+# ∅ (no acepta nada) y su complemento Σ* (acepta todo)
+NODO_VACIO = Nodo(VACIO)
+NODO_TODO = Nodo(COMPLEMENTO, hijos=(NODO_VACIO,))
+
+# Las derivadas y la simplificación recorren el árbol recursivamente en profundidad
+MENSAJE_ANIDAMIENTO = "La expresión está demasiado anidada para construir el AFD por derivadas"
+
+class Derivador:
+    """
+    Constructores normalizados y derivadas de expresiones regulares
+    
+    Los nodos se internan: cada expresión distinta recibe un índice según el
+    orden en que aparece, y los operandos de uniones e intersecciones se
+    ordenan por ese índice (forma canónica determinista entre ejecuciones)
+    """
+    def __init__(self):
+        self._indices: Dict[Nodo, int] = {}
+        self._derivadas: Dict[Tuple[Nodo, str], Nodo] = {}
+        self._anulables: Dict[Nodo, bool] = {}
+    
+    def internar(self, nodo: Nodo) -> Nodo:
+        self._indices.setdefault(nodo, len(self._indices))
+        return nodo
+    
+    def _ordenar(self, nodos) -> Tuple[Nodo, ...]:
+        return tuple(sorted(nodos, key=lambda nodo: self._indices[self.internar(nodo)]))
+    
+    # ---------------------------------------------------------------------
+    # Constructores inteligentes
+    # ---------------------------------------------------------------------
+    
+    def hoja(self, simbolos: FrozenSet[str]) -> Nodo:
+        if not simbolos:
+            return NODO_VACIO
+        if len(simbolos) == 1:
+            return self.internar(Nodo(SIMBOLO, next(iter(simbolos))))
+        return self.internar(Nodo(CLASE, (False, frozenset(simbolos))))
+    
+    def concatenacion(self, nodos: List[Nodo]) -> Nodo:
+        """∅·r = ∅, ε·r = r y concatenaciones anidadas aplanadas"""
+        operandos = []
+        for nodo in nodos:
+            if nodo.tipo == VACIO:
+                return NODO_VACIO
+            if nodo.tipo == CONCAT:
+                operandos.extend(nodo.hijos)
+            elif not nodo.es_epsilon():
+                operandos.append(nodo)
+        
+        if not operandos:
+            return NODO_EPSILON
+        if len(operandos) == 1:
+            return operandos[0]
+        return self.internar(Nodo(CONCAT, hijos=tuple(operandos)))
+    
+    def union(self, nodos: List[Nodo]) -> Nodo:
+        """Asociativa, conmutativa e idempotente; ∅ es neutro y Σ* absorbente"""
+        operandos = set()
+        for nodo in nodos:
+            if nodo == NODO_TODO:
+                return NODO_TODO
+            if nodo.tipo == UNION:
+                operandos.update(nodo.hijos)
+            elif nodo.tipo != VACIO:
+                operandos.add(nodo)
+        
+        if not operandos:
+            return NODO_VACIO
+        if len(operandos) == 1:
+            return operandos.pop()
+        return self.internar(Nodo(UNION, hijos=self._ordenar(operandos)))
+    
+    def interseccion(self, nodos: List[Nodo]) -> Nodo:
+        """Asociativa, conmutativa e idempotente; Σ* es neutro y ∅ absorbente"""
+        operandos = set()
+        for nodo in nodos:
+            if nodo.tipo == VACIO:
+                return NODO_VACIO
+            if nodo.tipo == INTERSECCION:
+                operandos.update(nodo.hijos)
+            elif nodo != NODO_TODO:
+                operandos.add(nodo)
+        
+        if not operandos:
+            return NODO_TODO
+        if len(operandos) == 1:
+            return operandos.pop()
+        return self.internar(Nodo(INTERSECCION, hijos=self._ordenar(operandos)))
+    
+    def complemento(self, nodo: Nodo) -> Nodo:
+        """¬¬r = r"""
+        if nodo.tipo == COMPLEMENTO:
+            return nodo.hijos[0]
+        return self.internar(Nodo(COMPLEMENTO, hijos=(nodo,)))
+    
+    def estrella(self, nodo: Nodo) -> Nodo:
+        """∅* = ε* = ε y (r*)* = r*"""
+        if nodo.tipo == VACIO or nodo.es_epsilon():
+            return NODO_EPSILON
+        if nodo.tipo == ESTRELLA:
+            return nodo
+        return self.internar(Nodo(ESTRELLA, hijos=(nodo,)))
+    
+    def repeticion(self, nodo: Nodo, minimo: int, maximo: Optional[int]) -> Nodo:
+        """r{0,0} = ε, r{1,1} = r, r{0,} = r*; si r acepta ε, r{m,n} = r{0,n}"""
+        if self.anulable(nodo):
+            minimo = 0
+        if maximo == 0 or nodo.tipo == VACIO or nodo.es_epsilon():
+            return NODO_VACIO if nodo.tipo == VACIO and minimo > 0 else NODO_EPSILON
+        if minimo == 1 and maximo == 1:
+            return nodo
+        if minimo == 0 and maximo is None:
+            return self.estrella(nodo)
+        return self.internar(Nodo(REPETICION, (minimo, maximo), (nodo,)))
+    
+    def desde_arbol(self, nodo: Nodo) -> Nodo:
+        """
+        Convierte un árbol de syntax_tree a la forma normalizada (r+ = r·r*)
+        
+        Se recorre en postorden con una pila explícita, así la profundidad del
+        árbol no está limitada por la de la recursión de Python
+        """
+        convertidos: Dict[int, Nodo] = {}
+        pendientes = [(nodo, False)]
+        while pendientes:
+            actual, listo = pendientes.pop()
+            if id(actual) in convertidos:
+                continue
+            if listo or actual.es_hoja():
+                convertidos[id(actual)] = self._desde_nodo(actual, convertidos)
+            else:
+                pendientes.append((actual, True))
+                pendientes.extend((hijo, False) for hijo in actual.hijos)
+        return convertidos[id(nodo)]
+    
+    def _desde_nodo(self, nodo: Nodo, convertidos: Dict[int, Nodo]) -> Nodo:
+        """Convierte un nodo cuyos hijos ya están en 'convertidos' (ver desde_arbol)"""
+        if nodo.es_hoja():
+            if nodo.es_epsilon():
+                return NODO_EPSILON
+            return self.hoja(Token(nodo.tipo, nodo.valor).simbolos())
+        
+        hijos = [convertidos[id(hijo)] for hijo in nodo.hijos]
+        if nodo.tipo == CONCAT:
+            return self.concatenacion(hijos)
+        if nodo.tipo == UNION:
+            return self.union(hijos)
+        if nodo.tipo == ESTRELLA:
+            return self.estrella(hijos[0])
+        if nodo.tipo == MAS:
+            return self.concatenacion([hijos[0], self.estrella(hijos[0])])
+        if nodo.tipo == REPETICION:
+            return self.repeticion(hijos[0], *nodo.valor)
+        raise ValueError(f"Nodo desconocido: {nodo.tipo}")
+    
+    # ---------------------------------------------------------------------
+    # Anulabilidad y derivadas
+    # ---------------------------------------------------------------------
+    
+    def anulable(self, nodo: Nodo) -> bool:
+        """Retorna si la expresión acepta la cadena vacía (memorizado, sin recursión)"""
+        anulables = self._anulables
+        resultado = anulables.get(nodo)
+        if resultado is not None:
+            return resultado
+        
+        # Postorden con pila explícita: cada nodo se evalúa cuando sus hijos ya lo están
+        pendientes = [(nodo, False)]
+        while pendientes:
+            actual, listo = pendientes.pop()
+            if actual in anulables:
+                continue
+            if not listo and actual.hijos:
+                pendientes.append((actual, True))
+                pendientes.extend((hijo, False) for hijo in actual.hijos if hijo not in anulables)
+                continue
+            
+            tipo = actual.tipo
+            if tipo in (SIMBOLO, CLASE):
+                anulables[actual] = actual.es_epsilon()
+            elif tipo == VACIO:
+                anulables[actual] = False
+            elif tipo == ESTRELLA:
+                anulables[actual] = True
+            elif tipo in (CONCAT, INTERSECCION):
+                anulables[actual] = all(anulables[hijo] for hijo in actual.hijos)
+            elif tipo == UNION:
+                anulables[actual] = any(anulables[hijo] for hijo in actual.hijos)
+            elif tipo == COMPLEMENTO:
+                anulables[actual] = not anulables[actual.hijos[0]]
+            else:
+                anulables[actual] = actual.valor[0] == 0 or anulables[actual.hijos[0]]
+        
+        return anulables[nodo]
+    
+    def derivada(self, nodo: Nodo, simbolo: str) -> Nodo:
+        """Derivada de Brzozowski de la expresión respecto de un símbolo (memorizada)"""
+        clave = (nodo, simbolo)
+        resultado = self._derivadas.get(clave)
+        if resultado is None:
+            resultado = self._derivar(nodo, simbolo)
+            self._derivadas[clave] = resultado
+        return resultado
+    
+    def _derivar(self, nodo: Nodo, simbolo: str) -> Nodo:
+        tipo = nodo.tipo
+        if tipo == VACIO or nodo.es_epsilon():
+            return NODO_VACIO
+        if tipo in (SIMBOLO, CLASE):
+            return NODO_EPSILON if simbolo in Token(tipo, nodo.valor).simbolos() else NODO_VACIO
+        
+        if tipo == CONCAT:
+            # d(r·s) = d(r)·s ∪ (d(s) si r acepta ε). Con una racha de operandos
+            # anulables al inicio, en lugar de recurrir una vez por operando se
+            # recorren los sufijos de derecha a izquierda, memorizando cada uno
+            hijos = nodo.hijos
+            fin = 0
+            while fin < len(hijos) - 1 and self.anulable(hijos[fin]):
+                fin += 1
+            sufijos = [nodo] + [self.concatenacion(list(hijos[i:])) for i in range(1, fin + 2)]
+            
+            # sufijos[fin] empieza con un operando no anulable (o es el último)
+            derivada = self.concatenacion([self.derivada(hijos[fin], simbolo), sufijos[fin + 1]])
+            for i in range(fin - 1, -1, -1):
+                self._derivadas[(sufijos[i + 1], simbolo)] = derivada
+                derivada = self.union([self.concatenacion([self.derivada(hijos[i], simbolo), sufijos[i + 1]]),
+                                       derivada])
+            return derivada
+        
+        if tipo == UNION:
+            return self.union([self.derivada(hijo, simbolo) for hijo in nodo.hijos])
+        if tipo == INTERSECCION:
+            return self.interseccion([self.derivada(hijo, simbolo) for hijo in nodo.hijos])
+        if tipo == COMPLEMENTO:
+            return self.complemento(self.derivada(nodo.hijos[0], simbolo))
+        if tipo == ESTRELLA:
+            return self.concatenacion([self.derivada(nodo.hijos[0], simbolo), nodo])
+        
+        # Repetición: d(r{m,n}) = d(r)·r{m-1,n-1}
+        minimo, maximo = nodo.valor
+        hijo = nodo.hijos[0]
+        resto = self.repeticion(hijo, max(minimo - 1, 0), None if maximo is None else maximo - 1)
+        return self.concatenacion([self.derivada(hijo, simbolo), resto])
+
+def particion_alfabeto(nodo: Nodo) -> List[FrozenSet[str]]:
+    """
+    Particiona el alfabeto en clases de símbolos con la misma derivada
+    
+    Dos símbolos que pertenecen exactamente a las mismas hojas producen las
+    mismas derivadas, así que basta derivar respecto de un representante por
+    clase. Si la expresión tiene complementos, el alfabeto es UNIVERSO más los
+    símbolos de las hojas (¬r también acepta los símbolos que r no menciona)
+    """
+    conjuntos: List[FrozenSet[str]] = []
+    hay_complemento = False
+    pendientes = [nodo]
+    vistos: Set[Nodo] = set()
+    while pendientes:
+        actual = pendientes.pop()
+        if actual in vistos:
+            continue
+        vistos.add(actual)
+        if actual.tipo == COMPLEMENTO:
+            hay_complemento = True
+        if actual.es_hoja() and not actual.es_epsilon():
+            conjuntos.append(Token(actual.tipo, actual.valor).simbolos())
+        pendientes.extend(actual.hijos)
+    
+    alfabeto = frozenset().union(*conjuntos)
+    if hay_complemento:
+        alfabeto |= UNIVERSO
+    
+    bloques = [alfabeto] if alfabeto else []
+    for conjunto in set(conjuntos):
+        refinados = []
+        for bloque in bloques:
+            dentro = bloque & conjunto
+            fuera = bloque - conjunto
+            refinados.extend(parte for parte in (dentro, fuera) if parte)
+        bloques = refinados
+    
+    return sorted(bloques, key=min)
+
+def construir_afd_desde_expresion(expresion: Nodo, derivador: Derivador,
+                                  maximo_estados: Optional[int] = None) -> AFD:
+    """
+    Construye el AFD cuyos estados son las derivadas distintas de 'expresion'
+    
+    El estado ∅ (sin cadenas aceptadas) no se crea: el AFD es parcial, como
+    el que produce Hopcroft. Con maximo_estados la construcción se detiene con
+    ValueError al superarlo
+    """
+    afd = AFD()
+    bloques = particion_alfabeto(expresion)
+    
+    estados: Dict[Nodo, int] = {}
+    inicial = afd.agregar_estado(derivador.anulable(expresion))
+    afd.establecer_inicial(inicial)
+    estados[expresion] = inicial
+    cola = deque([expresion])
+    
+    while cola:
+        actual = cola.popleft()
+        origen = estados[actual]
+        for bloque in bloques:
+            try:
+                derivada = derivador.derivada(actual, min(bloque))
+            except RecursionError:
+                raise ValueError(MENSAJE_ANIDAMIENTO) from None
+            if derivada.tipo == VACIO:
+                continue
+            
+            destino = estados.get(derivada)
+            if destino is None:
+                destino = afd.agregar_estado(derivador.anulable(derivada))
+                estados[derivada] = destino
+                cola.append(derivada)
+                if destino == LIMITE_ADVERTENCIA_AFD:
+                    logger.warning("Las derivadas superaron %d estados; el AFD puede ser muy grande",
+                                   LIMITE_ADVERTENCIA_AFD)
+                if maximo_estados is not None and destino >= maximo_estados:
+                    raise ValueError(f"El AFD por derivadas superó {maximo_estados} estados; "
+                                     f"construcción detenida")
+            
+            for simbolo in sorted(bloque):
+                afd.agregar_transicion(origen, simbolo, destino)
+    
+    logger.debug("AFD por derivadas: %d estados, %d clases de símbolos", len(afd.estados), len(bloques))
+    return afd
+
+def construir_afd_derivadas(postfix: str, maximo_estados: Optional[int] = None) -> AFD:
+    """
+    Construye un AFD (casi mínimo) a partir de una expresión regular en
+    postfix con derivadas de Brzozowski, sin construir un AFN
+    """
+    derivador = Derivador()
+    expresion = _expresion_de_postfix(postfix, derivador)
+    return construir_afd_desde_expresion(expresion, derivador, maximo_estados)
+
+def _expresion_de_postfix(postfix: str, derivador: Derivador) -> Nodo:
+    arbol = construir_arbol(list(tokenizar(postfix, postfix=True)))
+    if arbol is None:
+        return NODO_VACIO
+    try:
+        return derivador.desde_arbol(simplificar(arbol))
+    except RecursionError:
+        raise ValueError(MENSAJE_ANIDAMIENTO) from None
+
+def _expresion_de_regexp(regexp: str, derivador: Derivador) -> Nodo:
+    return _expresion_de_postfix(shunting_yard(regexp), derivador)
+
+def regexp_a_afd_derivadas(regexp: str) -> AFD:
+    """Convierte una regexp a AFD con derivadas de Brzozowski"""
+    logger.info("Convirtiendo regexp (derivadas): %s", regexp)
+    return construir_afd_derivadas(shunting_yard(regexp))
+
+def afd_interseccion(*regexps: str) -> AFD:
+    """AFD que acepta las cadenas aceptadas por todas las regexps"""
+    derivador = Derivador()
+    expresion = derivador.interseccion([_expresion_de_regexp(regexp, derivador) for regexp in regexps])
+    return construir_afd_desde_expresion(expresion, derivador)
+
+def afd_complemento(regexp: str) -> AFD:
+    """
+    AFD que acepta las cadenas que la regexp no acepta
+    
+    El complemento es relativo a Σ*, con Σ = UNIVERSO más los símbolos que
+    aparecen en la regexp
+    """
+    derivador = Derivador()
+    expresion = derivador.complemento(_expresion_de_regexp(regexp, derivador))
+    return construir_afd_desde_expresion(expresion, derivador)
+
+def afd_diferencia(regexp: str, excluida: str) -> AFD:
+    """AFD que acepta las cadenas de 'regexp' que 'excluida' no acepta (r ∩ ¬s)"""
+    derivador = Derivador()
+    expresion = derivador.interseccion([_expresion_de_regexp(regexp, derivador),
+                                        derivador.complemento(_expresion_de_regexp(excluida, derivador))])
+    return construir_afd_desde_expresion(expresion, derivador)
+
+def probar_derivadas():
+    """Compara el AFD por derivadas con el de subconjuntos + Hopcroft"""
+    from .thompson import regexp_a_afn
+    from .subset_construction import afn_a_afd
+    from .hopcroft import minimizar_afd_hopcroft
+    
+    casos_prueba = [
+        "a",
+        "(a|b)*abb",
+        "(ab|a)*b{2,3}",
+        "(a|b)*a(a|b)(a|b)",
+        "if|in|int|for|float",
+    ]
+    
+    for caso in casos_prueba:
+        afd_derivadas = regexp_a_afd_derivadas(caso)
+        afd_subconjuntos = afn_a_afd(regexp_a_afn(caso))
+        afd_minimo = minimizar_afd_hopcroft(afd_subconjuntos)
+        print(f"{caso:22} derivadas: {len(afd_derivadas.estados):3} | "
+              f"subconjuntos: {len(afd_subconjuntos.estados):3} | mínimo: {len(afd_minimo.estados):3}")
+    
+    afd = afd_interseccion("(a|b)*a(a|b)*", "(a|b)*b(a|b)*")
+    print(f"Intersección (contiene a y b): {len(afd.estados)} estados")
+    afd = afd_complemento("(a|b)*abb")
+    print(f"Complemento de (a|b)*abb: {len(afd.estados)} estados")
+
+if __name__ == "__main__":
+    probar_derivadas()
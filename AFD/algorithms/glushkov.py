@@ -0,0 +1,163 @@
+'''
+Construcción de Glushkov (autómata de posiciones) para construir un AFN sin
+transiciones ε a partir de una expresión regular en postfix
+Cada hoja del árbol sintáctico es una posición (un estado); el estado 0 es el
+inicial y las transiciones salen de los conjuntos primeros/últimos/siguientes
+'''
+import logging
+
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from models.automata import AFN
+from .shunting_yard import shunting_yard
+from .syntax_tree import (CONCAT, ESTRELLA, MAS, UNION, Nodo, construir_arbol,
+                          simplificar)
+from .tokenizer import REPETICION, Token, tokenizar
+
+logger = logging.getLogger(__name__)
+
+# (anulable, primeros, últimos) de un subárbol
+Conjuntos = Tuple[bool, Set[int], Set[int]]
+
+class PosicionesGlushkov:
+    """
+    Acumula las posiciones y la relación 'siguientes' mientras se recorre el árbol
+    
+    Cada visita a una hoja crea una posición nueva, por lo que una repetición
+    {m,n} se expande recorriendo su subárbol una vez por copia
+    """
+    def __init__(self):
+        # simbolos[p - 1]: símbolos que llevan a la posición p (la 0 es el estado inicial)
+        self.simbolos: List[FrozenSet[str]] = []
+        self.siguientes: Dict[int, Set[int]] = {}
+    
+    def enlazar(self, ultimos: Set[int], primeros: Set[int]):
+        """Agrega los pares (p, q) con p en 'ultimos' y q en 'primeros' a siguientes"""
+        if not primeros:
+            return
+        for posicion in ultimos:
+            self.siguientes.setdefault(posicion, set()).update(primeros)
+    
+    def concatenar(self, izquierdo: Conjuntos, derecho: Conjuntos) -> Conjuntos:
+        anulable_izq, primeros_izq, ultimos_izq = izquierdo
+        anulable_der, primeros_der, ultimos_der = derecho
+        self.enlazar(ultimos_izq, primeros_der)
+        primeros = primeros_izq | primeros_der if anulable_izq else primeros_izq
+        ultimos = ultimos_izq | ultimos_der if anulable_der else ultimos_der
+        return anulable_izq and anulable_der, primeros, ultimos
+    
+    def recorrer(self, nodo: Nodo) -> Conjuntos:
+        """Calcula (anulable, primeros, últimos) del nodo y completa 'siguientes'"""
+        if nodo.es_hoja():
+            if nodo.es_epsilon():
+                return True, set(), set()
+            self.simbolos.append(Token(nodo.tipo, nodo.valor).simbolos())
+            posicion = len(self.simbolos)
+            return False, {posicion}, {posicion}
+        
+        if nodo.tipo == CONCAT:
+            resultado = self.recorrer(nodo.hijos[0])
+            for hijo in nodo.hijos[1:]:
+                resultado = self.concatenar(resultado, self.recorrer(hijo))
+            return resultado
+        
+        if nodo.tipo == UNION:
+            anulable, primeros, ultimos = False, set(), set()
+            for hijo in nodo.hijos:
+                anulable_hijo, primeros_hijo, ultimos_hijo = self.recorrer(hijo)
+                anulable = anulable or anulable_hijo
+                primeros |= primeros_hijo
+                ultimos |= ultimos_hijo
+            return anulable, primeros, ultimos
+        
+        if nodo.tipo in (ESTRELLA, MAS):
+            anulable, primeros, ultimos = self.recorrer(nodo.hijos[0])
+            # Bucle: después de terminar el subárbol se puede volver a empezar
+            self.enlazar(ultimos, primeros)
+            return anulable or nodo.tipo == ESTRELLA, primeros, ultimos
+        
+        if nodo.tipo == REPETICION:
+            return self.repetir(nodo.hijos[0], *nodo.valor)
+        
+        raise ValueError(f"Nodo desconocido: {nodo.tipo}")
+    
+    def repetir(self, hijo: Nodo, minimo: int, maximo: Optional[int]) -> Conjuntos:
+        """
+        r{m,n} = r...r (m copias) seguido de n - m copias de (r|ε);
+        en r{m,} la última copia lleva el bucle de r+ (o de r* si m = 0)
+        """
+        resultado: Conjuntos = (True, set(), set())
+        copias = max(minimo, 1) if maximo is None else maximo
+        for i in range(copias):
+            anulable, primeros, ultimos = self.recorrer(hijo)
+            if maximo is None and i == copias - 1:
+                self.enlazar(ultimos, primeros)
+            # Las copias que superan el mínimo son opcionales
+            anulable = anulable or i >= minimo
+            resultado = self.concatenar(resultado, (anulable, primeros, ultimos))
+        return resultado
+
+def construir_afn_glushkov(postfix: str) -> AFN:
+    """
+    Construye un AFN sin transiciones ε a partir de una expresión regular en
+    postfix usando la construcción de Glushkov
+    
+    El AFN tiene n + 1 estados (n = número de símbolos y clases de la
+    expresión): todas las transiciones que entran a una posición llevan sus
+    símbolos, así que la construcción de subconjuntos no calcula clausuras
+    """
+    afn = AFN()
+    arbol = construir_arbol(list(tokenizar(postfix, postfix=True)))
+    inicial = afn.agregar_estado()
+    afn.establecer_inicial(inicial)
+    if arbol is None:
+        return afn
+    
+    posiciones = PosicionesGlushkov()
+    anulable, primeros, ultimos = posiciones.recorrer(simplificar(arbol))
+    
+    for _ in posiciones.simbolos:
+        afn.agregar_estado()
+    
+    posiciones.siguientes[inicial] = primeros
+    for origen in sorted(posiciones.siguientes):
+        for destino in sorted(posiciones.siguientes[origen]):
+            for simbolo in sorted(posiciones.simbolos[destino - 1]):
+                afn.agregar_transicion(origen, simbolo, destino)
+    
+    for posicion in ultimos:
+        afn.establecer_aceptacion(posicion)
+    if anulable:
+        afn.establecer_aceptacion(inicial)
+    
+    return afn
+
+def regexp_a_afn_glushkov(regexp: str) -> AFN:
+    """Convierte una regexp a un AFN sin ε (autómata de posiciones)"""
+    logger.info("Convirtiendo regexp (Glushkov): %s", regexp)
+    postfix = shunting_yard(regexp)
+    logger.info("Postfix: %s", postfix)
+    return construir_afn_glushkov(postfix)
+
+def probar_glushkov():
+    """Compara el tamaño de los AFN de Thompson y Glushkov"""
+    from .thompson import regexp_a_afn
+    
+    casos_prueba = [
+        "a",
+        "a|b",
+        "a*",
+        "(a|b)*abb",
+        "(ab|a)*b{2,3}",
+    ]
+    
+    for caso in casos_prueba:
+        afn_thompson = regexp_a_afn(caso)
+        afn_glushkov = regexp_a_afn_glushkov(caso)
+        print(f"{caso:16} Thompson: {len(afn_thompson.estados):3} estados, "
+              f"{len(afn_thompson.transiciones):3} transiciones | "
+              f"Glushkov: {len(afn_glushkov.estados):3} estados, "
+              f"{len(afn_glushkov.transiciones):3} transiciones")
+
+if __name__ == "__main__":
+    probar_glushkov()
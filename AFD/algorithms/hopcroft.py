@@ -2,12 +2,15 @@
 Algoritmo de Hopcroft para minimizar un AFD - Versión mejorada con eliminación de estados muertos
 '''
 
+import logging
 from collections import defaultdict, deque
-from typing import List, Optional, Set
+from typing import Optional, Set
 from .subset_construction import afn_a_afd, mostrar_tabla_transiciones, optimizar_nombres_estados
 from .thompson import regexp_a_afn
 from models.automata import AFD
 
+logger = logging.getLogger(__name__)
+
 class Particion:
     """Representa una partición de estados para el algoritmo de Hopcroft"""
     def __init__(self):
@@ -28,16 +31,19 @@ class Particion:
         """Obtiene el grupo al que pertenece un estado"""
         return self.estado_a_grupo.get(estado, -1)
     
-    def dividir_grupo(self, grupo_id: int, nuevos_grupos: List[Set[int]]):
-        """Divide un grupo en varios grupos nuevos"""
-        # Remover el grupo original
-        for estado in self.grupos[grupo_id]:
-            del self.estado_a_grupo[estado]
-        
-        # Agregar los nuevos grupos
-        for nuevo_grupo in nuevos_grupos:
-            if nuevo_grupo:  # Solo si no está vacío
-                self.agregar_grupo(nuevo_grupo)
+    def separar(self, grupo_id: int, estados: Set[int]) -> int:
+        """
+        Mueve 'estados' (subconjunto propio del grupo) a un grupo nuevo, en sitio.
+        Cuesta O(|estados|) y retorna el índice del grupo nuevo.
+        """
+        self.grupos[grupo_id].difference_update(estados)
+        return self.agregar_grupo(estados)
+    
+    def quitar_estado(self, estado: int):
+        """Quita un estado de la partición"""
+        grupo_id = self.estado_a_grupo.pop(estado, -1)
+        if grupo_id != -1:
+            self.grupos[grupo_id].discard(estado)
     
     def __len__(self):
         return len(self.grupos)
@@ -51,43 +57,49 @@ def eliminar_estados_muertos(afd: AFD, mostrar_detalles: bool = True) -> AFD:
     
     Args:
         afd: El AFD del cual eliminar estados muertos
-        mostrar_detalles: Si mostrar información del proceso
+        mostrar_detalles: Si registrar el detalle del proceso en el logger del módulo
     
     Returns:
         AFD sin estados muertos
     """
+    depurar = mostrar_detalles and logger.isEnabledFor(logging.DEBUG)
+    mostrar_detalles = mostrar_detalles and logger.isEnabledFor(logging.INFO)
+    
     if mostrar_detalles:
-        print("🗑️  Eliminando estados muertos...")
+        logger.info("🗑️  Eliminando estados muertos...")
     
     # Paso 1: Encontrar todos los estados que pueden alcanzar estados de aceptación
     estados_vivos = set(afd.estados_aceptacion)  # Los estados de aceptación están vivos
     
+    # Índice inverso: destino -> orígenes
+    predecesores = defaultdict(set)
+    for origen, destinos in afd.tabla.items():
+        for destino in destinos.values():
+            predecesores[destino].add(origen)
+    
     # BFS inverso: desde estados de aceptación hacia atrás
-    cambios = True
-    while cambios:
-        cambios = False
-        nuevos_vivos = set(estados_vivos)
-        
-        # Para cada transición, si el destino está vivo, el origen también
-        for transicion in afd.transiciones:
-            if transicion.destino in estados_vivos and transicion.origen not in estados_vivos:
-                nuevos_vivos.add(transicion.origen)
-                cambios = True
+    cola = deque(estados_vivos)
+    while cola:
+        estado = cola.popleft()
         
-        estados_vivos = nuevos_vivos
+        # Si el destino está vivo, el origen también
+        for origen in predecesores[estado]:
+            if origen not in estados_vivos:
+                estados_vivos.add(origen)
+                cola.append(origen)
     
     # Paso 2: Identificar estados muertos
     todos_los_estados = set(afd.estados.keys())
     estados_muertos = todos_los_estados - estados_vivos
     
-    if mostrar_detalles:
-        print(f"   Estados vivos: {sorted(estados_vivos)}")
-        print(f"   Estados muertos: {sorted(estados_muertos)}")
+    if depurar:
+        logger.debug(f"   Estados vivos: {sorted(estados_vivos)}")
+        logger.debug(f"   Estados muertos: {sorted(estados_muertos)}")
     
     # Paso 3: Si no hay estados muertos, retornar el AFD original
     if not estados_muertos:
         if mostrar_detalles:
-            print("   ✅ No hay estados muertos que eliminar")
+            logger.info("   ✅ No hay estados muertos que eliminar")
         return afd
     
     # Paso 4: Crear nuevo AFD sin estados muertos
@@ -100,9 +112,9 @@ def eliminar_estados_muertos(afd: AFD, mostrar_detalles: bool = True) -> AFD:
         estado_nuevo = afd_sin_muertos.agregar_estado(es_aceptacion)
         mapeo_estados[estado_viejo] = estado_nuevo
         
-        if mostrar_detalles:
+        if depurar:
             tipo = " (aceptación)" if es_aceptacion else ""
-            print(f"   q{estado_viejo} -> q{estado_nuevo}{tipo}")
+            logger.debug(f"   q{estado_viejo} -> q{estado_nuevo}{tipo}")
     
     # Establecer estado inicial (solo si está vivo)
     if afd.estado_inicial in estados_vivos:
@@ -111,7 +123,7 @@ def eliminar_estados_muertos(afd: AFD, mostrar_detalles: bool = True) -> AFD:
     else:
         # Caso especial: si el estado inicial está muerto, el autómata no acepta nada
         if mostrar_detalles:
-            print("   ⚠️  Estado inicial está muerto - autómata no acepta nada")
+            logger.warning("   ⚠️  Estado inicial está muerto - autómata no acepta nada")
         # Crear un estado inicial que no acepta nada
         estado_inicial_nuevo = afd_sin_muertos.agregar_estado(es_aceptacion=False)
         afd_sin_muertos.establecer_inicial(estado_inicial_nuevo)
@@ -132,8 +144,8 @@ def eliminar_estados_muertos(afd: AFD, mostrar_detalles: bool = True) -> AFD:
                 transiciones_agregadas.add(clave_transicion)
     
     if mostrar_detalles:
-        print(f"   ✅ Eliminados {len(estados_muertos)} estados muertos")
-        print(f"   AFD resultante: {len(afd_sin_muertos.estados)} estados")
+        logger.info(f"   ✅ Eliminados {len(estados_muertos)} estados muertos")
+        logger.info(f"   AFD resultante: {len(afd_sin_muertos.estados)} estados")
     
     return afd_sin_muertos
 
@@ -148,115 +160,135 @@ def es_estado_trampa(afd: AFD, estado: int) -> bool:
     
     # Verificar que todas las transiciones desde este estado van a sí mismo
     for simbolo in afd.alfabeto:
-        encontrada_transicion = False
-        for transicion in afd.transiciones:
-            if transicion.origen == estado and transicion.simbolo == simbolo:
-                if transicion.destino != estado:
-                    return False  # Una transición no va a sí mismo
-                encontrada_transicion = True
-                break
-        
-        if not encontrada_transicion:
+        destino = afd.obtener_destino(estado, simbolo)
+        if destino is None:
             return False  # Falta una transición
+        if destino != estado:
+            return False  # Una transición no va a sí mismo
     
     return True
 
-def minimizar_afd_hopcroft(afd: AFD) -> AFD:
+def minimizar_afd_hopcroft(afd: AFD, mostrar_detalles: bool = True) -> AFD:
     """
     Minimiza un AFD usando el algoritmo de Hopcroft y elimina estados muertos
+    
+    Refinamiento por divisores (grupo, símbolo) con lista de trabajo, transiciones
+    inversas y la regla de "procesar la mitad más pequeña": O(n·k·log n).
+    Las transiciones faltantes se dirigen a un estado sumidero virtual.
+    
+    Args:
+        afd: AFD a minimizar
+        mostrar_detalles: Si registrar el detalle del proceso en el logger del módulo
     """
-    print("Iniciando minimización con algoritmo de Hopcroft...")
+    # Los mensajes solo se formatean si su nivel está activo
+    detalles = mostrar_detalles and logger.isEnabledFor(logging.INFO)
+    depurar = mostrar_detalles and logger.isEnabledFor(logging.DEBUG)
+    if detalles:
+        logger.info("Iniciando minimización con algoritmo de Hopcroft...")
+    
+    alfabeto = sorted(afd.alfabeto)
+    
+    # Estado sumidero virtual para completar el AFD sin modificarlo
+    sumidero = afd.contador_estados
+    while sumidero in afd.estados:
+        sumidero += 1
+    
+    # Transiciones inversas: simbolo -> destino -> orígenes
+    inversa = {simbolo: defaultdict(list) for simbolo in alfabeto}
+    for estado in list(afd.estados.keys()) + [sumidero]:
+        fila = afd.tabla.get(estado, {})
+        for simbolo in alfabeto:
+            inversa[simbolo][fila.get(simbolo, sumidero)].append(estado)
     
     # Paso 1: Crear partición inicial
-    # Separar estados de aceptación y no aceptación
+    # Separar estados de aceptación y no aceptación (el sumidero no acepta)
     estados_aceptacion = set(afd.estados_aceptacion)
     estados_no_aceptacion = set(afd.estados.keys()) - estados_aceptacion
+    estados_no_aceptacion.add(sumidero)
     
     particion = Particion()
+    grupo_no_aceptacion = particion.agregar_grupo(estados_no_aceptacion)
+    if detalles:
+        logger.info(f"Grupo {grupo_no_aceptacion} (no aceptación): {estados_no_aceptacion - {sumidero}}")
     
-    if estados_no_aceptacion:
-        particion.agregar_grupo(estados_no_aceptacion)
-        print(f"Grupo 0 (no aceptación): {estados_no_aceptacion}")
-    
+    pendientes = []
     if estados_aceptacion:
-        particion.agregar_grupo(estados_aceptacion)
-        print(f"Grupo {len(particion)-1} (aceptación): {estados_aceptacion}")
+        grupo_aceptacion = particion.agregar_grupo(estados_aceptacion)
+        if detalles:
+            logger.info(f"Grupo {grupo_aceptacion} (aceptación): {estados_aceptacion}")
+        
+        # Basta con usar como divisor el grupo inicial más pequeño
+        menor = min(grupo_no_aceptacion, grupo_aceptacion, key=lambda g: len(particion.grupos[g]))
+        pendientes = [(menor, simbolo) for simbolo in alfabeto]
     
-    # Paso 2: Refinar particiones iterativamente
-    cambios = True
+    en_pendientes = set(pendientes)
+    
+    # Paso 2: Refinar con cada divisor (grupo, símbolo) de la lista de trabajo
     iteracion = 0
     
-    while cambios:
-        cambios = False
+    while pendientes:
+        divisor = pendientes.pop()
+        en_pendientes.discard(divisor)
+        grupo_divisor, simbolo = divisor
         iteracion += 1
-        print(f"\n--- Iteración {iteracion} ---")
         
-        # Para cada grupo actual
-        grupos_actuales = list(particion.grupos)
+        # Estados que con 'simbolo' llegan al grupo divisor, agrupados por su grupo
+        inversa_simbolo = inversa[simbolo]
+        tocados = defaultdict(set)
+        for destino in particion.grupos[grupo_divisor]:
+            for origen in inversa_simbolo.get(destino, ()):
+                tocados[particion.estado_a_grupo[origen]].add(origen)
         
-        for grupo_id, grupo in enumerate(grupos_actuales):
-            if not grupo:  # Grupo vacío
+        for grupo_id, interseccion in tocados.items():
+            # Solo se divide si el grupo queda partido en dos partes no vacías
+            if len(interseccion) == len(particion.grupos[grupo_id]):
                 continue
-                
-            print(f"Analizando grupo {grupo_id}: {grupo}")
             
-            # Para cada símbolo del alfabeto
-            for simbolo in sorted(afd.alfabeto):
-                # Crear subgrupos basados en a dónde van con este símbolo
-                subgrupos = defaultdict(set)
-                
-                for estado in grupo:
-                    # Encontrar el grupo destino para este estado con este símbolo
-                    estado_destino = obtener_destino(afd, estado, simbolo)
-                    if estado_destino is not None:
-                        grupo_destino = particion.obtener_grupo(estado_destino)
-                        subgrupos[grupo_destino].add(estado)
-                    else:
-                        # Estados sin transición para este símbolo van a un grupo especial
-                        subgrupos[-1].add(estado)
-                
-                # Si se formaron múltiples subgrupos, dividir
-                if len(subgrupos) > 1:
-                    nuevos_grupos = list(subgrupos.values())
-                    print(f"  Dividiendo por símbolo '{simbolo}': {list(subgrupos.keys())}")
-                    
-                    # Remover el grupo original de la partición actual
-                    particion.grupos[grupo_id] = set()
-                    
-                    # Agregar los nuevos subgrupos
-                    for nuevo_grupo in nuevos_grupos:
-                        if nuevo_grupo:
-                            nuevo_id = particion.agregar_grupo(nuevo_grupo)
-                            print(f"    Nuevo grupo {nuevo_id}: {nuevo_grupo}")
-                    
-                    cambios = True
-                    break  # Procesar siguiente grupo
-    
-    print(f"\nMinimización completada en {iteracion} iteraciones")
-    print(f"Grupos finales: {len(particion)}")
+            nuevo_id = particion.separar(grupo_id, interseccion)
+            if depurar:
+                logger.debug(f"  Dividiendo grupo {grupo_id} por símbolo '{simbolo}': "
+                             f"nuevo grupo {nuevo_id} con {len(interseccion)} estados")
+            
+            # Si el grupo ya estaba pendiente, ambas mitades deben estarlo;
+            # si no, basta con la mitad más pequeña
+            menor = min(grupo_id, nuevo_id, key=lambda g: len(particion.grupos[g]))
+            for b in alfabeto:
+                if (grupo_id, b) in en_pendientes:
+                    agregar = (nuevo_id, b)
+                else:
+                    agregar = (menor, b)
+                if agregar not in en_pendientes:
+                    en_pendientes.add(agregar)
+                    pendientes.append(agregar)
+    
+    # El sumidero virtual no forma parte del AFD minimizado
+    particion.quitar_estado(sumidero)
+    
+    if detalles:
+        logger.info("Minimización completada en %d iteraciones", iteracion)
+        logger.info("Grupos finales: %d", sum(1 for grupo in particion if grupo))
     
     # Paso 3: Construir AFD minimizado
-    afd_minimizado = construir_afd_minimizado(afd, particion)
+    afd_minimizado = construir_afd_minimizado(afd, particion, mostrar_detalles)
     
     # Paso 4: Eliminar estados muertos
-    print(f"\n--- Eliminación de estados muertos ---")
-    afd_sin_muertos = eliminar_estados_muertos(afd_minimizado, mostrar_detalles=True)
+    if detalles:
+        logger.info("--- Eliminación de estados muertos ---")
+    afd_sin_muertos = eliminar_estados_muertos(afd_minimizado, mostrar_detalles=mostrar_detalles)
     
     # Paso 5: Renumerar estados para orden lógico
-    afd_final = renumerar_afd_logico(afd_sin_muertos)
+    afd_final = renumerar_afd_logico(afd_sin_muertos, mostrar_detalles)
     
     return afd_final
 
 def obtener_destino(afd: AFD, estado: int, simbolo: str) -> Optional[int]:
     """Obtiene el estado destino para una transición dada"""
-    for transicion in afd.transiciones:
-        if transicion.origen == estado and transicion.simbolo == simbolo:
-            return transicion.destino
-    return None
+    return afd.obtener_destino(estado, simbolo)
 
-def construir_afd_minimizado(afd_original: AFD, particion: Particion) -> AFD:
+def construir_afd_minimizado(afd_original: AFD, particion: Particion, mostrar_detalles: bool = True) -> AFD:
     """Construye el AFD minimizado a partir de la partición final"""
     afd_min = AFD()
+    depurar = mostrar_detalles and logger.isEnabledFor(logging.DEBUG)
     
     # Crear estados en el AFD minimizado (uno por grupo)
     grupo_a_estado = {}
@@ -266,7 +298,8 @@ def construir_afd_minimizado(afd_original: AFD, particion: Particion) -> AFD:
             estado_min = afd_min.agregar_estado(es_aceptacion)
             grupo_a_estado[grupo_id] = estado_min
             
-            print(f"Grupo {grupo_id} -> Estado {estado_min} {'(aceptación)' if es_aceptacion else ''}")
+            if depurar:
+                logger.debug("Grupo %d -> Estado %d %s", grupo_id, estado_min, '(aceptación)' if es_aceptacion else '')
     
     # Establecer estado inicial
     grupo_inicial = particion.obtener_grupo(afd_original.estado_inicial)
@@ -292,43 +325,37 @@ def construir_afd_minimizado(afd_original: AFD, particion: Particion) -> AFD:
     
     return afd_min
 
-def renumerar_afd_logico(afd: AFD) -> AFD:
+def renumerar_afd_logico(afd: AFD, mostrar_detalles: bool = True) -> AFD:
     """
     Renumera los estados del AFD para que sigan un orden lógico:
     - Estado inicial: 0
     - Estados siguientes: en orden BFS
     - Estados de aceptación al final cuando sea posible
     """
-    print("Renumerando estados para orden lógico...")
+    if mostrar_detalles:
+        logger.info("Renumerando estados para orden lógico...")
     
     # BFS desde el estado inicial para encontrar orden lógico
     mapeo = {}
-    visitados = set()
+    # La cola solo da el orden; 'encolados' responde en O(1) si un estado ya entró
+    encolados = {afd.estado_inicial}
     cola = deque([afd.estado_inicial])
     orden_estados = []
     
     # BFS para orden lógico
     while cola:
         estado_actual = cola.popleft()
-        if estado_actual not in visitados:
-            visitados.add(estado_actual)
-            orden_estados.append(estado_actual)
-            
-            # Encontrar estados destino ordenados por símbolo
-            destinos = []
-            for t in afd.transiciones:
-                if t.origen == estado_actual and t.destino not in visitados:
-                    destinos.append((t.simbolo, t.destino))
-            
-            # Ordenar por símbolo y agregar a la cola
-            destinos.sort(key=lambda x: x[0])
-            for simbolo, destino in destinos:
-                if destino not in cola:
-                    cola.append(destino)
+        orden_estados.append(estado_actual)
+        
+        # Agregar a la cola los destinos nuevos, ordenados por símbolo
+        for simbolo, destino in sorted(afd.tabla.get(estado_actual, {}).items()):
+            if destino not in encolados:
+                encolados.add(destino)
+                cola.append(destino)
     
     # Agregar estados no visitados (si los hay)
     for estado in afd.estados.keys():
-        if estado not in visitados:
+        if estado not in encolados:
             orden_estados.append(estado)
     
     # Crear mapeo: estado_antiguo -> estado_nuevo
@@ -354,7 +381,8 @@ def renumerar_afd_logico(afd: AFD) -> AFD:
     nuevo_inicial = mapeo[afd.estado_inicial]
     afd_nuevo.establecer_inicial(nuevo_inicial)
     
-    print(f"Estados renumerados: {[f'{old}->{new}' for old, new in mapeo.items()]}")
+    if mostrar_detalles and logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Estados renumerados: {[f'{old}->{new}' for old, new in mapeo.items()]}")
     
     return afd_nuevo
 
@@ -438,7 +466,7 @@ def probar_minimizacion():
             print(f"\nArchivos generados:")
             print(f"- afd_min_{nombre_archivo}.json")
             print(f"- afd_min_{nombre_archivo}.png")
-            
+        
         except Exception as e:
             print(f"Error procesando caso {caso}: {e}")
             import traceback
@@ -0,0 +1,139 @@
+'''
+AFD perezoso: determinización bajo demanda del AFN de Thompson
+Los estados del AFD (conjuntos de estados del AFN) se construyen solo cuando la
+entrada los alcanza y se guardan en una caché LRU con presupuesto de memoria
+'''
+import sys
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+from models.automata import AFN
+from .shunting_yard import shunting_yard
+from .syntax_tree import simplificar_postfix
+from .thompson import construir_afn_thompson
+
+# Estimación (en bytes) del costo de cada transición guardada en la caché
+COSTO_TRANSICION = 100
+# Estimación (en bytes) de cada estado del AFN dentro del conjunto que identifica a un estado del AFD
+COSTO_ELEMENTO = sys.getsizeof(1 << 30)
+PRESUPUESTO_POR_DEFECTO = 8 * 1024 * 1024
+
+class AFDPerezoso:
+    """
+    Simula un AFN como si fuera un AFD, determinizando estados solo a medida
+    que la entrada los alcanza.
+    
+    Cada estado del AFD es la ε-clausura de un conjunto de estados del AFN y
+    guarda sus transiciones ya calculadas. Cada estado cuesta su conjunto
+    (proporcional a su tamaño, ver costo_estado) y cada transición
+    COSTO_TRANSICION; si la memoria estimada de la caché supera
+    'presupuesto_memoria', se desalojan los estados usados hace más tiempo
+    (LRU); se recalcularán si se vuelven a necesitar.
+    """
+    def __init__(self, afn: AFN, presupuesto_memoria: int = PRESUPUESTO_POR_DEFECTO):
+        self.afn = afn
+        self.presupuesto_memoria = presupuesto_memoria
+        # conjunto -> (el mismo conjunto, transiciones): la clave guardada se
+        # reutiliza como destino para no duplicar conjuntos iguales
+        self.cache: 'OrderedDict[FrozenSet[int], Tuple[FrozenSet[int], Dict[str, FrozenSet[int]]]]' = OrderedDict()
+        self.memoria_usada = 0
+        self.desalojos = 0
+        
+        self.inicial = afn.clausura_epsilon(afn.estado_inicial)
+        self.aceptacion = frozenset(afn.estados_aceptacion)
+    
+    def _entrada(self, conjunto: FrozenSet[int]) -> Dict[str, FrozenSet[int]]:
+        """Retorna las transiciones en caché de un estado, creándolo si no existe"""
+        entrada = self.cache.get(conjunto)
+        if entrada is not None:
+            self.cache.move_to_end(conjunto)
+            return entrada[1]
+        
+        transiciones = {}
+        self.cache[conjunto] = (conjunto, transiciones)
+        self.memoria_usada += costo_estado(conjunto)
+        self._ajustar_presupuesto()
+        return transiciones
+    
+    def _calcular(self, conjunto: FrozenSet[int], simbolo: str,
+                  transiciones: Dict[str, FrozenSet[int]]) -> FrozenSet[int]:
+        """Calcula ε-clausura(mover(conjunto, simbolo)) y la guarda en la caché"""
+        destino = set()
+        for estado in conjunto:
+            for siguiente in self.afn.obtener_destinos(estado, simbolo):
+                destino |= self.afn.clausura_epsilon(siguiente)
+        
+        destino = frozenset(destino)
+        entrada = self.cache.get(destino)
+        if entrada is not None:
+            destino = entrada[0]
+        transiciones[simbolo] = destino
+        
+        # El estado pudo haber sido desalojado mientras se usaba
+        if conjunto in self.cache:
+            self.memoria_usada += COSTO_TRANSICION
+            self._ajustar_presupuesto()
+        return destino
+    
+    def _ajustar_presupuesto(self):
+        """Desaloja estados LRU hasta volver al presupuesto (conserva el más reciente)"""
+        while self.memoria_usada > self.presupuesto_memoria and len(self.cache) > 1:
+            conjunto, (_, transiciones) = self.cache.popitem(last=False)
+            self.memoria_usada -= costo_estado(conjunto) + COSTO_TRANSICION * len(transiciones)
+            self.desalojos += 1
+    
+    def ejecutar(self, cadena: str) -> FrozenSet[int]:
+        """Retorna el conjunto de estados del AFN alcanzado (vacío si se bloquea)"""
+        conjunto = self.inicial
+        transiciones = self._entrada(conjunto)
+        
+        for simbolo in cadena:
+            siguiente = transiciones.get(simbolo)
+            if siguiente is None:
+                siguiente = self._calcular(conjunto, simbolo, transiciones)
+            if not siguiente:
+                return siguiente
+            if siguiente is not conjunto:
+                conjunto = siguiente
+                transiciones = self._entrada(conjunto)
+        
+        return conjunto
+    
+    def acepta(self, cadena: str) -> bool:
+        """Retorna si la cadena es aceptada"""
+        return not self.aceptacion.isdisjoint(self.ejecutar(cadena))
+    
+    def limpiar_cache(self):
+        """Vacía la caché de estados"""
+        self.cache.clear()
+        self.memoria_usada = 0
+    
+    def __len__(self):
+        return len(self.cache)
+
+def costo_estado(conjunto: FrozenSet[int]) -> int:
+    """Memoria estimada de un estado del AFD: su conjunto (tabla y elementos) y su diccionario de transiciones vacío"""
+    return sys.getsizeof(conjunto) + COSTO_ELEMENTO * len(conjunto) + sys.getsizeof({})
+
+def regexp_a_afd_perezoso(regexp: str, presupuesto_memoria: int = PRESUPUESTO_POR_DEFECTO) -> AFDPerezoso:
+    """Construye el AFN de Thompson de la regexp y lo envuelve en un AFD perezoso"""
+    afn = construir_afn_thompson(simplificar_postfix(shunting_yard(regexp)))
+    return AFDPerezoso(afn, presupuesto_memoria)
+
+def probar_afd_perezoso():
+    """Prueba el AFD perezoso con un patrón cuyo AFD completo es exponencial"""
+    casos_prueba: List[Tuple[str, Iterable[str]]] = [
+        ("(a|b)*a", ["", "a", "ba", "ab", "bbba"]),
+        ("(a|b)*a(a|b)(a|b)(a|b)(a|b)(a|b)(a|b)(a|b)", ["a" * 8, "b" * 8, "ab" * 8, "abbbbbbb"]),
+    ]
+    
+    for regexp, cadenas in casos_prueba:
+        print(f"\n=== Caso: {regexp} ===")
+        afd = regexp_a_afd_perezoso(regexp, presupuesto_memoria=64 * 1024)
+        for cadena in cadenas:
+            resultado = "ACEPTA" if afd.acepta(cadena) else "RECHAZA"
+            print(f"'{cadena}': {resultado}")
+        print(f"Estados en caché: {len(afd)} (desalojos: {afd.desalojos})")
+
+if __name__ == "__main__":
+    probar_afd_perezoso()
@@ -0,0 +1,249 @@
+'''
+Búsqueda de subcadenas: encuentra todas las coincidencias de una regexp dentro de un texto
+Semántica "leftmost-longest": se elige el inicio más a la izquierda y, desde él,
+el final más largo; las coincidencias no se solapan
+'''
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+from models.automata import AFD, AFN, EPSILON
+from .shunting_yard import shunting_yard
+from .syntax_tree import simplificar_postfix
+from .thompson import construir_afn_thompson
+from .subset_construction import afn_a_afd, optimizar_nombres_estados
+from .hopcroft import minimizar_afd_hopcroft
+from .simulation import leer_lineas
+
+def invertir_afn(afn: AFN, prefijo_universal: bool = False) -> AFN:
+    """
+    Construye el AFN del lenguaje inverso: invierte todas las transiciones,
+    agrega un estado inicial con ε hacia los antiguos estados de aceptación
+    y acepta en el antiguo estado inicial.
+    
+    Con prefijo_universal, el nuevo estado inicial tiene un bucle con cada
+    símbolo del alfabeto (lenguaje Σ*·inverso(R)), así la simulación puede
+    empezar en cualquier posición.
+    """
+    afn_inverso = AFN()
+    for _ in range(afn.contador_estados):
+        afn_inverso.agregar_estado()
+    
+    for t in afn.transiciones:
+        afn_inverso.agregar_transicion(t.destino, t.simbolo, t.origen)
+    
+    nuevo_inicial = afn_inverso.agregar_estado()
+    for estado in sorted(afn.estados_aceptacion):
+        afn_inverso.agregar_transicion(nuevo_inicial, EPSILON, estado)
+    
+    if prefijo_universal:
+        for simbolo in sorted(afn.alfabeto):
+            afn_inverso.agregar_transicion(nuevo_inicial, simbolo, nuevo_inicial)
+    
+    afn_inverso.establecer_inicial(nuevo_inicial)
+    afn_inverso.establecer_aceptacion(afn.estado_inicial)
+    return afn_inverso
+
+class Buscador:
+    """
+    Busca coincidencias de una regexp dentro de un texto en dos fases:
+    
+    1. Una pasada de derecha a izquierda con el AFD inverso (Σ*·inverso(R))
+       marca todas las posiciones donde empieza alguna coincidencia.
+    2. Desde el inicio marcado más a la izquierda se avanza con el AFD
+       minimizado de R, recordando el último final de aceptación
+       (coincidencia más larga). Se continúa desde ese final.
+    
+    No hay retroceso: cada inicio se descubre en la pasada inversa. Para que
+    el avance no relea el texto más allá de la coincidencia (O(n²) con
+    patrones como a|a*b), otra pasada inversa calcula en cada posición
+    qué estados del AFD todavía pueden llegar a aceptación con el resto del
+    texto (ver marcar_continuaciones); el avance se detiene al salir de ellos.
+    """
+    def __init__(self, afd: AFD, afd_inverso: AFD):
+        self.afd = afd.compilar()
+        self.afd_inverso = afd_inverso.compilar()
+        
+        # Predecesores por símbolo como bitsets: columna -> destino -> estados origen
+        k = self.afd.num_simbolos
+        self._predecesores: List[Dict[int, int]] = [{} for _ in range(k)]
+        for origen in range(len(self.afd.estados)):
+            for columna in range(k):
+                destino = self.afd.delta[origen * k + columna]
+                if destino >= 0:
+                    predecesores = self._predecesores[columna]
+                    predecesores[destino] = predecesores.get(destino, 0) | 1 << origen
+        
+        # Conjuntos de estados "con continuación" ya vistos (el 0 es el de aceptación)
+        aceptacion = sum(1 << estado for estado, acepta in enumerate(self.afd.aceptacion) if acepta)
+        self._conjuntos: List[int] = [aceptacion]
+        self._id_conjunto: Dict[int, int] = {aceptacion: 0}
+        self._pasos: Dict[Tuple[int, int], int] = {}
+    
+    def marcar_inicios(self, texto: str) -> bytearray:
+        """Retorna un bytearray de largo len(texto)+1 con 1 donde empieza una coincidencia"""
+        inverso = self.afd_inverso
+        delta = inverso.delta
+        k = inverso.num_simbolos
+        simbolo_a_id = inverso.simbolo_a_id
+        aceptacion = inverso.aceptacion
+        inicial = inverso.inicial
+        
+        inicios = bytearray(len(texto) + 1)
+        estado = inicial
+        inicios[len(texto)] = aceptacion[estado]
+        
+        for i in range(len(texto) - 1, -1, -1):
+            id_simbolo = simbolo_a_id.get(texto[i])
+            # Un símbolo fuera del alfabeto solo lo consume el prefijo Σ*: volver al inicio
+            estado = inicial if id_simbolo is None else delta[estado * k + id_simbolo]
+            inicios[i] = aceptacion[estado]
+        
+        return inicios
+    
+    def marcar_continuaciones(self, texto: str) -> array:
+        """
+        Retorna un array de largo len(texto)+1 con, para cada posición i, el id
+        (índice en self._conjuntos) del bitset de estados del AFD desde los que
+        leer texto[i:] todavía alcanza un estado de aceptación
+        
+        Se calcula de derecha a izquierda: C(n) = F y
+        C(i) = F ∪ {q : δ(q, texto[i]) ∈ C(i+1)}. Los conjuntos y sus pasos se
+        guardan entre llamadas, como los estados de un AFD perezoso
+        """
+        simbolo_a_id = self.afd.simbolo_a_id
+        conjuntos = self._conjuntos
+        id_conjunto = self._id_conjunto
+        pasos = self._pasos
+        
+        continuaciones = array('i', [0]) * (len(texto) + 1)
+        actual = 0
+        for i in range(len(texto) - 1, -1, -1):
+            id_simbolo = simbolo_a_id.get(texto[i])
+            if id_simbolo is None:
+                # Un símbolo fuera del alfabeto bloquea el AFD: solo acepta quien ya aceptaba
+                actual = 0
+            else:
+                siguiente = pasos.get((actual, id_simbolo))
+                if siguiente is None:
+                    predecesores = self._predecesores[id_simbolo]
+                    bits = conjuntos[actual]
+                    nuevo = conjuntos[0]
+                    while bits:
+                        menor = bits & -bits
+                        nuevo |= predecesores.get(menor.bit_length() - 1, 0)
+                        bits ^= menor
+                    siguiente = id_conjunto.get(nuevo)
+                    if siguiente is None:
+                        siguiente = id_conjunto[nuevo] = len(conjuntos)
+                        conjuntos.append(nuevo)
+                    pasos[(actual, id_simbolo)] = siguiente
+                actual = siguiente
+            continuaciones[i] = actual
+        
+        return continuaciones
+    
+    def coincidencia_mas_larga(self, texto: str, inicio: int,
+                               continuaciones: Optional[array] = None) -> Optional[int]:
+        """
+        Retorna el final de la coincidencia más larga que empieza en 'inicio' (o None)
+        Con 'continuaciones' (ver marcar_continuaciones) el avance se detiene en
+        cuanto ya no puede haber otro final, en lugar de seguir hasta bloquearse
+        """
+        afd = self.afd
+        delta = afd.delta
+        k = afd.num_simbolos
+        simbolo_a_id = afd.simbolo_a_id
+        aceptacion = afd.aceptacion
+        conjuntos = self._conjuntos
+        
+        estado = afd.inicial
+        if estado < 0:
+            return None
+        
+        final = inicio if aceptacion[estado] else None
+        for i in range(inicio, len(texto)):
+            id_simbolo = simbolo_a_id.get(texto[i])
+            if id_simbolo is None:
+                break
+            estado = delta[estado * k + id_simbolo]
+            if estado < 0:
+                break
+            if aceptacion[estado]:
+                final = i + 1
+            elif continuaciones is not None and not conjuntos[continuaciones[i + 1]] >> estado & 1:
+                break
+        
+        return final
+    
+    def iterar(self, texto: str) -> Iterator[Tuple[int, int]]:
+        """Genera los intervalos (inicio, fin) de cada coincidencia, de izquierda a derecha"""
+        inicios = self.marcar_inicios(texto)
+        continuaciones = self.marcar_continuaciones(texto)
+        posicion = 0
+        
+        while posicion <= len(texto):
+            inicio = inicios.find(1, posicion)
+            if inicio == -1:
+                break
+            
+            final = self.coincidencia_mas_larga(texto, inicio, continuaciones)
+            if final is None:  # no debería ocurrir si el inicio está marcado
+                posicion = inicio + 1
+                continue
+            
+            yield inicio, final
+            # Una coincidencia vacía avanza una posición para no repetirse
+            posicion = final if final > inicio else final + 1
+    
+    def buscar_todo(self, texto: str) -> List[Tuple[int, int]]:
+        """Retorna la lista de intervalos (inicio, fin) de todas las coincidencias"""
+        return list(self.iterar(texto))
+
+def construir_buscador(regexp: str) -> Buscador:
+    """Construye el AFD minimizado y el AFD inverso de la regexp"""
+    afn = construir_afn_thompson(simplificar_postfix(shunting_yard(regexp)))
+    
+    afd = optimizar_nombres_estados(afn_a_afd(afn))
+    afd_min = minimizar_afd_hopcroft(afd)
+    
+    afd_inverso = optimizar_nombres_estados(afn_a_afd(invertir_afn(afn, prefijo_universal=True)))
+    afd_inverso_min = minimizar_afd_hopcroft(afd_inverso)
+    
+    return Buscador(afd_min, afd_inverso_min)
+
+def buscar_en_flujo(buscador: Buscador, ruta: str = '-', salida: Optional[TextIO] = None,
+                    usar_mmap: bool = True) -> int:
+    """
+    Busca coincidencias en cada línea de un archivo (o stdin) y escribe una
+    línea 'número_de_línea:inicio:fin:coincidencia' por cada una.
+    Retorna la cantidad de coincidencias encontradas.
+    """
+    if salida is None:
+        salida = sys.stdout
+    
+    total = 0
+    for numero, linea in enumerate(leer_lineas(ruta, usar_mmap), start=1):
+        for inicio, final in buscador.iterar(linea):
+            salida.write(f"{numero}:{inicio}:{final}:{linea[inicio:final]}\n")
+            total += 1
+    
+    salida.flush()
+    return total
+
+def probar_busqueda():
+    """Prueba la búsqueda de subcadenas"""
+    casos_prueba = [
+        ("ab", "xxabyyabab"),
+        ("a+", "baaacaab"),
+        ("(a|b)*c", "aacbbcxc"),
+        ("a*", "bab"),
+    ]
+    
+    for regexp, texto in casos_prueba:
+        buscador = construir_buscador(regexp)
+        coincidencias = buscador.buscar_todo(texto)
+        print(f"\n{regexp} en '{texto}': {[(i, f, texto[i:f]) for i, f in coincidencias]}")
+
+if __name__ == "__main__":
+    probar_busqueda()
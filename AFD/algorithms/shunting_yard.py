@@ -2,77 +2,95 @@
 Algoritmo Shunting Yard para convertir expresiones regulares de infija a postfix
 Regexp -> Postfix
 '''
-from models.automata import OPERADORES, PRECEDENCIA
+from typing import List
 
-def agregar_concatenacion_explicita(regexp: str) -> str:
+from .tokenizer import CONCATENACION, OPERADOR, REPETICION, Token, tokenizar, tokens_a_texto
+
+def agregar_concatenacion_explicita(tokens: List[Token]) -> List[Token]:
     """
     Agrega el operador de concatenación '.' donde sea necesario
-    Ejemplo: 'ab' -> 'a.b', '(a|b)c' -> '(a|b).c'
+    Ejemplo: 'ab' -> 'a.b', '(a|b)c' -> '(a|b).c', '[a-z]x' -> '[a-z].x'
     """
     resultado = []
-    for i, char in enumerate(regexp):
-        resultado.append(char)
+    for i, token in enumerate(tokens):
+        resultado.append(token)
         
         # Agregar concatenación después de:
-        # - Un símbolo (letra, dígito, epsilon)
-        # - '*' o '+'
+        # - Un operando (símbolo, epsilon o clase)
+        # - '*', '+' o una repetición {m,n}
         # - ')'
-        if i < len(regexp) - 1:
-            siguiente = regexp[i + 1]
+        if i < len(tokens) - 1:
+            siguiente = tokens[i + 1]
             
-            # Si el carácter actual es un símbolo, *, + o )
-            # Y el siguiente es un símbolo o (
-            if ((char not in OPERADORES or char in ['*', '+', ')']) and
-                (siguiente not in OPERADORES or siguiente == '(')):
-                resultado.append('.')
+            # Si el token actual es un operando, *, +, {m,n} o )
+            # Y el siguiente es un operando o (
+            if ((token.es_operando() or token.es_operador('*', '+', ')') or
+                 token.tipo == REPETICION) and
+                (siguiente.es_operando() or siguiente.es_operador('('))):
+                resultado.append(Token(OPERADOR, CONCATENACION))
     
-    return ''.join(resultado)
+    return resultado
 
-def shunting_yard(regexp: str) -> str:
+def shunting_yard_tokens(tokens: List[Token]) -> List[Token]:
     """
-    Convierte una expresión regular en notación infija a postfix
+    Convierte una lista de tokens en notación infija a postfix
     usando el algoritmo Shunting Yard de Dijkstra
     """
     # Primero agregamos concatenación explícita
-    regexp_con_concat = agregar_concatenacion_explicita(regexp)
+    tokens_con_concat = agregar_concatenacion_explicita(tokens)
     
     salida = []
     pila_operadores = []
     
     # Actualizar precedencias para incluir concatenación
-    precedencias = {'|': 1, '.': 2, '*': 3, '+': 3}
+    # (las repeticiones {m,n} son postfijas como '*' y usan la clave '{')
+    precedencias = {'|': 1, '.': 2, '*': 3, '+': 3, '{': 3}
+    
+    def precedencia(token: Token) -> int:
+        return precedencias['{' if token.tipo == REPETICION else token.valor]
     
-    for token in regexp_con_concat:
-        if token not in OPERADORES and token != '.':
-            # Es un operando (símbolo del alfabeto)
+    for token in tokens_con_concat:
+        if token.es_operando():
+            # Es un operando (símbolo del alfabeto o clase)
             salida.append(token)
-            
-        elif token == '(':
+        
+        elif token.valor == '(':
             pila_operadores.append(token)
-            
-        elif token == ')':
+        
+        elif token.valor == ')':
             # Pop hasta encontrar '('
-            while pila_operadores and pila_operadores[-1] != '(':
+            while pila_operadores and pila_operadores[-1].valor != '(':
                 salida.append(pila_operadores.pop())
             
             if pila_operadores:
                 pila_operadores.pop()  # Remover '('
-                
-        elif token in ['|', '.', '*', '+']:
+        
+        else:
             # Manejar operadores según precedencia y asociatividad
             while (pila_operadores and 
-                   pila_operadores[-1] != '(' and
-                   pila_operadores[-1] in precedencias and
-                   precedencias[pila_operadores[-1]] >= precedencias[token]):
+                   pila_operadores[-1].valor != '(' and
+                   precedencia(pila_operadores[-1]) >= precedencia(token)):
                 salida.append(pila_operadores.pop())
             
             pila_operadores.append(token)
     
     # Vaciar la pila
     while pila_operadores:
-        salida.append(pila_operadores.pop())
+        token = pila_operadores.pop()
+        if token.valor != '(':
+            salida.append(token)
+    
+    return salida
+
+def shunting_yard(regexp: str) -> str:
+    """
+    Convierte una expresión regular en notación infija a postfix
     
-    return ''.join(salida)
+    El resultado es texto: los símbolos que coinciden con operadores se
+    escriben escapados ('\\*') y las clases en forma canónica ('[a-c]' -> '[abc]'),
+    de modo que construir_afn_thompson lo puede volver a tokenizar
+    """
+    return tokens_a_texto(shunting_yard_tokens(list(tokenizar(regexp))))
 
 # Función de prueba
 def probar_shunting_yard():
@@ -90,6 +108,13 @@ def probar_shunting_yard():
         "ε+a*b",      # Caso problemático original
         "(ε|a)*",     # Epsilon en unión
         "ε*(a|b)",    # Epsilon* concatenado
+        "[a-c]x",     # Clase de caracteres
+        "a.b",        # Comodín
+        "\\*\\+",       # Operadores escapados
+        "a{3}",       # Repetición exacta
+        "(ab){2,}b",  # Repetición con mínimo
+        "[0-9]{1,3}", # Repetición acotada
+        "a{x}",       # Llave literal (no es una repetición)
     ]
     
     print("=== Pruebas Shunting Yard ===")
@@ -1,18 +1,25 @@
 # AFD/simulation.py
-from models.automata import AFD
+from models.automata import AFD, AFN
 from .thompson import regexp_a_afn
 from .subset_construction import afn_a_afd, optimizar_nombres_estados, mostrar_tabla_transiciones
 from .hopcroft import minimizar_afd_hopcroft
 
-from typing import Set, Dict, List, Tuple
+from typing import Set, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 from itertools import product
+from array import array
+from collections import defaultdict
+import mmap
+import sys
 
 def simular_afd_detallado(afd: AFD, cadena: str) -> Tuple[bool, List[Dict]]:
     """
     Simula la ejecución de una cadena en el AFD con información detallada
     Retorna si es aceptada y la secuencia completa de pasos
+    
+    La simulación se delega al AFD compilado; aquí solo se arma el detalle
+    de cada paso a partir de la secuencia de estados recorridos
     """
-    estado_actual = afd.estado_inicial
+    es_aceptada, secuencia = afd.compilar().simular(cadena)
     pasos = []
     
     # Estado inicial
@@ -20,66 +27,289 @@ def simular_afd_detallado(afd: AFD, cadena: str) -> Tuple[bool, List[Dict]]:
         'paso': 0,
         'simbolo': None,
         'estado_anterior': None,
-        'estado_actual': estado_actual,
+        'estado_actual': secuencia[0],
         'cadena_restante': cadena,
-        'es_aceptacion': estado_actual in afd.estados_aceptacion
+        'es_aceptacion': secuencia[0] in afd.estados_aceptacion
     }
     pasos.append(paso_inicial)
     
-    # Procesar cada símbolo
-    for i, simbolo in enumerate(cadena):
-        # Verificar si el símbolo está en el alfabeto
+    # Registrar cada paso exitoso
+    for i in range(1, len(secuencia)):
+        paso = {
+            'paso': i,
+            'simbolo': cadena[i - 1],
+            'estado_anterior': secuencia[i - 1],
+            'estado_actual': secuencia[i],
+            'cadena_restante': cadena[i:],
+            'es_aceptacion': secuencia[i] in afd.estados_aceptacion
+        }
+        pasos.append(paso)
+    
+    # La simulación se detuvo antes de consumir toda la cadena
+    i = len(secuencia) - 1
+    if i < len(cadena):
+        simbolo = cadena[i]
+        estado_anterior = secuencia[-1]
+        
         if simbolo not in afd.alfabeto:
-            paso_error = {
-                'paso': i + 1,
-                'simbolo': simbolo,
-                'estado_anterior': estado_actual,
-                'estado_actual': None,
-                'cadena_restante': cadena[i:],
-                'error': f"Símbolo '{simbolo}' no está en el alfabeto {sorted(afd.alfabeto)}",
-                'es_aceptacion': False
-            }
-            pasos.append(paso_error)
-            return False, pasos
-        
-        # Buscar transición
-        estado_anterior = estado_actual
-        transicion_encontrada = False
-        
-        for transicion in afd.transiciones:
-            if transicion.origen == estado_actual and transicion.simbolo == simbolo:
-                estado_actual = transicion.destino
-                transicion_encontrada = True
-                break
+            error = f"Símbolo '{simbolo}' no está en el alfabeto {sorted(afd.alfabeto)}"
+        else:
+            error = f"No hay transición desde q{estado_anterior} con '{simbolo}'"
         
-        if not transicion_encontrada:
-            paso_error = {
-                'paso': i + 1,
-                'simbolo': simbolo,
-                'estado_anterior': estado_anterior,
-                'estado_actual': None,
-                'cadena_restante': cadena[i:],
-                'error': f"No hay transición desde q{estado_anterior} con '{simbolo}'",
-                'es_aceptacion': False
-            }
-            pasos.append(paso_error)
-            return False, pasos
-        
-        # Registrar paso exitoso
-        paso = {
+        paso_error = {
             'paso': i + 1,
             'simbolo': simbolo,
             'estado_anterior': estado_anterior,
-            'estado_actual': estado_actual,
-            'cadena_restante': cadena[i+1:],
-            'es_aceptacion': estado_actual in afd.estados_aceptacion
+            'estado_actual': None,
+            'cadena_restante': cadena[i:],
+            'error': error,
+            'es_aceptacion': False
         }
-        pasos.append(paso)
+        pasos.append(paso_error)
+        return False, pasos
     
-    # Verificar si el estado final es de aceptación
-    es_aceptada = estado_actual in afd.estados_aceptacion
     return es_aceptada, pasos
 
+class ConjuntoDisperso:
+    """
+    Conjunto de enteros en [0, capacidad) con inserción, pertenencia y
+    vaciado en O(1) (representación densa/dispersa de Briggs-Torczon).
+    Se usa para los estados activos de la simulación del AFN.
+    """
+    def __init__(self, capacidad: int):
+        self.denso = array('i', [0]) * capacidad
+        self.disperso = array('i', [0]) * capacidad
+        self.tamano = 0
+    
+    def __contains__(self, valor: int) -> bool:
+        indice = self.disperso[valor]
+        return indice < self.tamano and self.denso[indice] == valor
+    
+    def agregar(self, valor: int):
+        self.denso[self.tamano] = valor
+        self.disperso[valor] = self.tamano
+        self.tamano += 1
+    
+    def limpiar(self):
+        self.tamano = 0
+    
+    def __len__(self):
+        return self.tamano
+    
+    def __iter__(self):
+        return iter(self.denso[:self.tamano])
+
+def agregar_con_clausura(afn: AFN, conjunto: ConjuntoDisperso, estado: int, pila: List[int]):
+    """Agrega 'estado' y su ε-clausura al conjunto, sin repetir estados ya presentes"""
+    if estado in conjunto:
+        return
+    
+    conjunto.agregar(estado)
+    pila.append(estado)
+    
+    while pila:
+        for destino in afn.adyacencia_epsilon.get(pila.pop(), ()):
+            if destino not in conjunto:
+                conjunto.agregar(destino)
+                pila.append(destino)
+
+def simular_afn(afn: AFN, cadena: str) -> Tuple[bool, Set[int]]:
+    """
+    Simula una cadena directamente sobre el AFN (sin determinizar)
+    Retorna si es aceptada y el conjunto de estados activos al terminar
+    
+    Mantiene el conjunto de estados activos en un ConjuntoDisperso; cada estado
+    entra a lo sumo una vez por símbolo, así que el tiempo es O(n·m) y la
+    memoria O(m) para una cadena de largo n y un AFN de m estados
+    """
+    capacidad = afn.contador_estados
+    actual = ConjuntoDisperso(capacidad)
+    siguiente = ConjuntoDisperso(capacidad)
+    pila = []
+    
+    if afn.estado_inicial in afn.estados:
+        agregar_con_clausura(afn, actual, afn.estado_inicial, pila)
+    
+    for simbolo in cadena:
+        if not actual:
+            break
+        
+        siguiente.limpiar()
+        for estado in actual:
+            for destino in afn.adyacencia.get(estado, {}).get(simbolo, ()):
+                agregar_con_clausura(afn, siguiente, destino, pila)
+        
+        actual, siguiente = siguiente, actual
+    
+    estados_activos = set(actual)
+    return not estados_activos.isdisjoint(afn.estados_aceptacion), estados_activos
+
+def simular_lote(afd: AFD, cadenas: Iterable[str], incluir_estado_final: bool = False) -> List:
+    """
+    Simula muchas cadenas contra un mismo AFD sin armar el detalle de cada paso
+    
+    Retorna una lista con True/False por cadena, o con tuplas
+    (es_aceptada, estado_final) si incluir_estado_final es True
+    (estado_final es None si la simulación se bloqueó)
+    """
+    compilado = afd.compilar()
+    delta = compilado.delta
+    k = compilado.num_simbolos
+    simbolo_a_id = compilado.simbolo_a_id
+    aceptacion = compilado.aceptacion
+    estados = compilado.estados
+    inicial = compilado.inicial
+    resultados = []
+    
+    for cadena in cadenas:
+        estado = inicial
+        for simbolo in cadena:
+            if estado < 0:
+                break
+            id_simbolo = simbolo_a_id.get(simbolo)
+            if id_simbolo is None:
+                estado = -1
+                break
+            estado = delta[estado * k + id_simbolo]
+        
+        es_aceptada = estado >= 0 and aceptacion[estado] == 1
+        if incluir_estado_final:
+            resultados.append((es_aceptada, estados[estado] if estado >= 0 else None))
+        else:
+            resultados.append(es_aceptada)
+    
+    return resultados
+
+def simular_lote_numpy(afd: AFD, cadenas: Iterable[str], incluir_estado_final: bool = False) -> List:
+    """
+    Variante vectorizada de simular_lote (requiere NumPy)
+    
+    Agrupa las cadenas por longitud y avanza todas las de un mismo grupo a la
+    vez sobre la matriz densa de transiciones: un paso es un indexado
+    matriz[estados, simbolos[:, i]] sobre todo el grupo
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("simular_lote_numpy requiere NumPy: pip install numpy")
+    
+    cadenas = list(cadenas)
+    compilado = afd.compilar()
+    n = len(compilado.estados)
+    k = compilado.num_simbolos
+    
+    # Matriz (n+1) x (k+1): la fila n es el estado muerto y la columna k los
+    # caracteres fuera del alfabeto; ambas llevan siempre al estado muerto
+    muerto = n
+    matriz = np.full((n + 1, k + 1), muerto, dtype=np.int32)
+    if n and k:
+        bloque = np.array(compilado.delta, dtype=np.int32).reshape(n, k)
+        matriz[:n, :k] = np.where(bloque < 0, muerto, bloque)
+    
+    aceptacion = np.zeros(n + 1, dtype=bool)
+    aceptacion[:n] = np.frombuffer(bytes(compilado.aceptacion), dtype=np.uint8).astype(bool)
+    
+    # Tabla de código Unicode -> id de símbolo
+    simbolos_simples = [(s, i) for s, i in compilado.simbolo_a_id.items() if len(s) == 1]
+    tamano_tabla = max((ord(s) for s, _ in simbolos_simples), default=0) + 1
+    tabla_codigos = np.full(tamano_tabla, k, dtype=np.int32)
+    for simbolo, id_simbolo in simbolos_simples:
+        tabla_codigos[ord(simbolo)] = id_simbolo
+    
+    inicial = compilado.inicial if compilado.inicial >= 0 else muerto
+    finales = np.full(len(cadenas), inicial, dtype=np.int32)
+    
+    por_longitud = defaultdict(list)
+    for indice, cadena in enumerate(cadenas):
+        por_longitud[len(cadena)].append(indice)
+    
+    for longitud, indices in por_longitud.items():
+        if longitud == 0:
+            continue
+        
+        # Códigos de todas las cadenas del grupo en una matriz (cadenas x longitud)
+        codigos = np.frombuffer(''.join(cadenas[i] for i in indices).encode('utf-32-le'),
+                                dtype=np.uint32).reshape(len(indices), longitud)
+        fuera_de_tabla = codigos >= tamano_tabla
+        simbolos = tabla_codigos[np.where(fuera_de_tabla, 0, codigos)]
+        simbolos[fuera_de_tabla] = k
+        
+        estados = np.full(len(indices), inicial, dtype=np.int32)
+        for i in range(longitud):
+            estados = matriz[estados, simbolos[:, i]]
+        finales[indices] = estados
+    
+    aceptadas = aceptacion[finales].tolist()
+    if not incluir_estado_final:
+        return aceptadas
+    
+    return [(es_aceptada, compilado.estados[final] if final != muerto else None)
+            for es_aceptada, final in zip(aceptadas, finales.tolist())]
+
+def leer_lineas(ruta: str, usar_mmap: bool = True) -> Iterator[str]:
+    """
+    Lee un archivo línea por línea (sin el salto de línea final)
+    ruta '-' lee de stdin; con usar_mmap el archivo se mapea en memoria
+    en lugar de leerse por bloques
+    
+    Los bytes que no son UTF-8 válido se decodifican con 'surrogateescape':
+    no coinciden con ningún símbolo del alfabeto y, si la salida se escribe
+    con el mismo manejador de errores, se reproducen sin cambios
+    """
+    if ruta == '-':
+        for linea in sys.stdin.buffer:
+            yield linea.rstrip(b'\r\n').decode('utf-8', errors='surrogateescape')
+        return
+    
+    with open(ruta, 'rb') as archivo:
+        try:
+            mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) if usar_mmap else None
+        except ValueError:
+            mapa = None  # archivo vacío: no se puede mapear
+        
+        if mapa is None:
+            for linea in archivo:
+                yield linea.rstrip(b'\r\n').decode('utf-8', errors='surrogateescape')
+            return
+        
+        try:
+            for linea in iter(mapa.readline, b''):
+                yield linea.rstrip(b'\r\n').decode('utf-8', errors='surrogateescape')
+        finally:
+            mapa.close()
+
+def simular_flujo(afd: AFD, ruta: str = '-', salida: Optional[TextIO] = None,
+                  solo_marcas: bool = False, usar_mmap: bool = True) -> Tuple[int, int]:
+    """
+    Procesa un archivo (o stdin) línea por línea con el AFD compilado y escribe
+    en 'salida' (stdout por defecto) a medida que avanza:
+    - las líneas aceptadas, o
+    - con solo_marcas, un '1' o '0' por cada línea leída
+    
+    Retorna (líneas procesadas, líneas aceptadas)
+    """
+    if salida is None:
+        salida = sys.stdout
+    
+    acepta = afd.compilar().acepta
+    procesadas = 0
+    aceptadas = 0
+    
+    for linea in leer_lineas(ruta, usar_mmap):
+        procesadas += 1
+        es_aceptada = acepta(linea)
+        if es_aceptada:
+            aceptadas += 1
+        
+        if solo_marcas:
+            salida.write('1\n' if es_aceptada else '0\n')
+        elif es_aceptada:
+            salida.write(linea)
+            salida.write('\n')
+    
+    salida.flush()
+    return procesadas, aceptadas
+
 def mostrar_simulacion(afd: AFD, cadena: str):
     """Muestra la simulación paso a paso de una cadena en el AFD"""
     print(f"\n{'='*60}")
@@ -141,15 +371,15 @@ def probar_multiple_cadenas(afd: AFD, cadenas: List[str]):
     print(f"{'Cadena':<15} | {'Resultado':<10} | {'Estado Final'}")
     print("-" * 45)
     
-    for cadena in cadenas:
-        es_aceptada, pasos = simular_afd_detallado(afd, cadena)
-        
-        if pasos[-1].get('error'):
+    resultados = simular_lote(afd, cadenas, incluir_estado_final=True)
+    
+    for cadena, (es_aceptada, estado_final) in zip(cadenas, resultados):
+        if estado_final is None:
             resultado = "ERROR"
             estado_final = "N/A"
         else:
             resultado = "ACEPTA" if es_aceptada else "RECHAZA"
-            estado_final = f"q{pasos[-1]['estado_actual']}"
+            estado_final = f"q{estado_final}"
         
         print(f"'{cadena}'<14 | {resultado:<10} | {estado_final}")
 
@@ -1,26 +1,23 @@
+import logging
 from collections import defaultdict, deque
-from typing import Set
+from typing import List, Optional, Set
 from AFD.algorithms.thompson import regexp_a_afn
 from models.automata import AFD, AFN, EPSILON
 
+logger = logging.getLogger(__name__)
+
+# Estados del AFD a partir de los cuales se advierte que la construcción crece demasiado
+LIMITE_ADVERTENCIA_AFD = 10000
+
 def epsilon_clausura(afn: AFN, estados: Set[int]) -> Set[int]:
     """
     Calcula la ε-clausura de un conjunto de estados
+    como la unión de las clausuras precalculadas de cada estado
     """
     clausura = set(estados)
-    pila = list(estados)
     
-    while pila:
-        estado_actual = pila.pop()
-        
-        # Buscar todas las transiciones epsilon desde este estado
-        for transicion in afn.transiciones:
-            if (transicion.origen == estado_actual and 
-                transicion.simbolo == EPSILON and
-                transicion.destino not in clausura):
-                
-                clausura.add(transicion.destino)
-                pila.append(transicion.destino)
+    for estado in estados:
+        clausura |= afn.clausura_epsilon(estado)
     
     return clausura
 
@@ -31,10 +28,7 @@ def mover(afn: AFN, estados: Set[int], simbolo: str) -> Set[int]:
     resultado = set()
     
     for estado in estados:
-        for transicion in afn.transiciones:
-            if (transicion.origen == estado and 
-                transicion.simbolo == simbolo):
-                resultado.add(transicion.destino)
+        resultado.update(afn.obtener_destinos(estado, simbolo))
     
     return resultado
 
@@ -44,59 +38,54 @@ def completar_afd(afd: AFD, mostrar_detalles: bool = True) -> AFD:
     
     Args:
         afd: El AFD a completar
-        mostrar_detalles: Si mostrar información detallada del proceso
+        mostrar_detalles: Si registrar el detalle del proceso en el logger del módulo
     
     Returns:
         AFD completo con estado trampa si es necesario
     """
-    
-    # Verificar si ya está completo
-    transiciones_existentes = {}
-    for t in afd.transiciones:
-        if t.origen not in transiciones_existentes:
-            transiciones_existentes[t.origen] = set()
-        transiciones_existentes[t.origen].add(t.simbolo)
+    detalles = mostrar_detalles and logger.isEnabledFor(logging.INFO)
+    depurar = mostrar_detalles and logger.isEnabledFor(logging.DEBUG)
     
     # Verificar qué transiciones faltan
     transiciones_faltantes = []
     
     for estado in afd.estados.keys():
+        transiciones_existentes = afd.tabla.get(estado, {})
         for simbolo in afd.alfabeto:
-            if (estado not in transiciones_existentes or 
-                simbolo not in transiciones_existentes[estado]):
+            if simbolo not in transiciones_existentes:
                 transiciones_faltantes.append((estado, simbolo))
     
     if not transiciones_faltantes:
-        if mostrar_detalles:
-            print("   ✅ AFD ya está completo (no necesita estado trampa)")
+        if detalles:
+            logger.info("   ✅ AFD ya está completo (no necesita estado trampa)")
         return afd
     
-    if mostrar_detalles:
-        print(f"   ⚠️  Faltan {len(transiciones_faltantes)} transiciones")
-        print("   🔧 Agregando estado trampa...")
+    if detalles:
+        logger.info(f"   ⚠️  Faltan {len(transiciones_faltantes)} transiciones")
+        logger.info("   🔧 Agregando estado trampa...")
     
     # Crear estado trampa/muerto (siempre NO de aceptación)
     estado_trampa = afd.agregar_estado(es_aceptacion=False)
     
-    if mostrar_detalles:
-        print(f"   💀 Estado trampa creado: q{estado_trampa}")
+    if detalles:
+        logger.info(f"   💀 Estado trampa creado: q{estado_trampa}")
     
     # Agregar transiciones faltantes hacia el estado trampa
     for estado, simbolo in transiciones_faltantes:
         afd.agregar_transicion(estado, simbolo, estado_trampa)
-        if mostrar_detalles:
-            print(f"     q{estado} --{simbolo}--> q{estado_trampa}")
+        if depurar:
+            logger.debug(f"     q{estado} --{simbolo}--> q{estado_trampa}")
     
     # IMPORTANTE: El estado trampa debe tener transiciones a sí mismo 
     # para TODOS los símbolos del alfabeto (característica del estado trampa)
     for simbolo in afd.alfabeto:
         afd.agregar_transicion(estado_trampa, simbolo, estado_trampa)
-        if mostrar_detalles:
-            print(f"     q{estado_trampa} --{simbolo}--> q{estado_trampa} (bucle trampa)")
+        if depurar:
+            logger.debug(f"     q{estado_trampa} --{simbolo}--> q{estado_trampa} (bucle trampa)")
     
-    if mostrar_detalles:
-        print(f"   ✅ AFD completado con {len(afd.estados)} estados")
-        print(f"      Estado trampa q{estado_trampa}: rechaza todas las cadenas que llegan a él")
+    if detalles:
+        logger.info(f"   ✅ AFD completado con {len(afd.estados)} estados")
+        logger.info(f"      Estado trampa q{estado_trampa}: rechaza todas las cadenas que llegan a él")
     
     return afd
 
@@ -105,38 +94,33 @@ def es_afd_completo(afd: AFD) -> bool:
     Verifica si un AFD está completo (tiene transición para cada estado y símbolo)
     """
     for estado in afd.estados.keys():
-        for simbolo in afd.alfabeto:
-            # Buscar si existe transición para este estado y símbolo
-            encontrada = False
-            for transicion in afd.transiciones:
-                if transicion.origen == estado and transicion.simbolo == simbolo:
-                    encontrada = True
-                    break
-            
-            if not encontrada:
-                return False
+        # La tabla solo contiene símbolos del alfabeto, basta comparar cantidades
+        if len(afd.tabla.get(estado, {})) != len(afd.alfabeto):
+            return False
     
     return True
 
 def mostrar_tabla_transiciones_completa(afd: AFD):
     """Muestra la tabla de transiciones completa del AFD"""
-    print("\n=== Tabla de Transiciones AFD Completa ===")
+    print(formatear_tabla_transiciones_completa(afd))
+
+def formatear_tabla_transiciones_completa(afd: AFD) -> str:
+    """Retorna como texto la tabla de transiciones completa del AFD"""
+    lineas = ["\n=== Tabla de Transiciones AFD Completa ==="]
     
     if not es_afd_completo(afd):
-        print("⚠️ ADVERTENCIA: Este AFD no está completo!")
+        lineas.append("⚠️ ADVERTENCIA: Este AFD no está completo!")
     
-    # Crear tabla de transiciones
-    tabla = defaultdict(dict)
-    for transicion in afd.transiciones:
-        tabla[transicion.origen][transicion.simbolo] = transicion.destino
+    # Tabla de transiciones indexada del AFD
+    tabla = defaultdict(dict, afd.tabla)
     
     # Encabezado
     simbolos_ordenados = sorted(afd.alfabeto)
     encabezado = f"{'Estado':<10} |"
     for simbolo in simbolos_ordenados:
         encabezado += f" {simbolo:<8} |"
-    print(encabezado)
-    print("-" * len(encabezado))
+    lineas.append(encabezado)
+    lineas.append("-" * len(encabezado))
     
     # Filas de estados
     for estado in sorted(afd.estados.keys()):
@@ -161,124 +145,275 @@ def mostrar_tabla_transiciones_completa(afd: AFD):
                 destino = f"q{destino}"
             fila += f" {destino:<8} |"
         
-        print(fila)
+        lineas.append(fila)
+    
+    lineas.append(f"\nLeyenda:")
+    lineas.append(f"→ = Estado inicial")
+    lineas.append(f"* = Estado de aceptación")
+    lineas.append(f"💀 = Estado trampa/muerto")
+    lineas.append(f"ERROR = Transición faltante (no debería ocurrir en AFD completo)")
     
-    print(f"\nLeyenda:")
-    print(f"→ = Estado inicial")
-    print(f"* = Estado de aceptación")
-    print(f"💀 = Estado trampa/muerto")
-    print(f"ERROR = Transición faltante (no debería ocurrir en AFD completo)")
+    return "\n".join(lineas)
 
-def afn_a_afd(afn: AFN) -> AFD:
+def afn_a_afd(afn: AFN, usar_bitsets: bool = False, maximo_estados: Optional[int] = None) -> AFD:
     """
     Convierte un AFN a AFD usando el algoritmo de Construcción de Subconjuntos
+    
+    Las ε-clausuras por estado vienen precalculadas en el AFN y las clausuras
+    de cada conjunto movido se memorizan, de modo que el trabajo depende del
+    tamaño del AFD resultante y no de |AFD| × |Σ| × |δ|
+    
+    Con usar_bitsets=True los conjuntos de estados del AFN se representan
+    como máscaras de bits (ver afn_a_afd_bitsets)
+    
+    Con maximo_estados, la construcción se detiene con ValueError en cuanto el
+    AFD supera esa cantidad de estados, en lugar de terminar de construirlo
     """
+    if usar_bitsets:
+        return afn_a_afd_bitsets(afn, maximo_estados)
+    
     afd = AFD()
     
     # Conjunto inicial: ε-clausura del estado inicial del AFN
-    conjunto_inicial = epsilon_clausura(afn, {afn.estado_inicial})
+    conjunto_inicial = afn.clausura_epsilon(afn.estado_inicial)
     
     # Mapeo de conjuntos de estados AFN -> estado AFD
     conjunto_a_estado = {}
-    estados_procesados = set()
+    # Memo: conjunto movido -> su ε-clausura
+    memo_clausuras = {}
     cola = deque()
     
     # Crear estado inicial del AFD
     estado_inicial_afd = afd.agregar_estado()
     afd.establecer_inicial(estado_inicial_afd)
-    conjunto_a_estado[frozenset(conjunto_inicial)] = estado_inicial_afd
+    conjunto_a_estado[conjunto_inicial] = estado_inicial_afd
     cola.append(conjunto_inicial)
     
     # Verificar si el estado inicial es de aceptación
     if conjunto_inicial.intersection(afn.estados_aceptacion):
         afd.establecer_aceptacion(estado_inicial_afd)
     
-    print(f"Estado inicial AFD {estado_inicial_afd}: {conjunto_inicial}")
+    # El detalle por transición solo se formatea si el nivel DEBUG está activo
+    depurar = logger.isEnabledFor(logging.DEBUG)
+    if depurar:
+        logger.debug(f"Estado inicial AFD {estado_inicial_afd}: {set(conjunto_inicial)}")
     
     while cola:
         conjunto_actual = cola.popleft()
-        conjunto_frozen = frozenset(conjunto_actual)
+        estado_afd_actual = conjunto_a_estado[conjunto_actual]
         
-        if conjunto_frozen in estados_procesados:
-            continue
-            
-        estados_procesados.add(conjunto_frozen)
-        estado_afd_actual = conjunto_a_estado[conjunto_frozen]
+        # Calcular mover() para todos los símbolos con un solo recorrido del conjunto
+        movimientos = defaultdict(set)
+        for estado in conjunto_actual:
+            for simbolo, destinos in afn.adyacencia.get(estado, {}).items():
+                movimientos[simbolo] |= destinos
         
-        # Para cada símbolo del alfabeto
-        for simbolo in afn.alfabeto:
-            # Calcular el conjunto destino
-            conjunto_mover = mover(afn, conjunto_actual, simbolo)
-            if not conjunto_mover:
-                continue
-                
-            conjunto_destino = epsilon_clausura(afn, conjunto_mover)
-            conjunto_destino_frozen = frozenset(conjunto_destino)
+        for simbolo in sorted(movimientos):
+            conjunto_mover = frozenset(movimientos[simbolo])
+            
+            # Calcular el conjunto destino (memorizado)
+            conjunto_destino = memo_clausuras.get(conjunto_mover)
+            if conjunto_destino is None:
+                conjunto_destino = frozenset(epsilon_clausura(afn, conjunto_mover))
+                memo_clausuras[conjunto_mover] = conjunto_destino
             
             # Si es un conjunto nuevo, crear nuevo estado
-            if conjunto_destino_frozen not in conjunto_a_estado:
+            if conjunto_destino not in conjunto_a_estado:
                 nuevo_estado = afd.agregar_estado()
-                conjunto_a_estado[conjunto_destino_frozen] = nuevo_estado
+                conjunto_a_estado[conjunto_destino] = nuevo_estado
                 
                 # Verificar si es estado de aceptación
                 if conjunto_destino.intersection(afn.estados_aceptacion):
                     afd.establecer_aceptacion(nuevo_estado)
                 
                 cola.append(conjunto_destino)
-                print(f"Nuevo estado AFD {nuevo_estado}: {conjunto_destino}")
+                controlar_tamano_afd(afn, nuevo_estado, maximo_estados)
+                if depurar:
+                    logger.debug(f"Nuevo estado AFD {nuevo_estado}: {set(conjunto_destino)}")
+            
+            # Agregar transición
+            estado_destino = conjunto_a_estado[conjunto_destino]
+            afd.agregar_transicion(estado_afd_actual, simbolo, estado_destino)
+            
+            if depurar:
+                logger.debug(f"Transición: {estado_afd_actual} --{simbolo}--> {estado_destino}")
+    
+    return afd
+
+def controlar_tamano_afd(afn: AFN, nuevo_estado: int, maximo_estados: Optional[int]):
+    """
+    Se llama al crear cada estado del AFD: advierte (una vez por construcción)
+    al llegar a LIMITE_ADVERTENCIA_AFD estados y detiene la construcción si
+    supera maximo_estados
+    """
+    if nuevo_estado == LIMITE_ADVERTENCIA_AFD:
+        advertir_tamano_afd(afn)
+    if maximo_estados is not None and nuevo_estado >= maximo_estados:
+        raise ValueError(f"El AFD superó {maximo_estados} estados (AFN de {len(afn.estados)} estados); "
+                         f"construcción detenida (considere AFDPerezoso o simular_afn)")
+
+def advertir_tamano_afd(afn: AFN):
+    """Advierte que el AFD superó LIMITE_ADVERTENCIA_AFD estados"""
+    logger.warning(
+        "La construcción de subconjuntos superó %d estados (AFN de %d estados); "
+        "el AFD puede crecer exponencialmente (considere AFDPerezoso)",
+        LIMITE_ADVERTENCIA_AFD, len(afn.estados))
+
+def mascara_a_conjunto(mascara: int, estados: List[int]) -> Set[int]:
+    """Convierte una máscara de bits en el conjunto de estados del AFN que representa"""
+    conjunto = set()
+    while mascara:
+        bit = mascara & -mascara
+        conjunto.add(estados[bit.bit_length() - 1])
+        mascara ^= bit
+    return conjunto
+
+def afn_a_afd_bitsets(afn: AFN, maximo_estados: Optional[int] = None) -> AFD:
+    """
+    Construcción de Subconjuntos con conjuntos de estados del AFN como enteros (bitsets)
+    
+    Cada estado del AFN ocupa un bit. Se precalcula, por estado y símbolo, la
+    máscara de mover() ya cerrada bajo ε, así que calcular un estado destino del
+    AFD es un OR de máscaras y conjunto_a_estado queda indexado por enteros.
+    """
+    afd = AFD()
+    
+    # Asignar un bit a cada estado del AFN
+    estados = sorted(afn.estados.keys())
+    bit_de = {estado: 1 << i for i, estado in enumerate(estados)}
+    
+    def mascara_clausura(estado: int) -> int:
+        mascara = 0
+        for e in afn.clausura_epsilon(estado):
+            mascara |= bit_de[e]
+        return mascara
+    
+    clausuras = {estado: mascara_clausura(estado) for estado in estados}
+    
+    # Por bit: símbolo -> máscara de ε-clausura(mover(estado, símbolo))
+    transiciones_mascara = []
+    for estado in estados:
+        por_simbolo = {}
+        for simbolo, destinos in afn.adyacencia.get(estado, {}).items():
+            mascara = 0
+            for destino in destinos:
+                mascara |= clausuras[destino]
+            por_simbolo[simbolo] = mascara
+        transiciones_mascara.append(por_simbolo)
+    
+    mascara_aceptacion = 0
+    for estado in afn.estados_aceptacion:
+        mascara_aceptacion |= bit_de.get(estado, 0)
+    
+    # Conjunto inicial: ε-clausura del estado inicial del AFN
+    mascara_inicial = clausuras.get(afn.estado_inicial, 0)
+    
+    # Mapeo de máscaras de estados AFN -> estado AFD
+    conjunto_a_estado = {}
+    cola = deque()
+    
+    # Crear estado inicial del AFD
+    estado_inicial_afd = afd.agregar_estado()
+    afd.establecer_inicial(estado_inicial_afd)
+    conjunto_a_estado[mascara_inicial] = estado_inicial_afd
+    cola.append(mascara_inicial)
+    
+    # Verificar si el estado inicial es de aceptación
+    if mascara_inicial & mascara_aceptacion:
+        afd.establecer_aceptacion(estado_inicial_afd)
+    
+    depurar = logger.isEnabledFor(logging.DEBUG)
+    if depurar:
+        logger.debug(f"Estado inicial AFD {estado_inicial_afd}: {mascara_a_conjunto(mascara_inicial, estados)}")
+    
+    while cola:
+        mascara_actual = cola.popleft()
+        estado_afd_actual = conjunto_a_estado[mascara_actual]
+        
+        # OR de las máscaras precalculadas de cada bit activo
+        movimientos = defaultdict(int)
+        pendiente = mascara_actual
+        while pendiente:
+            bit = pendiente & -pendiente
+            pendiente ^= bit
+            for simbolo, mascara in transiciones_mascara[bit.bit_length() - 1].items():
+                movimientos[simbolo] |= mascara
+        
+        for simbolo in sorted(movimientos):
+            mascara_destino = movimientos[simbolo]
+            
+            # Si es un conjunto nuevo, crear nuevo estado
+            if mascara_destino not in conjunto_a_estado:
+                nuevo_estado = afd.agregar_estado()
+                conjunto_a_estado[mascara_destino] = nuevo_estado
+                
+                # Verificar si es estado de aceptación
+                if mascara_destino & mascara_aceptacion:
+                    afd.establecer_aceptacion(nuevo_estado)
+                
+                cola.append(mascara_destino)
+                controlar_tamano_afd(afn, nuevo_estado, maximo_estados)
+                if depurar:
+                    logger.debug(f"Nuevo estado AFD {nuevo_estado}: {mascara_a_conjunto(mascara_destino, estados)}")
             
             # Agregar transición
-            estado_destino = conjunto_a_estado[conjunto_destino_frozen]
+            estado_destino = conjunto_a_estado[mascara_destino]
             afd.agregar_transicion(estado_afd_actual, simbolo, estado_destino)
             
-            print(f"Transición: {estado_afd_actual} --{simbolo}--> {estado_destino}")
+            if depurar:
+                logger.debug(f"Transición: {estado_afd_actual} --{simbolo}--> {estado_destino}")
     
     return afd
 
-def afn_a_afd_completo(afn: AFN, completar: bool = True, mostrar_detalles: bool = True) -> AFD:
+def afn_a_afd_completo(afn: AFN, completar: bool = True, mostrar_detalles: bool = True,
+                       usar_bitsets: bool = False, maximo_estados: Optional[int] = None) -> AFD:
     """
     Convierte un AFN a AFD usando construcción de subconjuntos y opcionalmente lo completa
     
     Args:
         afn: El AFN a convertir
         completar: Si completar el AFD con estados trampa
-        mostrar_detalles: Si mostrar información detallada del proceso
+        mostrar_detalles: Si registrar el detalle del proceso (nivel INFO del logger)
+        usar_bitsets: Si representar los conjuntos de estados del AFN como bitsets
+        maximo_estados: Máximo de estados del AFD antes de detener la construcción (ver afn_a_afd)
     
     Returns:
         AFD completo (con estado trampa si es necesario)
     """
+    mostrar_detalles = mostrar_detalles and logger.isEnabledFor(logging.INFO)
+    
     if mostrar_detalles:
-        print("🔄 Iniciando conversión AFN → AFD...")
+        logger.info("🔄 Iniciando conversión AFN → AFD...")
     
     # Paso 1: Conversión normal AFN → AFD
-    afd = afn_a_afd(afn)
+    afd = afn_a_afd(afn, usar_bitsets=usar_bitsets, maximo_estados=maximo_estados)
     afd = optimizar_nombres_estados(afd)
     
     if mostrar_detalles:
-        print(f"✅ AFD básico creado:")
-        print(f"   - Estados: {len(afd.estados)}")
-        print(f"   - Transiciones: {len(afd.transiciones)}")
-        print(f"   - Alfabeto: {sorted(afd.alfabeto)}")
-        print(f"   - Completo: {'Sí' if es_afd_completo(afd) else 'No'}")
+        logger.info(f"✅ AFD básico creado:")
+        logger.info(f"   - Estados: {len(afd.estados)}")
+        logger.info(f"   - Transiciones: {len(afd.transiciones)}")
+        logger.info(f"   - Alfabeto: {sorted(afd.alfabeto)}")
+        logger.info(f"   - Completo: {'Sí' if es_afd_completo(afd) else 'No'}")
     
     # Mostrar tabla antes de completar
     if mostrar_detalles:
-        print(f"\n📊 AFD antes de completar:")
-        mostrar_tabla_transiciones(afd)
+        logger.info("📊 AFD antes de completar:")
+        logger.info(formatear_tabla_transiciones(afd))
     
     # Paso 2: Completar AFD si se solicita
     if completar:
         afd = completar_afd(afd, mostrar_detalles)
         
         if mostrar_detalles:
-            print(f"\n📊 AFD después de completar:")
-            mostrar_tabla_transiciones_completa(afd)
+            logger.info("📊 AFD después de completar:")
+            logger.info(formatear_tabla_transiciones_completa(afd))
             
             # Verificación final
             if es_afd_completo(afd):
-                print(f"✅ Verificación: AFD está completamente definido")
+                logger.info(f"✅ Verificación: AFD está completamente definido")
             else:
-                print(f"❌ ERROR: AFD aún no está completo")
+                logger.error(f"❌ ERROR: AFD aún no está completo")
     
     return afd
 
@@ -310,17 +445,19 @@ def optimizar_nombres_estados(afd: AFD) -> AFD:
 
 def mostrar_tabla_transiciones(afd: AFD):
     """Muestra la tabla de transiciones del AFD (puede estar incompleta)"""
-    print("\n=== Tabla de Transiciones AFD ===")
+    print(formatear_tabla_transiciones(afd))
+
+def formatear_tabla_transiciones(afd: AFD) -> str:
+    """Retorna como texto la tabla de transiciones del AFD (puede estar incompleta)"""
+    lineas = ["\n=== Tabla de Transiciones AFD ==="]
     
-    # Crear tabla de transiciones
-    tabla = defaultdict(dict)
-    for transicion in afd.transiciones:
-        tabla[transicion.origen][transicion.simbolo] = transicion.destino
+    # Tabla de transiciones indexada del AFD
+    tabla = defaultdict(dict, afd.tabla)
     
     # Encabezado
     simbolos_ordenados = sorted(afd.alfabeto)
-    print(f"{'Estado':<10} | {' | '.join(f'{s:<8}' for s in simbolos_ordenados)}")
-    print("-" * (12 + len(simbolos_ordenados) * 11))
+    lineas.append(f"{'Estado':<10} | {' | '.join(f'{s:<8}' for s in simbolos_ordenados)}")
+    lineas.append("-" * (12 + len(simbolos_ordenados) * 11))
     
     # Filas
     for estado in sorted(afd.estados.keys()):
@@ -336,9 +473,11 @@ def mostrar_tabla_transiciones(afd: AFD):
             if destino != "---":
                 destino = f"q{destino}"
             fila += f"{destino:<8} | "
-        print(fila)
+        lineas.append(fila)
+    
+    lineas.append(f"\nLeyenda: → = inicial, * = aceptación, --- = transición faltante")
     
-    print(f"\nLeyenda: → = inicial, * = aceptación, --- = transición faltante")
+    return "\n".join(lineas)
 
 def probar_afd_completo():
     """Prueba la construcción de AFD completo con estados trampa"""
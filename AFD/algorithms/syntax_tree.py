@@ -0,0 +1,324 @@
+'''
+Árbol sintáctico de expresiones regulares y simplificación algebraica
+Postfix -> Árbol -> Árbol simplificado -> Postfix
+
+Las reglas preservan el lenguaje y reducen el AFN que construye Thompson:
+(r*)* -> r*, (r+)* -> r*, ε·r -> r, r|r -> r, uniones anidadas aplanadas,
+símbolos y clases de una unión fusionados en una sola clase y prefijos
+comunes factorizados (abc|abd -> ab(c|d))
+'''
+from typing import List, Optional, Tuple
+
+from models.automata import EPSILON
+from .shunting_yard import shunting_yard
+from .tokenizer import (CLASE, CONCATENACION, OPERADOR, REPETICION, SIMBOLO, UNIVERSO,
+                        Token, tokenizar, tokens_a_texto)
+
+CONCAT = 'CONCAT'
+UNION = 'UNION'
+ESTRELLA = 'ESTRELLA'
+MAS = 'MAS'
+
+class Nodo:
+    """
+    Nodo inmutable del árbol sintáctico
+    
+    - SIMBOLO / CLASE: hojas, valor como en Token
+    - CONCAT / UNION: hijos es la tupla de operandos (n-aria)
+    - ESTRELLA / MAS: un hijo
+    - REPETICION: un hijo, valor es (m, n) como en Token
+    
+    Los nodos son comparables y hashables (para eliminar alternativas
+    repetidas); el hash se calcula una sola vez al construir el nodo
+    """
+    __slots__ = ('tipo', 'valor', 'hijos', '_hash')
+    
+    def __init__(self, tipo: str, valor=None, hijos: Tuple['Nodo', ...] = ()):
+        self.tipo = tipo
+        self.valor = valor
+        self.hijos = hijos
+        self._hash = hash((tipo, valor, hijos))
+    
+    def __eq__(self, other):
+        return (isinstance(other, Nodo) and self._hash == other._hash and
+                (self.tipo, self.valor, self.hijos) == (other.tipo, other.valor, other.hijos))
+    
+    def __hash__(self):
+        return self._hash
+    
+    def __repr__(self):
+        if self.es_hoja():
+            return Token(self.tipo, self.valor).a_texto()
+        return f"{self.tipo}{list(self.hijos)}" if self.valor is None else f"{self.tipo}{self.valor}{list(self.hijos)}"
+    
+    def es_hoja(self) -> bool:
+        return self.tipo in (SIMBOLO, CLASE)
+    
+    def es_epsilon(self) -> bool:
+        return self.tipo == SIMBOLO and self.valor == EPSILON
+
+NODO_EPSILON = Nodo(SIMBOLO, EPSILON)
+
+def anulable(nodo: Nodo) -> bool:
+    """Retorna si el lenguaje del nodo contiene la cadena vacía"""
+    if nodo.tipo == SIMBOLO:
+        return nodo.valor == EPSILON
+    if nodo.tipo == CLASE:
+        return False
+    if nodo.tipo == CONCAT:
+        return all(anulable(hijo) for hijo in nodo.hijos)
+    if nodo.tipo == UNION:
+        return any(anulable(hijo) for hijo in nodo.hijos)
+    if nodo.tipo == ESTRELLA:
+        return True
+    if nodo.tipo == REPETICION and nodo.valor[0] == 0:
+        return True
+    return anulable(nodo.hijos[0])
+
+# ---------------------------------------------------------------------------
+# Constructores simplificadores: cada uno recibe hijos ya simplificados
+# ---------------------------------------------------------------------------
+
+def hoja(token: Token) -> Nodo:
+    """Hoja de un token SIMBOLO o CLASE; una clase de un solo símbolo es un símbolo"""
+    if token.tipo == CLASE:
+        simbolos = token.simbolos()
+        if len(simbolos) == 1:
+            return Nodo(SIMBOLO, next(iter(simbolos)))
+    return Nodo(token.tipo, token.valor)
+
+def secuencia(nodo: Nodo) -> Tuple[Nodo, ...]:
+    """Operandos de un nodo visto como concatenación (ε es la secuencia vacía)"""
+    if nodo.tipo == CONCAT:
+        return nodo.hijos
+    if nodo.es_epsilon():
+        return ()
+    return (nodo,)
+
+def concatenacion(hijos: List[Nodo]) -> Nodo:
+    """r·(s·t) -> r·s·t y ε·r -> r"""
+    operandos = []
+    for hijo in hijos:
+        operandos.extend(secuencia(hijo))
+    
+    if not operandos:
+        return NODO_EPSILON
+    if len(operandos) == 1:
+        return operandos[0]
+    return Nodo(CONCAT, hijos=tuple(operandos))
+
+def fusionar_hojas(alternativas: List[Nodo]) -> List[Nodo]:
+    """a|[bc]|d -> [abcd]: las hojas (salvo ε) de una unión se fusionan en una clase"""
+    hojas = [nodo for nodo in alternativas if nodo.es_hoja() and not nodo.es_epsilon()]
+    if len(hojas) < 2:
+        return alternativas
+    
+    simbolos = frozenset().union(*(Token(nodo.tipo, nodo.valor).simbolos() for nodo in hojas))
+    # Si la clase cubre más de la mitad del universo se escribe negada ([^...]), que es más corta
+    if simbolos <= UNIVERSO and len(simbolos) > len(UNIVERSO) // 2:
+        clase = Nodo(CLASE, (True, UNIVERSO - simbolos))
+    else:
+        clase = hoja(Token(CLASE, (False, simbolos)))
+    
+    resultado = []
+    for nodo in alternativas:
+        if nodo.es_hoja() and not nodo.es_epsilon():
+            if clase is not None:
+                resultado.append(clase)
+                clase = None
+        else:
+            resultado.append(nodo)
+    return resultado
+
+def factorizar_prefijos(alternativas: List[Nodo]) -> List[Nodo]:
+    """abc|abd|e -> ab(c|d)|e: agrupa las alternativas por su primer operando"""
+    grupos = {}
+    for nodo in alternativas:
+        operandos = secuencia(nodo)
+        grupos.setdefault(operandos[0] if operandos else None, []).append(operandos)
+    
+    resultado = []
+    for primero, miembros in grupos.items():
+        if primero is None or len(miembros) == 1:
+            resultado.extend(concatenacion(list(operandos)) for operandos in miembros)
+            continue
+        
+        # Prefijo común más largo del grupo
+        largo = 1
+        while all(len(operandos) > largo for operandos in miembros) and \
+                len({operandos[largo] for operandos in miembros}) == 1:
+            largo += 1
+        
+        prefijo = list(miembros[0][:largo])
+        restos = [concatenacion(list(operandos[largo:])) for operandos in miembros]
+        resultado.append(concatenacion(prefijo + [union(restos)]))
+    return resultado
+
+def union(hijos: List[Nodo]) -> Nodo:
+    """(r|s)|t -> r|s|t, r|r -> r, prefijos comunes factorizados y hojas fusionadas"""
+    alternativas = []
+    vistos = set()
+    for hijo in hijos:
+        for alternativa in (hijo.hijos if hijo.tipo == UNION else (hijo,)):
+            if alternativa not in vistos:
+                vistos.add(alternativa)
+                alternativas.append(alternativa)
+    
+    if len(alternativas) > 1:
+        alternativas = fusionar_hojas(factorizar_prefijos(alternativas))
+    
+    # r|ε -> r si r ya acepta la cadena vacía
+    if any(nodo.es_epsilon() for nodo in alternativas) and \
+            any(anulable(nodo) for nodo in alternativas if not nodo.es_epsilon()):
+        alternativas = [nodo for nodo in alternativas if not nodo.es_epsilon()]
+    
+    # La factorización puede volver a producir alternativas iguales
+    alternativas = list(dict.fromkeys(alternativas))
+    if len(alternativas) == 1:
+        return alternativas[0]
+    return Nodo(UNION, hijos=tuple(alternativas))
+
+def estrella(hijo: Nodo) -> Nodo:
+    """(r*)* -> r*, (r+)* -> r*, (r|ε)* -> r* y ε* -> ε"""
+    if hijo.es_epsilon() or hijo.tipo == ESTRELLA:
+        return hijo
+    if hijo.tipo == MAS:
+        return estrella(hijo.hijos[0])
+    if hijo.tipo == UNION and any(nodo.es_epsilon() for nodo in hijo.hijos):
+        return estrella(union([nodo for nodo in hijo.hijos if not nodo.es_epsilon()]))
+    return Nodo(ESTRELLA, hijos=(hijo,))
+
+def mas(hijo: Nodo) -> Nodo:
+    """(r*)+ -> r*, (r+)+ -> r+, ε+ -> ε y r+ -> r* si r acepta ε"""
+    if hijo.es_epsilon() or hijo.tipo in (ESTRELLA, MAS):
+        return hijo
+    if anulable(hijo):
+        return estrella(hijo)
+    return Nodo(MAS, hijos=(hijo,))
+
+def repeticion(hijo: Nodo, minimo: int, maximo: Optional[int]) -> Nodo:
+    """r{0} -> ε, r{1} -> r, r{0,} -> r*, r{1,} -> r+ y ε{m,n} -> ε"""
+    if maximo == 0 or hijo.es_epsilon():
+        return NODO_EPSILON
+    if minimo == 1 and maximo == 1:
+        return hijo
+    if maximo is None and minimo <= 1:
+        return estrella(hijo) if minimo == 0 else mas(hijo)
+    return Nodo(REPETICION, (minimo, maximo), (hijo,))
+
+# ---------------------------------------------------------------------------
+# Conversión postfix <-> árbol
+# ---------------------------------------------------------------------------
+
+def construir_arbol(tokens: List[Token]) -> Optional[Nodo]:
+    """
+    Construye el árbol (sin simplificar, con operadores binarios) de una
+    lista de tokens en postfix. Igual que construir_afn_thompson, ignora los
+    operadores sin suficientes operandos. Retorna None si no hay operandos
+    """
+    pila = []
+    for token in tokens:
+        if token.es_operando():
+            pila.append(Nodo(token.tipo, token.valor))
+        elif token.tipo == REPETICION:
+            if pila:
+                pila.append(Nodo(REPETICION, token.valor, (pila.pop(),)))
+        elif token.valor in (CONCATENACION, '|'):
+            if len(pila) >= 2:
+                derecho = pila.pop()
+                izquierdo = pila.pop()
+                tipo = CONCAT if token.valor == CONCATENACION else UNION
+                pila.append(Nodo(tipo, hijos=(izquierdo, derecho)))
+        elif token.valor in ('*', '+'):
+            if pila:
+                pila.append(Nodo(ESTRELLA if token.valor == '*' else MAS, hijos=(pila.pop(),)))
+    
+    return pila[0] if pila else None
+
+def operandos_encadenados(nodo: Nodo) -> List[Nodo]:
+    """
+    Operandos de una cadena de nodos binarios del mismo tipo ((a·b)·c -> [a, b, c])
+    
+    Se recorre con una pila explícita: las concatenaciones largas forman
+    cadenas tan profundas como la expresión
+    """
+    operandos = []
+    pendientes = [nodo]
+    while pendientes:
+        actual = pendientes.pop()
+        if actual.tipo == nodo.tipo:
+            pendientes.extend(reversed(actual.hijos))
+        else:
+            operandos.append(actual)
+    return operandos
+
+def simplificar(nodo: Nodo) -> Nodo:
+    """Aplica las reglas de simplificación de abajo hacia arriba"""
+    if nodo.es_hoja():
+        return hoja(Token(nodo.tipo, nodo.valor))
+    
+    if nodo.tipo in (CONCAT, UNION):
+        hijos = [simplificar(hijo) for hijo in operandos_encadenados(nodo)]
+        return concatenacion(hijos) if nodo.tipo == CONCAT else union(hijos)
+    
+    hijo = simplificar(nodo.hijos[0])
+    if nodo.tipo == ESTRELLA:
+        return estrella(hijo)
+    if nodo.tipo == MAS:
+        return mas(hijo)
+    return repeticion(hijo, *nodo.valor)
+
+def arbol_a_tokens(nodo: Nodo, salida: Optional[List[Token]] = None) -> List[Token]:
+    """Recorre el árbol en postorden y genera los tokens postfix"""
+    if salida is None:
+        salida = []
+    
+    if nodo.es_hoja():
+        salida.append(Token(nodo.tipo, nodo.valor))
+    elif nodo.tipo in (CONCAT, UNION):
+        operador = Token(OPERADOR, CONCATENACION if nodo.tipo == CONCAT else '|')
+        arbol_a_tokens(nodo.hijos[0], salida)
+        for hijo in nodo.hijos[1:]:
+            arbol_a_tokens(hijo, salida)
+            salida.append(operador)
+    else:
+        arbol_a_tokens(nodo.hijos[0], salida)
+        if nodo.tipo == REPETICION:
+            salida.append(Token(REPETICION, nodo.valor))
+        else:
+            salida.append(Token(OPERADOR, '*' if nodo.tipo == ESTRELLA else '+'))
+    
+    return salida
+
+def simplificar_postfix(postfix: str) -> str:
+    """Simplifica una regexp en postfix (la salida de shunting_yard) sin cambiar su lenguaje"""
+    arbol = construir_arbol(list(tokenizar(postfix, postfix=True)))
+    if arbol is None:
+        return postfix
+    return tokens_a_texto(arbol_a_tokens(simplificar(arbol)))
+
+def regexp_a_arbol(regexp: str) -> Optional[Nodo]:
+    """Árbol simplificado de una regexp en notación infija"""
+    arbol = construir_arbol(list(tokenizar(shunting_yard(regexp), postfix=True)))
+    return simplificar(arbol) if arbol is not None else None
+
+def probar_simplificacion():
+    """Muestra el postfix antes y después de simplificar"""
+    casos_prueba = [
+        "(a*)*",
+        "(a+)*",
+        "εa",
+        "a|a",
+        "(a|b)|(c|a)",
+        "abc|abd",
+        "if|in|int|for",
+        "(a|ε)*",
+        "a{1}b{0,}",
+    ]
+    
+    for caso in casos_prueba:
+        postfix = shunting_yard(caso)
+        print(f"{caso:16} {postfix:24} -> {simplificar_postfix(postfix)}")
+
+if __name__ == "__main__":
+    probar_simplificacion()
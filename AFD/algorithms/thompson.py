@@ -1,13 +1,24 @@
 '''
 Algoritmo de Thompson corregido para construir un AFN a partir de una expresión regular
 '''
+import logging
+
+from typing import Iterable, List, Optional
+
 from models.automata import AFN, EPSILON
 from .shunting_yard import shunting_yard
+from .syntax_tree import simplificar_postfix
+from .tokenizer import REPETICION, SIMBOLO, tokenizar
+
+logger = logging.getLogger(__name__)
 
 class FragmentoAFN:
     """
     Representa un fragmento de AFN con estado inicial y final
     Usado en la construcción de Thompson
+    
+    Todos los fragmentos de una construcción comparten el mismo AFN (arena):
+    el fragmento es solo el par (inicial, final) dentro de ese AFN
     """
     def __init__(self, afn: AFN, inicial: int, final: int):
         self.afn = afn
@@ -18,15 +29,36 @@ def construir_afn_thompson(postfix: str) -> AFN:
     """
     Construye un AFN a partir de una expresión regular en postfix
     usando el algoritmo de Thompson
+    
+    Los fragmentos se construyen dentro de un único AFN compartido, por lo
+    que cada operador agrega O(1) estados y transiciones (construcción lineal)
+    
+    El postfix se tokeniza: admite símbolos escapados ('\\*') y clases
+    ('[abc]', '[^0-9]') tal como las escribe shunting_yard
     """
+    afn = AFN()
     pila = []
     
-    for simbolo in postfix:
-        if simbolo not in ['.', '|', '*', '+']:
+    for token in tokenizar(postfix, postfix=True):
+        simbolo = token.valor
+        if token.tipo == SIMBOLO:
             # Símbolo básico
-            fragment = crear_fragmento_basico(simbolo)
+            fragment = crear_fragmento_basico(simbolo, afn)
             pila.append(fragment)
-            
+        
+        elif token.es_operando():
+            # Clase de caracteres: un solo par de estados con una arista por símbolo
+            fragment = crear_fragmento_clase(token.simbolos(), afn)
+            pila.append(fragment)
+        
+        elif token.tipo == REPETICION:
+            # Repetición acotada {m}, {m,} o {m,n}
+            if len(pila) >= 1:
+                frag = pila.pop()
+                minimo, maximo = simbolo
+                fragment = repetir_fragmento(frag, minimo, maximo)
+                pila.append(fragment)
+        
         elif simbolo == '.':
             # Concatenación
             if len(pila) >= 2:
@@ -34,7 +66,7 @@ def construir_afn_thompson(postfix: str) -> AFN:
                 frag1 = pila.pop()
                 fragment = concatenar_fragmentos(frag1, frag2)
                 pila.append(fragment)
-                
+        
         elif simbolo == '|':
             # Unión
             if len(pila) >= 2:
@@ -42,14 +74,14 @@ def construir_afn_thompson(postfix: str) -> AFN:
                 frag1 = pila.pop()
                 fragment = unir_fragmentos(frag1, frag2)
                 pila.append(fragment)
-                
+        
         elif simbolo == '*':
             # Clausura de Kleene
             if len(pila) >= 1:
                 frag = pila.pop()
                 fragment = clausura_kleene(frag)
                 pila.append(fragment)
-                
+        
         elif simbolo == '+':
             # Clausura positiva (a+ = aa*)
             if len(pila) >= 1:
@@ -67,9 +99,10 @@ def construir_afn_thompson(postfix: str) -> AFN:
     # AFN vacío
     return AFN()
 
-def crear_fragmento_basico(simbolo: str) -> FragmentoAFN:
-    """Crea un fragmento AFN para un símbolo básico"""
-    afn = AFN()
+def crear_fragmento_basico(simbolo: str, afn: AFN = None) -> FragmentoAFN:
+    """Crea un fragmento AFN para un símbolo básico (en 'afn' si se indica)"""
+    if afn is None:
+        afn = AFN()
     inicial = afn.agregar_estado()
     final = afn.agregar_estado()
     
@@ -77,100 +110,190 @@ def crear_fragmento_basico(simbolo: str) -> FragmentoAFN:
     
     return FragmentoAFN(afn, inicial, final)
 
-def concatenar_fragmentos(frag1: FragmentoAFN, frag2: FragmentoAFN) -> FragmentoAFN:
-    """Concatena dos fragmentos AFN"""
-    # Crear un nuevo AFN que combine ambos fragmentos
-    afn_resultado = AFN()
+def crear_fragmento_clase(simbolos: Iterable[str], afn: AFN = None) -> FragmentoAFN:
+    """
+    Crea un fragmento AFN para una clase de caracteres: dos estados unidos
+    por una transición por cada símbolo de la clase (sin estados ni ε extra,
+    a diferencia de una cadena de uniones a|b|c...)
+    """
+    if afn is None:
+        afn = AFN()
+    inicial = afn.agregar_estado()
+    final = afn.agregar_estado()
     
-    # Copiar frag1
-    offset1 = 0
-    copiar_fragmento(afn_resultado, frag1.afn, offset1)
+    for simbolo in sorted(simbolos):
+        afn.agregar_transicion(inicial, simbolo, final)
     
-    # Copiar frag2 con offset
-    offset2 = len(frag1.afn.estados)
-    copiar_fragmento(afn_resultado, frag2.afn, offset2)
+    return FragmentoAFN(afn, inicial, final)
+
+def concatenar_fragmentos(frag1: FragmentoAFN, frag2: FragmentoAFN) -> FragmentoAFN:
+    """Concatena dos fragmentos AFN"""
+    afn = frag1.afn
+    frag2 = mover_a_arena(afn, frag2)
     
     # Conectar el estado final de frag1 con el inicial de frag2 usando epsilon
-    afn_resultado.agregar_transicion(frag1.final, EPSILON, frag2.inicial + offset2)
+    afn.agregar_transicion(frag1.final, EPSILON, frag2.inicial)
     
-    return FragmentoAFN(afn_resultado, frag1.inicial, frag2.final + offset2)
+    return FragmentoAFN(afn, frag1.inicial, frag2.final)
 
 def unir_fragmentos(frag1: FragmentoAFN, frag2: FragmentoAFN) -> FragmentoAFN:
     """Une dos fragmentos AFN con el operador |"""
-    afn_resultado = AFN()
-    
-    # Nuevo estado inicial
-    nuevo_inicial = afn_resultado.agregar_estado()
-    
-    # Copiar frag1 con offset
-    offset1 = 1
-    copiar_fragmento(afn_resultado, frag1.afn, offset1)
+    afn = frag1.afn
+    frag2 = mover_a_arena(afn, frag2)
     
-    # Copiar frag2 con offset
-    offset2 = offset1 + len(frag1.afn.estados)
-    copiar_fragmento(afn_resultado, frag2.afn, offset2)
-    
-    # Nuevo estado final
-    nuevo_final = afn_resultado.agregar_estado()
+    # Nuevos estados inicial y final
+    nuevo_inicial = afn.agregar_estado()
+    nuevo_final = afn.agregar_estado()
     
     # Conectar nuevo inicial con los iniciales de los fragmentos
-    afn_resultado.agregar_transicion(nuevo_inicial, EPSILON, frag1.inicial + offset1)
-    afn_resultado.agregar_transicion(nuevo_inicial, EPSILON, frag2.inicial + offset2)
+    afn.agregar_transicion(nuevo_inicial, EPSILON, frag1.inicial)
+    afn.agregar_transicion(nuevo_inicial, EPSILON, frag2.inicial)
     
     # Conectar los finales con el nuevo final
-    afn_resultado.agregar_transicion(frag1.final + offset1, EPSILON, nuevo_final)
-    afn_resultado.agregar_transicion(frag2.final + offset2, EPSILON, nuevo_final)
+    afn.agregar_transicion(frag1.final, EPSILON, nuevo_final)
+    afn.agregar_transicion(frag2.final, EPSILON, nuevo_final)
     
-    return FragmentoAFN(afn_resultado, nuevo_inicial, nuevo_final)
+    return FragmentoAFN(afn, nuevo_inicial, nuevo_final)
 
 def clausura_kleene(frag: FragmentoAFN) -> FragmentoAFN:
     """Aplica clausura de Kleene (a*) - VERSIÓN CORREGIDA"""
-    afn_resultado = AFN()
-    
-    # Crear nuevo estado inicial
-    nuevo_inicial = afn_resultado.agregar_estado()
+    afn = frag.afn
     
-    # Copiar el fragmento original con offset de 1
-    offset = 1
-    copiar_fragmento(afn_resultado, frag.afn, offset)
-    
-    # Crear nuevo estado final
-    nuevo_final = afn_resultado.agregar_estado()
+    # Nuevos estados inicial y final
+    nuevo_inicial = afn.agregar_estado()
+    nuevo_final = afn.agregar_estado()
     
     # Conexiones para a* según Thompson:
     # 1. Inicial -> Final (para cadena vacía ε)
-    afn_resultado.agregar_transicion(nuevo_inicial, EPSILON, nuevo_final)
+    afn.agregar_transicion(nuevo_inicial, EPSILON, nuevo_final)
     
     # 2. Inicial -> Inicial del fragmento original
-    afn_resultado.agregar_transicion(nuevo_inicial, EPSILON, frag.inicial + offset)
+    afn.agregar_transicion(nuevo_inicial, EPSILON, frag.inicial)
     
     # 3. Final del fragmento -> Final nuevo
-    afn_resultado.agregar_transicion(frag.final + offset, EPSILON, nuevo_final)
+    afn.agregar_transicion(frag.final, EPSILON, nuevo_final)
     
     # 4. Final del fragmento -> Inicial del fragmento (para repetición)
-    afn_resultado.agregar_transicion(frag.final + offset, EPSILON, frag.inicial + offset)
+    afn.agregar_transicion(frag.final, EPSILON, frag.inicial)
     
-    return FragmentoAFN(afn_resultado, nuevo_inicial, nuevo_final)
+    return FragmentoAFN(afn, nuevo_inicial, nuevo_final)
 
 def clausura_positiva(frag: FragmentoAFN) -> FragmentoAFN:
     """Aplica clausura positiva (a+ = aa*)"""
-    afn_resultado = AFN()
-    
-    # Copiar el fragmento original
-    offset = 0
-    copiar_fragmento(afn_resultado, frag.afn, offset)
+    afn = frag.afn
     
     # Crear nuevo estado final
-    nuevo_final = afn_resultado.agregar_estado()
+    nuevo_final = afn.agregar_estado()
     
     # Conexiones para a+:
     # 1. Final del fragmento -> Final nuevo
-    afn_resultado.agregar_transicion(frag.final, EPSILON, nuevo_final)
+    afn.agregar_transicion(frag.final, EPSILON, nuevo_final)
     
     # 2. Final del fragmento -> Inicial del fragmento (bucle para repetición)
-    afn_resultado.agregar_transicion(frag.final, EPSILON, frag.inicial)
+    afn.agregar_transicion(frag.final, EPSILON, frag.inicial)
+    
+    return FragmentoAFN(afn, frag.inicial, nuevo_final)
+
+def fragmento_opcional(frag: FragmentoAFN) -> FragmentoAFN:
+    """Aplica el operador opcional (a? = a|ε) con dos estados nuevos"""
+    afn = frag.afn
+    
+    nuevo_inicial = afn.agregar_estado()
+    nuevo_final = afn.agregar_estado()
+    
+    afn.agregar_transicion(nuevo_inicial, EPSILON, frag.inicial)
+    afn.agregar_transicion(nuevo_inicial, EPSILON, nuevo_final)
+    afn.agregar_transicion(frag.final, EPSILON, nuevo_final)
+    
+    return FragmentoAFN(afn, nuevo_inicial, nuevo_final)
+
+def estados_fragmento(frag: FragmentoAFN) -> List[int]:
+    """
+    Estados que forman un fragmento: los alcanzables desde su inicial
+    
+    Mientras el fragmento está en la pila de Thompson ninguna transición sale
+    de él (su final aún no está conectado), así que el recorrido no se escapa
+    a otras partes de la arena
+    """
+    afn = frag.afn
+    visitados = {frag.inicial, frag.final}
+    pendientes = [frag.inicial]
+    while pendientes:
+        estado = pendientes.pop()
+        for destinos in afn.adyacencia.get(estado, {}).values():
+            for destino in destinos:
+                if destino not in visitados:
+                    visitados.add(destino)
+                    pendientes.append(destino)
+        for destino in afn.adyacencia_epsilon.get(estado, ()):
+            if destino not in visitados:
+                visitados.add(destino)
+                pendientes.append(destino)
+    
+    return sorted(visitados)
+
+def clonar_fragmento(frag: FragmentoAFN, estados: List[int]) -> FragmentoAFN:
+    """Copia el fragmento (cuyos estados son 'estados') dentro de la misma arena"""
+    afn = frag.afn
+    mapa = {estado: afn.agregar_estado() for estado in estados}
+    
+    for estado in estados:
+        origen = mapa[estado]
+        for simbolo, destinos in afn.adyacencia.get(estado, {}).items():
+            for destino in sorted(destinos):
+                afn.agregar_transicion(origen, simbolo, mapa[destino])
+        for destino in sorted(afn.adyacencia_epsilon.get(estado, ())):
+            afn.agregar_transicion(origen, EPSILON, mapa[destino])
+    
+    return FragmentoAFN(afn, mapa[frag.inicial], mapa[frag.final])
+
+def repetir_fragmento(frag: FragmentoAFN, minimo: int, maximo: Optional[int]) -> FragmentoAFN:
+    """
+    Aplica una repetición acotada: a{m} = a...a (m veces), a{m,} = a...aa+
+    y a{m,n} = a...a(a(a...)?)? con n - m copias opcionales anidadas
+    
+    Las copias se clonan del fragmento original dentro de la misma arena
+    antes de conectarlo, así que el costo es lineal en el AFN resultante
+    (n × |fragmento|) en lugar de re-tokenizar una expresión expandida
+    """
+    afn = frag.afn
+    copias_totales = max(minimo, 1) if maximo is None else maximo
+    if copias_totales == 0:
+        # a{0} y a{0,0} solo aceptan la cadena vacía
+        return crear_fragmento_basico(EPSILON, afn)
+    
+    estados = estados_fragmento(frag)
+    copias = [frag] + [clonar_fragmento(frag, estados) for _ in range(copias_totales - 1)]
+    obligatorias = copias[:minimo]
+    opcionales = copias[minimo:]
+    
+    if maximo is None:
+        if minimo == 0:
+            return clausura_kleene(copias[0])
+        obligatorias[-1] = clausura_positiva(obligatorias[-1])
+    
+    # Copias opcionales anidadas de atrás hacia adelante: (a(a)?)?
+    cola = None
+    for copia in reversed(opcionales):
+        cola = fragmento_opcional(copia if cola is None else concatenar_fragmentos(copia, cola))
+    
+    resultado = None
+    for copia in obligatorias + ([cola] if cola is not None else []):
+        resultado = copia if resultado is None else concatenar_fragmentos(resultado, copia)
+    
+    return resultado
+
+def mover_a_arena(afn: AFN, frag: FragmentoAFN) -> FragmentoAFN:
+    """
+    Retorna el fragmento dentro de 'afn'. Si ya pertenece a él no hace nada;
+    si viene de otro AFN lo copia (caso de fragmentos construidos por separado)
+    """
+    if frag.afn is afn:
+        return frag
     
-    return FragmentoAFN(afn_resultado, frag.inicial, nuevo_final)
+    offset = afn.contador_estados
+    copiar_fragmento(afn, frag.afn, offset)
+    return FragmentoAFN(afn, frag.inicial + offset, frag.final + offset)
 
 def copiar_fragmento(afn_destino: AFN, afn_origen: AFN, offset: int):
     """Copia estados y transiciones de un AFN a otro con offset"""
@@ -184,11 +307,11 @@ def copiar_fragmento(afn_destino: AFN, afn_origen: AFN, offset: int):
 
 def regexp_a_afn(regexp: str) -> AFN:
     """Función principal: convierte regexp a AFN"""
-    print(f"Convirtiendo regexp: {regexp}")
+    logger.info("Convirtiendo regexp: %s", regexp)
     
-    # Paso 1: Convertir a postfix
-    postfix = shunting_yard(regexp)
-    print(f"Postfix: {postfix}")
+    # Paso 1: Convertir a postfix y simplificar
+    postfix = simplificar_postfix(shunting_yard(regexp))
+    logger.info("Postfix: %s", postfix)
     
     # Paso 2: Construir AFN con Thompson
     afn = construir_afn_thompson(postfix)
@@ -0,0 +1,203 @@
+'''
+Tokenizador de expresiones regulares
+Reconoce símbolos, operadores, escapes (\\*, \\n, ...), clases de caracteres
+([a-z], [^0-9]), repeticiones acotadas ({m}, {m,}, {m,n}) y el comodín '.',
+que se trata como la clase [^]
+'''
+import re
+from typing import FrozenSet, Iterator, List, Optional, Tuple
+
+from models.automata import EPSILON
+
+SIMBOLO = 'SIMBOLO'
+CLASE = 'CLASE'
+OPERADOR = 'OPERADOR'
+REPETICION = 'REPETICION'
+
+CONCATENACION = '.'
+OPERADORES_TOKEN = {'|', '*', '+', '(', ')'}
+
+# Caracteres que representan '.' y las clases negadas: ASCII imprimible, tabulador
+# y Latin-1 imprimible (letras acentuadas, ñ, ¿, ¡, ...). Cada carácter es una
+# transición del AFN antes de comprimir el alfabeto, por eso no es todo Unicode
+UNIVERSO: FrozenSet[str] = (frozenset(chr(c) for c in range(32, 127)) |
+                            frozenset(chr(c) for c in range(0xA0, 0x100)) | {'\t'})
+
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r'}
+# Caracteres que en postfix se escriben escapados para no confundirse con operadores
+ESPECIALES_POSTFIX = set('.|*+()[]{}\\')
+ESPECIALES_CLASE = set(']\\^-')
+# Repetición acotada: {m}, {m,} o {m,n}; una llave que no calza es un símbolo literal
+PATRON_REPETICION = re.compile(r'\{(\d+)(,(\d*))?\}')
+
+class Token:
+    """
+    Token de una expresión regular
+    
+    - SIMBOLO: valor es el carácter (o EPSILON)
+    - CLASE: valor es (negada, conjunto de caracteres)
+    - OPERADOR: valor es '|', '*', '+', '(', ')' o '.' (concatenación)
+    - REPETICION: valor es (m, n) con n None si no hay máximo
+    """
+    __slots__ = ('tipo', 'valor')
+    
+    def __init__(self, tipo: str, valor):
+        self.tipo = tipo
+        self.valor = valor
+    
+    def __eq__(self, other):
+        return isinstance(other, Token) and (self.tipo, self.valor) == (other.tipo, other.valor)
+    
+    def __hash__(self):
+        return hash((self.tipo, self.valor))
+    
+    def __repr__(self):
+        return f"Token({self.tipo}, {self.valor!r})"
+    
+    def es_operador(self, *operadores: str) -> bool:
+        return self.tipo == OPERADOR and self.valor in operadores
+    
+    def es_operando(self) -> bool:
+        return self.tipo not in (OPERADOR, REPETICION)
+    
+    def simbolos(self) -> FrozenSet[str]:
+        """Conjunto de símbolos que acepta un token SIMBOLO o CLASE"""
+        if self.tipo == SIMBOLO:
+            return frozenset((self.valor,))
+        negada, conjunto = self.valor
+        return UNIVERSO - conjunto if negada else conjunto
+    
+    def a_texto(self) -> str:
+        """Representación textual del token en notación postfix"""
+        if self.tipo == OPERADOR:
+            return self.valor
+        if self.tipo == REPETICION:
+            minimo, maximo = self.valor
+            if maximo == minimo:
+                return f"{{{minimo}}}"
+            return f"{{{minimo},{'' if maximo is None else maximo}}}"
+        if self.tipo == SIMBOLO:
+            if self.valor in ESPECIALES_POSTFIX:
+                return '\\' + self.valor
+            return self.valor
+        
+        negada, conjunto = self.valor
+        partes = ['[^' if negada else '[']
+        for caracter in sorted(conjunto):
+            partes.append('\\' + caracter if caracter in ESPECIALES_CLASE else caracter)
+        partes.append(']')
+        return ''.join(partes)
+
+def leer_escape(texto: str, i: int) -> str:
+    """Retorna el carácter escapado en texto[i] (justo después de la barra)"""
+    if i >= len(texto):
+        raise ValueError("Escape incompleto al final de la expresión")
+    # ε es el símbolo de las transiciones vacías: no hay un ε literal que escapar
+    if texto[i] == EPSILON:
+        raise ValueError(f"'{EPSILON}' no se puede escapar: siempre es la cadena vacía")
+    return ESCAPES.get(texto[i], texto[i])
+
+def leer_clase(texto: str, i: int):
+    """
+    Lee una clase de caracteres que empieza en texto[i] == '['
+    
+    Returns:
+        (token CLASE, posición siguiente a ']')
+    """
+    i += 1
+    negada = i < len(texto) and texto[i] == '^'
+    if negada:
+        i += 1
+    
+    conjunto = set()
+    while True:
+        if i >= len(texto):
+            raise ValueError("Clase de caracteres sin cerrar (falta ']')")
+        caracter = texto[i]
+        if caracter == ']':
+            break
+        
+        if caracter == '\\':
+            i += 1
+            caracter = leer_escape(texto, i)
+        i += 1
+        
+        # Rango a-z (un '-' al final de la clase es literal)
+        if i + 1 < len(texto) and texto[i] == '-' and texto[i + 1] != ']':
+            fin = texto[i + 1]
+            i += 2
+            if fin == '\\':
+                fin = leer_escape(texto, i)
+                i += 1
+            if ord(fin) < ord(caracter):
+                raise ValueError(f"Rango inválido en clase: {caracter}-{fin}")
+            conjunto.update(chr(c) for c in range(ord(caracter), ord(fin) + 1))
+        else:
+            conjunto.add(caracter)
+    
+    # Dentro de una clase ε se convertiría en una transición vacía
+    if EPSILON in conjunto:
+        raise ValueError(f"'{EPSILON}' no puede ir dentro de una clase de caracteres")
+    
+    return Token(CLASE, (negada, frozenset(conjunto))), i + 1
+
+def leer_repeticion(texto: str, i: int) -> Optional[Tuple[Token, int]]:
+    """
+    Lee una repetición acotada que empieza en texto[i] == '{'
+    
+    Returns:
+        (token REPETICION, posición siguiente a '}') o None si no es una repetición
+    """
+    coincidencia = PATRON_REPETICION.match(texto, i)
+    if coincidencia is None:
+        return None
+    
+    minimo = int(coincidencia.group(1))
+    if coincidencia.group(2) is None:
+        maximo = minimo
+    elif coincidencia.group(3):
+        maximo = int(coincidencia.group(3))
+        if maximo < minimo:
+            raise ValueError(f"Repetición inválida: {coincidencia.group(0)} (máximo menor que mínimo)")
+    else:
+        maximo = None
+    
+    return Token(REPETICION, (minimo, maximo)), coincidencia.end()
+
+def tokenizar(texto: str, postfix: bool = False) -> Iterator[Token]:
+    """
+    Genera los tokens de una expresión regular
+    
+    En notación infija '.' es el comodín (cualquier carácter de UNIVERSO: ASCII
+    imprimible, tabulador y Latin-1 imprimible; otros caracteres no coinciden);
+    con postfix=True es el operador de concatenación explícito
+    """
+    i = 0
+    while i < len(texto):
+        caracter = texto[i]
+        
+        if caracter == '\\':
+            yield Token(SIMBOLO, leer_escape(texto, i + 1))
+            i += 2
+        elif caracter == '[':
+            token, i = leer_clase(texto, i)
+            yield token
+        elif caracter == '{' and (repeticion := leer_repeticion(texto, i)) is not None:
+            token, i = repeticion
+            yield token
+        elif caracter == '.':
+            if postfix:
+                yield Token(OPERADOR, CONCATENACION)
+            else:
+                yield Token(CLASE, (True, frozenset()))
+            i += 1
+        elif caracter in OPERADORES_TOKEN:
+            yield Token(OPERADOR, caracter)
+            i += 1
+        else:
+            yield Token(SIMBOLO, caracter)
+            i += 1
+
+def tokens_a_texto(tokens: List[Token]) -> str:
+    """Une los tokens en su representación textual (postfix)"""
+    return ''.join(token.a_texto() for token in tokens)
@@ -0,0 +1,44 @@
+'''
+Corpus compartido por las pruebas: expresiones regulares y cadenas sobre las
+que se comparan las distintas construcciones y simulaciones
+'''
+from itertools import product
+
+from models.automata import AFD
+from AFD.algorithms.thompson import regexp_a_afn
+from AFD.algorithms.subset_construction import afn_a_afd, optimizar_nombres_estados
+from AFD.algorithms.hopcroft import minimizar_afd_hopcroft
+
+EXPRESIONES = [
+    "a",
+    "ab",
+    "a|b",
+    "a*",
+    "(a|b)*abb",
+    "(ab|a)*b{2,3}",
+    "(a|b)*a(a|b)(a|b)",
+    "a+b?c*",
+    "(a|ε)b",
+    "a{2}",
+    "a{1,}b",
+    "(a*)*",
+    "[a-c]+",
+    "[^a]b",
+    "a.c",
+    "(ab)*|c?",
+    "\\*a",
+    "if|in|int|for",
+]
+
+# Todas las cadenas hasta largo 4 sobre un alfabeto que incluye un símbolo ajeno ('d')
+CADENAS = [''.join(p) for largo in range(5) for p in product('abcd', repeat=largo)]
+CADENAS += ["*a", "if", "int", "for", "fo", "aaaaaaaabb", "abababbb"]
+
+def afd_minimo(regexp: str) -> AFD:
+    """Thompson -> subconjuntos -> Hopcroft, sin mostrar detalles"""
+    afd = optimizar_nombres_estados(afn_a_afd(regexp_a_afn(regexp)))
+    return minimizar_afd_hopcroft(afd, mostrar_detalles=False)
+
+def aceptadas(automata, cadenas=CADENAS):
+    """Subconjunto de las cadenas que acepta un AFD (o un AFDCompilado)"""
+    return {cadena for cadena in cadenas if automata.simular(cadena)[0]}
@@ -0,0 +1,48 @@
+'''
+Pruebas de la compresión del alfabeto (clases de símbolos equivalentes)
+Ejecutar desde la raíz del proyecto: python -m pytest -q
+'''
+import pytest
+
+import main
+from AFD.algorithms.thompson import regexp_a_afn
+from AFD.algorithms.subset_construction import afn_a_afd
+from AFD.algorithms.alphabet import clases_equivalencia, comprimir_alfabeto, expandir_alfabeto
+from AFD.algorithms.compiler import compilar_afd
+from .corpus import CADENAS, EXPRESIONES, aceptadas, afd_minimo
+
+def test_clases_equivalencia():
+    afd = afd_minimo("[a-z]+[0-9]")
+    clases = clases_equivalencia(afd)
+    
+    assert len(set(clases.values())) == 2
+    assert len({clases[letra] for letra in "abcxyz"}) == 1
+    assert len({clases[digito] for digito in "0123456789"}) == 1
+    # El representante es el símbolo menor de la clase
+    assert clases['q'] == 'a' and clases['7'] == '0'
+
+@pytest.mark.parametrize("regexp", EXPRESIONES)
+def test_comprimir_y_expandir(regexp):
+    afd = afn_a_afd(regexp_a_afn(regexp))
+    comprimido, clases = comprimir_alfabeto(afd)
+    expandido = expandir_alfabeto(comprimido, clases)
+    
+    assert len(comprimido.transiciones) <= len(afd.transiciones)
+    assert sorted(expandido.transiciones.tuplas()) == sorted(afd.transiciones.tuplas())
+
+@pytest.mark.parametrize("regexp", ["[a-z]+[0-9]", "[^a]b", "a.c", "(a|b)*abb"])
+def test_afd_compilado_sobre_clases(regexp):
+    compilado = compilar_afd(regexp)
+    cadenas = CADENAS + ["q7", "zz0", "ñb", "a€c", "x.c"]
+    assert {c for c in cadenas if compilado.acepta(c)} == aceptadas(afd_minimo(regexp), cadenas)
+    assert compilado.num_simbolos <= len(afd_minimo(regexp).alfabeto)
+
+@pytest.mark.parametrize("construccion", ["thompson", "glushkov", "brzozowski"])
+def test_construccion_paso_a_paso_sobre_clases(construccion):
+    for regexp in ["[a-z]+[0-9]", "[^a]b", "a.c", "(a|b)*abb"]:
+        afd_min = main.construir_automata_completo(regexp, mostrar_detalles=False, exportar=False,
+                                                   construccion=construccion)
+        # El AFD retornado se expande al alfabeto original
+        assert afd_min.alfabeto == afd_minimo(regexp).alfabeto
+        cadenas = CADENAS + ["q7", "zz0", "ñb", "x.c"]
+        assert aceptadas(afd_min, cadenas) == aceptadas(afd_minimo(regexp), cadenas), regexp
@@ -0,0 +1,188 @@
+'''
+Pruebas del modelo de autómatas (models/automata.py)
+Ejecutar desde la raíz del proyecto: python -m pytest -q
+'''
+import json
+import os
+
+import pytest
+
+from models.automata import (AFD, AFN, AFDCompilado, EPSILON, ESTADO_MUERTO, Estado, ListaTransiciones,
+                             Transicion)
+from AFD.algorithms.thompson import regexp_a_afn
+from AFD.algorithms.compiler import compilar_afd
+from AFD.algorithms.simulation import simular_afn
+from .corpus import CADENAS, EXPRESIONES, afd_minimo
+
+def recorrer_tabla(afd: AFD, cadena: str):
+    """Simulación de referencia sobre afd.tabla: (aceptada, estados recorridos)"""
+    estado = afd.estado_inicial
+    secuencia = [estado]
+    for simbolo in cadena:
+        estado = afd.tabla.get(estado, {}).get(simbolo)
+        if estado is None:
+            return False, secuencia
+        secuencia.append(estado)
+    return estado in afd.estados_aceptacion, secuencia
+
+def test_transicion_duplicada_en_afd():
+    afd = AFD()
+    q0 = afd.agregar_estado()
+    q1 = afd.agregar_estado(True)
+    q2 = afd.agregar_estado()
+    afd.establecer_inicial(q0)
+    
+    afd.agregar_transicion(q0, 'a', q1)
+    afd.agregar_transicion(q0, 'a', q1)
+    assert len(afd.transiciones) == 1
+    with pytest.raises(ValueError):
+        afd.agregar_transicion(q0, 'a', q2)
+    assert afd.obtener_destino(q0, 'a') == q1
+    assert afd.simular('a')[0]
+
+@pytest.mark.parametrize("regexp", EXPRESIONES)
+def test_indice_coincide_con_transiciones(regexp):
+    afn = regexp_a_afn(regexp)
+    afd = afd_minimo(regexp)
+    
+    for automata in (afn, afd):
+        for estado in automata.estados:
+            for simbolo in automata.alfabeto:
+                esperados = {t.destino for t in automata.transiciones
+                             if t.origen == estado and t.simbolo == simbolo}
+                assert automata.obtener_destinos(estado, simbolo) == esperados
+
+@pytest.mark.parametrize("regexp", EXPRESIONES)
+def test_afd_compilado_simula_igual_que_la_tabla(regexp):
+    afd = afd_minimo(regexp)
+    compilado = afd.compilar()
+    
+    assert isinstance(compilado, AFDCompilado)
+    for cadena in CADENAS:
+        assert compilado.simular(cadena) == recorrer_tabla(afd, cadena), cadena
+        assert compilado.acepta(cadena) == recorrer_tabla(afd, cadena)[0], cadena
+
+def test_afd_compilado_se_recalcula_al_modificar_el_afd():
+    afd = AFD()
+    q0 = afd.agregar_estado()
+    q1 = afd.agregar_estado(True)
+    afd.establecer_inicial(q0)
+    afd.agregar_transicion(q0, 'a', q1)
+    
+    assert afd.compilar().ejecutar('b') == ESTADO_MUERTO
+    afd.agregar_transicion(q1, 'b', q1)
+    assert afd.compilar().acepta('abb')
+
+def test_visualizar_sin_render_escribe_dot(tmp_path):
+    # No requiere el paquete graphviz
+    afd = afd_minimo("(a|b)*abb")
+    ruta = afd.visualizar(str(tmp_path / "afd"), render=False)
+    assert ruta.endswith(".dot")
+    with open(ruta, encoding='utf-8') as archivo:
+        assert archivo.read() == afd.a_dot()
+
+def test_visualizar_automata_grande_no_renderiza(tmp_path):
+    afn = regexp_a_afn("ab" * 20)
+    ruta = afn.visualizar(str(tmp_path / "afn"), limite_estados=10)
+    assert ruta.endswith(".dot")
+    assert os.path.exists(ruta)
+
+@pytest.mark.parametrize("regexp", EXPRESIONES)
+def test_guardar_y_cargar_binario(regexp, tmp_path):
+    afd = afd_minimo(regexp)
+    ruta = str(tmp_path / "afd.afdc")
+    afd.guardar(ruta)
+    cargado = AFD.cargar(ruta)
+    
+    assert isinstance(cargado, AFDCompilado)
+    for cadena in CADENAS:
+        assert cargado.simular(cadena) == afd.simular(cadena), cadena
+
+def test_guardar_y_cargar_con_clases_de_simbolos(tmp_path):
+    # compilar guarda el AFD sobre el alfabeto comprimido con el mapa de clases
+    compilado = compilar_afd("[a-z]+[0-9]")
+    ruta = str(tmp_path / "afd.afdc")
+    compilado.guardar(ruta)
+    cargado = AFDCompilado.cargar(ruta)
+    
+    assert cargado.num_simbolos == compilado.num_simbolos
+    for cadena in ["abc1", "z9", "a", "1", "ab12", "ñ1"]:
+        assert cargado.acepta(cadena) == compilado.acepta(cadena), cadena
+
+@pytest.mark.parametrize("contenido, mensaje", [
+    (b"", "demasiado corto"),
+    (b"XXXX" + bytes(24), "no es un AFD compilado"),
+])
+def test_cargar_archivo_invalido(contenido, mensaje, tmp_path):
+    ruta = tmp_path / "invalido.afdc"
+    ruta.write_bytes(contenido)
+    with pytest.raises(ValueError, match=mensaje):
+        AFDCompilado.cargar(str(ruta))
+
+def test_cargar_archivo_truncado(tmp_path):
+    ruta = tmp_path / "afd.afdc"
+    afd_minimo("(a|b)*abb").guardar(str(ruta))
+    ruta.write_bytes(ruta.read_bytes()[:-8])
+    with pytest.raises(ValueError, match="truncado"):
+        AFDCompilado.cargar(str(ruta))
+
+@pytest.mark.parametrize("compacto", [False, True])
+def test_exportar_e_importar_json(compacto, tmp_path):
+    ruta = str(tmp_path / "automata.json")
+    
+    afd = afd_minimo("(a|b)*abb")
+    afd.exportar_json(ruta, compacto=compacto)
+    importado = AFD.importar_json(ruta)
+    assert isinstance(importado, AFD)
+    assert importado.estado_inicial == afd.estado_inicial
+    assert importado.estados_aceptacion == afd.estados_aceptacion
+    assert sorted(importado.transiciones.tuplas()) == sorted(afd.transiciones.tuplas())
+    
+    afn = regexp_a_afn("(a|ε)b*")
+    afn.exportar_json(ruta, compacto=compacto)
+    importado = AFN.importar_json(ruta)
+    for cadena in CADENAS:
+        assert simular_afn(importado, cadena)[0] == simular_afn(afn, cadena)[0], cadena
+
+def test_importar_json_con_escapes_y_transiciones_primero(tmp_path):
+    ruta = tmp_path / "automata.json"
+    automata = {
+        "TRANSICIONES": [[0, "\"", 1], [1, "\\", 2], [2, "ñ", 2], [2, "\n", 0]],
+        "ESTADOS": [0, 1, 2],
+        "SIMBOLOS": ["\n", "\"", "\\", "ñ"],
+        "INICIO": 0,
+        "ACEPTACION": [2],
+    }
+    ruta.write_text(json.dumps(automata, ensure_ascii=True), encoding='utf-8')
+    
+    afd = AFD.importar_json(str(ruta))
+    assert afd.alfabeto == {"\n", "\"", "\\", "ñ"}
+    assert afd.simular("\"\\ññ")[0]
+    assert afd.simular("\"\\\n\"\\")[0]
+    assert not afd.simular("\"")[0]
+
+def test_lista_transiciones():
+    lista = ListaTransiciones()
+    lista.agregar(0, 'a', 1)
+    lista.append(Transicion(1, EPSILON, 2))
+    lista.agregar(2, 'a', 0)
+    
+    assert len(lista) == 3
+    assert list(lista.tuplas()) == [(0, 'a', 1), (1, EPSILON, 2), (2, 'a', 0)]
+    assert [(t.origen, t.simbolo, t.destino) for t in lista] == list(lista.tuplas())
+    assert repr(lista[-1]) == "(2, a, 0)"
+    assert [repr(t) for t in lista[1:]] == [f"(1, {EPSILON}, 2)", "(2, a, 0)"]
+    # Los símbolos se guardan una sola vez
+    assert lista.simbolos == ['a', EPSILON]
+    
+    # Las transiciones son vistas: modificarlas no altera la lista
+    transicion = lista[0]
+    transicion.destino = 5
+    assert lista[0].destino == 1
+
+def test_estado_y_transicion_sin_diccionario():
+    for objeto in (Estado(0), Transicion(0, 'a', 1)):
+        assert not hasattr(objeto, '__dict__')
+        with pytest.raises(AttributeError):
+            objeto.otro = 1
+    assert Estado(3, True) == Estado(3) and repr(Estado(3, True)) == "q3*"
@@ -0,0 +1,122 @@
+'''
+Pruebas del punto de entrada de compilación y de sus cachés
+Ejecutar desde la raíz del proyecto: python -m pytest -q
+'''
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from AFD.algorithms import compiler
+from AFD.algorithms.compiler import (CacheCompilacion, cache_por_defecto, compilar, compilar_afd,
+                                     establecer_directorio_cache, purgar)
+from .corpus import CADENAS, afd_minimo
+
+def entradas(directorio) -> list:
+    return sorted(nombre for nombre in os.listdir(directorio) if nombre.endswith('.afdc'))
+
+def test_cache_en_disco_desactivada_por_defecto(tmp_path, monkeypatch):
+    assert cache_por_defecto() is None
+    monkeypatch.chdir(tmp_path)
+    compilar_afd("(a|b)*abb")
+    assert os.listdir(tmp_path) == []
+
+def test_cache_en_disco_reutiliza_compilaciones(tmp_path, monkeypatch):
+    cache = CacheCompilacion(str(tmp_path))
+    primero = compilar_afd("(a|b)*abb", cache=cache)
+    assert len(entradas(tmp_path)) == 1
+    
+    # Una expresión equivalente (misma forma normalizada) sale de la caché sin compilar
+    def no_compilar(*args):
+        raise AssertionError("no debería compilarse")
+    monkeypatch.setattr(compiler, 'construir_afd_compilado', no_compilar)
+    segundo = compilar_afd("((a|b))*abb", cache=cache)
+    for cadena in CADENAS:
+        assert segundo.acepta(cadena) == primero.acepta(cadena), cadena
+
+def test_cache_en_disco_descarta_entradas_danadas(tmp_path):
+    cache = CacheCompilacion(str(tmp_path))
+    compilar_afd("a+b", cache=cache)
+    (nombre,) = entradas(tmp_path)
+    (tmp_path / nombre).write_bytes(b"basura")
+    
+    assert compilar_afd("a+b", cache=cache).acepta("aab")
+    assert (tmp_path / nombre).read_bytes() != b"basura"
+
+def test_cache_en_disco_respeta_el_tamano_maximo(tmp_path):
+    cache = CacheCompilacion(str(tmp_path), tamano_maximo=0)
+    compilar_afd("(a|b)*abb", cache=cache)
+    assert entradas(tmp_path) == []
+    
+    cache = CacheCompilacion(str(tmp_path))
+    for regexp in ["a", "ab", "abc"]:
+        compilar_afd(regexp, cache=cache)
+    assert len(entradas(tmp_path)) == 3
+    cache.limpiar()
+    assert entradas(tmp_path) == []
+
+def test_establecer_directorio_cache(tmp_path):
+    try:
+        establecer_directorio_cache(str(tmp_path))
+        compilar_afd("(ab)*c")
+        assert len(entradas(tmp_path)) == 1
+    finally:
+        establecer_directorio_cache(None)
+    assert cache_por_defecto() is None
+
+@pytest.fixture
+def cache_en_memoria_vacia():
+    purgar()
+    yield
+    purgar()
+
+def test_compilar_memoriza_patrones(cache_en_memoria_vacia):
+    patron = compilar("(a|b)*abb")
+    assert compilar("(a|b)*abb") is patron
+    assert compilar("(a|b)*abb", minimizar=False) is not patron
+    assert compilar("(a|b)*abb", construccion="glushkov") is not patron
+    
+    purgar()
+    assert compilar("(a|b)*abb") is not patron
+
+def test_compilar_desaloja_el_menos_usado(cache_en_memoria_vacia, monkeypatch):
+    monkeypatch.setattr(compiler, 'MAXIMO_CACHE_MEMORIA', 2)
+    a = compilar("a")
+    b = compilar("b")
+    assert compilar("a") is a  # "b" pasa a ser el menos usado
+    compilar("c")
+    assert compilar("a") is a
+    assert compilar("b") is not b
+
+def test_compilar_desde_varios_hilos(cache_en_memoria_vacia):
+    with ThreadPoolExecutor(max_workers=8) as ejecutor:
+        patrones = list(ejecutor.map(lambda _: compilar("(a|b)*a(a|b){3}"), range(32)))
+    assert all(patron is patrones[0] for patron in patrones)
+
+def test_patron_inmutable_y_sin_modificar_el_original(cache_en_memoria_vacia):
+    compilado = afd_minimo("(a|b)*abb").compilar()
+    delta_original = compilado.delta
+    patron = compilar("(a|b)*abb")
+    
+    afd = patron.compilar()
+    with pytest.raises(AttributeError):
+        afd.inicial = 0
+    with pytest.raises(TypeError):
+        afd.delta[0] = 0
+    with pytest.raises(TypeError):
+        afd.simbolo_a_id['z'] = 0
+    
+    solo_lectura = compilado.solo_lectura()
+    assert compilado.delta is delta_original
+    assert solo_lectura.solo_lectura() is solo_lectura
+    assert solo_lectura.acepta("aabb") and not solo_lectura.acepta("abab")
+
+def test_patron_desde_la_cache_en_disco_es_inmutable(cache_en_memoria_vacia, tmp_path):
+    cache = CacheCompilacion(str(tmp_path))
+    compilar("(a|b)*abb", cache=cache)
+    purgar()
+    
+    afd = compilar("(a|b)*abb", cache=cache).compilar()
+    with pytest.raises(TypeError):
+        afd.delta[0] = 0
+    assert afd.acepta("babb")
@@ -0,0 +1,43 @@
+'''
+Pruebas de la construcción por derivadas de Brzozowski
+Ejecutar desde la raíz del proyecto: python -m pytest -q
+'''
+from itertools import product
+
+import pytest
+
+from AFD.algorithms.derivatives import (afd_complemento, afd_diferencia, afd_interseccion,
+                                        regexp_a_afd_derivadas)
+from AFD.algorithms.hopcroft import minimizar_afd_hopcroft
+from AFD.algorithms.compiler import compilar_afd
+from .corpus import EXPRESIONES, aceptadas, afd_minimo
+
+@pytest.mark.parametrize("regexp", EXPRESIONES)
+def test_coincide_con_subconjuntos_y_hopcroft(regexp):
+    derivadas = regexp_a_afd_derivadas(regexp)
+    minimo = afd_minimo(regexp)
+    
+    assert aceptadas(derivadas) == aceptadas(minimo)
+    # Las derivadas ya salen casi mínimas: Hopcroft llega al mismo tamaño
+    assert len(minimizar_afd_hopcroft(derivadas, mostrar_detalles=False).estados) == len(minimo.estados)
+
+def test_interseccion_complemento_y_diferencia():
+    contiene_a_y_b = afd_interseccion("(a|b)*a(a|b)*", "(a|b)*b(a|b)*")
+    no_termina_en_abb = afd_complemento("(a|b)*abb")
+    pares_sin_bb = afd_diferencia("((a|b)(a|b))*", "(a|b)*bb(a|b)*")
+    
+    for cadena in (''.join(p) for largo in range(7) for p in product('ab', repeat=largo)):
+        assert contiene_a_y_b.simular(cadena)[0] == ('a' in cadena and 'b' in cadena), cadena
+        assert no_termina_en_abb.simular(cadena)[0] == (not cadena.endswith('abb')), cadena
+        assert pares_sin_bb.simular(cadena)[0] == (len(cadena) % 2 == 0 and 'bb' not in cadena), cadena
+
+def test_expresiones_profundas():
+    assert len(regexp_a_afd_derivadas("ab" * 3000).estados) == 6001
+    with pytest.raises(ValueError):
+        regexp_a_afd_derivadas("(" * 3000 + "a" + ")*" * 3000)
+
+@pytest.mark.parametrize("construccion", ["thompson", "glushkov", "brzozowski"])
+def test_compilar_con_cada_construccion(construccion):
+    for regexp in EXPRESIONES:
+        compilado = compilar_afd(regexp, construccion=construccion)
+        assert aceptadas(compilado) == aceptadas(afd_minimo(regexp)), regexp
@@ -0,0 +1,37 @@
+'''
+Pruebas de la construcción de Glushkov (autómata de posiciones)
+Ejecutar desde la raíz del proyecto: python -m pytest -q
+'''
+import pytest
+
+from models.automata import EPSILON
+from AFD.algorithms.thompson import regexp_a_afn
+from AFD.algorithms.glushkov import regexp_a_afn_glushkov
+from AFD.algorithms.subset_construction import afn_a_afd
+from AFD.algorithms.simulation import simular_afn
+from .corpus import CADENAS, EXPRESIONES, aceptadas
+
+@pytest.mark.parametrize("regexp", EXPRESIONES)
+def test_coincide_con_thompson(regexp):
+    thompson = regexp_a_afn(regexp)
+    glushkov = regexp_a_afn_glushkov(regexp)
+    for cadena in CADENAS:
+        assert simular_afn(glushkov, cadena)[0] == simular_afn(thompson, cadena)[0], cadena
+    assert aceptadas(afn_a_afd(glushkov)) == aceptadas(afn_a_afd(thompson))
+
+@pytest.mark.parametrize("regexp", EXPRESIONES)
+def test_sin_transiciones_epsilon(regexp):
+    afn = regexp_a_afn_glushkov(regexp)
+    assert all(transicion.simbolo != EPSILON for transicion in afn.transiciones)
+
+@pytest.mark.parametrize("regexp, estados", [
+    ("a", 2),
+    ("(a|b)*abb", 5),  # a|b se fusiona en la clase [ab]
+    ("[a-z]+x", 3),
+    ("(a|ε)b", 3),
+    ("a{3}", 4),
+    ("", 1),
+])
+def test_un_estado_por_posicion(regexp, estados):
+    # Estado inicial más una posición por cada símbolo o clase (tras simplificar)
+    assert len(regexp_a_afn_glushkov(regexp).estados) == estados
@@ -0,0 +1,56 @@
+'''
+Pruebas de la minimización de Hopcroft
+Ejecutar desde la raíz del proyecto: python -m pytest -q
+'''
+import logging
+
+import pytest
+
+from AFD.algorithms.thompson import regexp_a_afn
+from AFD.algorithms.subset_construction import afn_a_afd, optimizar_nombres_estados
+from AFD.algorithms.hopcroft import minimizar_afd_hopcroft, verificar_orden_logico
+from .corpus import EXPRESIONES, aceptadas, afd_minimo
+
+@pytest.mark.parametrize("regexp, estados", [
+    ("(a|b)*abb", 4),
+    ("a*", 1),
+    ("(a|b)*a(a|b)(a|b)", 8),
+    ("a{2,3}", 4),
+])
+def test_tamano_minimo(regexp, estados):
+    assert len(afd_minimo(regexp).estados) == estados
+
+@pytest.mark.parametrize("regexp", EXPRESIONES)
+def test_conserva_el_lenguaje(regexp):
+    afd = optimizar_nombres_estados(afn_a_afd(regexp_a_afn(regexp)))
+    assert aceptadas(afd_minimo(regexp)) == aceptadas(afd)
+
+@pytest.mark.parametrize("regexp", EXPRESIONES)
+def test_es_idempotente(regexp):
+    minimo = afd_minimo(regexp)
+    assert len(minimizar_afd_hopcroft(minimo, mostrar_detalles=False).estados) == len(minimo.estados)
+
+def test_estados_en_orden_bfs():
+    minimo = afd_minimo("(a|b)*abb")
+    assert minimo.estado_inicial == 0
+    assert verificar_orden_logico(minimo)
+
+def test_afd_grande():
+    # (a|b)*a(a|b){10} tiene 2^11 estados y ninguno es equivalente a otro
+    afd = optimizar_nombres_estados(afn_a_afd(regexp_a_afn("(a|b)*a(a|b){10}"), usar_bitsets=True))
+    minimo = minimizar_afd_hopcroft(afd, mostrar_detalles=False)
+    assert len(minimo.estados) == 2 ** 11
+    assert minimo.simular("a" + "b" * 10)[0]
+    assert not minimo.simular("b" * 11)[0]
+
+def test_detalles_por_logging(caplog):
+    afd = optimizar_nombres_estados(afn_a_afd(regexp_a_afn("(a|b)*abb")))
+    
+    with caplog.at_level(logging.DEBUG, logger="AFD.algorithms"):
+        minimizar_afd_hopcroft(afd, mostrar_detalles=False)
+    assert not caplog.records
+    
+    with caplog.at_level(logging.INFO, logger="AFD.algorithms"):
+        minimizar_afd_hopcroft(afd)
+    assert caplog.records
+    assert all(record.name.startswith("AFD.algorithms") for record in caplog.records)
@@ -0,0 +1,46 @@
+'''
+Pruebas del AFD perezoso (determinización bajo demanda con caché LRU)
+Ejecutar desde la raíz del proyecto: python -m pytest -q
+'''
+import random
+
+import pytest
+
+from AFD.algorithms.thompson import regexp_a_afn
+from AFD.algorithms.simulation import simular_afn
+from AFD.algorithms.lazy_dfa import (COSTO_TRANSICION, AFDPerezoso, costo_estado,
+                                     regexp_a_afd_perezoso)
+from .corpus import CADENAS, EXPRESIONES
+
+@pytest.mark.parametrize("regexp", EXPRESIONES)
+def test_acepta_lo_mismo_que_el_afn(regexp):
+    afn = regexp_a_afn(regexp)
+    perezoso = AFDPerezoso(afn)
+    # Un presupuesto mínimo obliga a desalojar estados en casi cada paso
+    perezoso_chico = AFDPerezoso(afn, presupuesto_memoria=1)
+    
+    for cadena in CADENAS:
+        esperado = simular_afn(afn, cadena)[0]
+        assert perezoso.acepta(cadena) == esperado, cadena
+        assert perezoso_chico.acepta(cadena) == esperado, cadena
+
+def test_presupuesto_de_memoria():
+    # El AFD completo de (a|b)*a(a|b){12} tiene 2^13 estados; la caché no debe guardarlos todos
+    perezoso = regexp_a_afd_perezoso("(a|b)*a(a|b){12}", presupuesto_memoria=64 * 1024)
+    aleatorio = random.Random(7)
+    texto = ''.join(aleatorio.choice('ab') for _ in range(300))
+    for fin in range(13, len(texto)):
+        assert perezoso.acepta(texto[:fin]) == (texto[fin - 13] == 'a')
+    
+    assert perezoso.desalojos > 0
+    assert perezoso.memoria_usada <= perezoso.presupuesto_memoria
+    # La memoria contabilizada coincide con lo que hay en la caché
+    assert perezoso.memoria_usada == sum(costo_estado(conjunto) + COSTO_TRANSICION * len(transiciones)
+                                         for conjunto, (_, transiciones) in perezoso.cache.items())
+
+def test_limpiar_cache():
+    perezoso = regexp_a_afd_perezoso("(a|b)*abb")
+    assert perezoso.acepta("aabb")
+    perezoso.limpiar_cache()
+    assert len(perezoso) == 0 and perezoso.memoria_usada == 0
+    assert perezoso.acepta("babb") and not perezoso.acepta("abba")
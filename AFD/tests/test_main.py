@@ -0,0 +1,26 @@
+'''
+Pruebas de los modos no interactivos de main.py
+Ejecutar desde la raíz del proyecto: python -m pytest -q
+'''
+import io
+import json
+import os
+
+import main
+
+def test_modo_lote(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    ruta = tmp_path / "expresiones.txt"
+    ruta.write_text("# comentario\n(a|b)*abb\n\n(a|b\na{2,3}\n", encoding='utf-8')
+    salida = io.StringIO()
+    
+    assert main.modo_lote(str(ruta), salida) == 1
+    resumenes = [json.loads(linea) for linea in salida.getvalue().splitlines()]
+    assert [r['regexp'] for r in resumenes] == ["(a|b)*abb", "(a|b", "a{2,3}"]
+    assert [r['ok'] for r in resumenes] == [True, False, True]
+    assert resumenes[0]['estados']['afd_min'] == 4
+    assert set(resumenes[0]['tiempos_ms']) >= {'shunting_yard', 'subconjuntos', 'hopcroft'}
+    
+    # Sin detalles en la consola ni archivos generados
+    assert capsys.readouterr().out == ""
+    assert os.listdir(tmp_path) == ["expresiones.txt"]
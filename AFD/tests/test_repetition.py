@@ -0,0 +1,47 @@
+'''
+Pruebas de las repeticiones acotadas {m,n} y del límite de estados del AFD
+Ejecutar desde la raíz del proyecto: python -m pytest -q
+'''
+import pytest
+
+from AFD.algorithms.shunting_yard import shunting_yard
+from AFD.algorithms.thompson import regexp_a_afn
+from AFD.algorithms.subset_construction import afn_a_afd
+from AFD.algorithms.compiler import compilar_afd
+from .corpus import aceptadas
+
+@pytest.mark.parametrize("regexp, aceptadas_esperadas", [
+    ("a{3}", {"aaa"}),
+    ("a{2,}", {"aa", "aaa", "aaaa", "aaaaa"}),
+    ("a{1,3}", {"a", "aa", "aaa"}),
+    ("a{0,2}", {"", "a", "aa"}),
+    ("(ab){2}", {"abab"}),
+    ("(ab){0}", {""}),
+])
+def test_repeticiones_acotadas(regexp, aceptadas_esperadas):
+    cadenas = ['a' * n for n in range(6)] + ["ab", "abab", "ababab"]
+    assert aceptadas(compilar_afd(regexp), cadenas) == aceptadas_esperadas
+
+def test_repeticion_invalida():
+    with pytest.raises(ValueError, match="Repetición inválida"):
+        shunting_yard("a{3,1}")
+
+@pytest.mark.parametrize("regexp, cadena", [("a{x}", "a{x}"), ("a{", "a{"), ("a{2", "a{2")])
+def test_llave_sin_repeticion_es_literal(regexp, cadena):
+    compilado = compilar_afd(regexp)
+    assert compilado.acepta(cadena)
+    assert not compilado.acepta("a")
+
+def test_repeticion_grande_crece_linealmente():
+    # Sin advertencias ni límites propios: el tamaño del AFN es lineal en n
+    assert len(regexp_a_afn("a{2000}").estados) < 2 * len(regexp_a_afn("a{1000}").estados) + 2
+
+def test_maximo_estados_detiene_la_compilacion():
+    # (a|b)*a(a|b){8} necesita 2^9 estados en el AFD
+    regexp = "(a|b)*a(a|b){8}"
+    for construccion in ("thompson", "glushkov", "brzozowski"):
+        with pytest.raises(ValueError, match="superó 100 estados"):
+            compilar_afd(regexp, construccion=construccion, maximo_estados=100)
+    with pytest.raises(ValueError, match="superó 100 estados"):
+        afn_a_afd(regexp_a_afn(regexp), usar_bitsets=True, maximo_estados=100)
+    assert compilar_afd(regexp, maximo_estados=None).acepta("a" + "b" * 8)
@@ -0,0 +1,51 @@
+'''
+Pruebas de la búsqueda de subcadenas (semántica leftmost-longest)
+Ejecutar desde la raíz del proyecto: python -m pytest -q
+'''
+import io
+from itertools import product
+
+import pytest
+
+from AFD.algorithms.search import buscar_en_flujo, construir_buscador
+from .corpus import afd_minimo
+
+def busqueda_ingenua(afd, texto: str):
+    """Referencia O(n³): para cada inicio prueba todos los finales con el AFD"""
+    coincidencias = []
+    posicion = 0
+    while posicion <= len(texto):
+        finales = [fin for fin in range(posicion, len(texto) + 1) if afd.simular(texto[posicion:fin])[0]]
+        if finales:
+            coincidencias.append((posicion, finales[-1]))
+            posicion = finales[-1] if finales[-1] > posicion else finales[-1] + 1
+        else:
+            posicion += 1
+    return coincidencias
+
+@pytest.mark.parametrize("regexp, texto, esperado", [
+    ("ab", "xxabyyabab", [(2, 4), (6, 8), (8, 10)]),
+    ("a+", "baaacaab", [(1, 4), (5, 7)]),
+    ("a*", "bab", [(0, 0), (1, 2), (2, 2), (3, 3)]),
+    ("(a|b)*c", "aacbbcxc", [(0, 3), (3, 6), (7, 8)]),
+    ("a|a*b", "aaab", [(0, 4)]),
+    ("a|a*b", "aaa", [(0, 1), (1, 2), (2, 3)]),
+    ("ab|abcd", "abcabcd", [(0, 2), (3, 7)]),
+])
+def test_leftmost_longest(regexp, texto, esperado):
+    assert construir_buscador(regexp).buscar_todo(texto) == esperado
+
+@pytest.mark.parametrize("regexp", ["a|a*b", "(ab|a)*b{2,3}", "a+b*c*", "[a-c]+"])
+def test_coincide_con_busqueda_ingenua(regexp):
+    buscador = construir_buscador(regexp)
+    afd = afd_minimo(regexp)
+    for texto in (''.join(p) for p in product('abcx', repeat=5)):
+        assert buscador.buscar_todo(texto) == busqueda_ingenua(afd, texto), texto
+
+def test_buscar_en_flujo(tmp_path):
+    ruta = tmp_path / "registro.log"
+    ruta.write_text("xabbx\nnada\nabab\n", encoding='utf-8')
+    salida = io.StringIO()
+    
+    assert buscar_en_flujo(construir_buscador("ab+"), str(ruta), salida) == 3
+    assert salida.getvalue() == "1:1:4:abb\n3:0:2:ab\n3:2:4:ab\n"
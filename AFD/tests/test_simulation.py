@@ -0,0 +1,74 @@
+'''
+Pruebas de las simulaciones: AFN directo, lotes de cadenas y archivos por flujo
+Ejecutar desde la raíz del proyecto: python -m pytest -q
+'''
+import io
+
+import pytest
+
+from AFD.algorithms.thompson import regexp_a_afn
+from AFD.algorithms.simulation import (leer_lineas, simular_afn, simular_flujo, simular_lote,
+                                       simular_lote_numpy)
+from .corpus import CADENAS, EXPRESIONES, aceptadas, afd_minimo
+
+@pytest.mark.parametrize("regexp", EXPRESIONES)
+def test_afn_acepta_lo_mismo_que_el_afd(regexp):
+    afn = regexp_a_afn(regexp)
+    assert {cadena for cadena in CADENAS if simular_afn(afn, cadena)[0]} == aceptadas(afd_minimo(regexp))
+
+def test_afn_estados_activos():
+    afn = regexp_a_afn("(a|b)*abb")
+    aceptada, activos = simular_afn(afn, "aabb")
+    assert aceptada
+    assert not activos.isdisjoint(afn.estados_aceptacion)
+    
+    # Un símbolo fuera del alfabeto deja sin estados activos
+    assert simular_afn(afn, "abxbb") == (False, set())
+
+@pytest.mark.parametrize("regexp", ["(a|b)*abb", "[a-c]+", "a{1,}b", "(a|ε)b"])
+def test_simular_lote(regexp):
+    afd = afd_minimo(regexp)
+    esperados = [afd.simular(cadena) for cadena in CADENAS]
+    
+    assert simular_lote(afd, CADENAS) == [aceptada for aceptada, _ in esperados]
+    finales = simular_lote(afd, CADENAS, incluir_estado_final=True)
+    for (aceptada, final), (esperada, secuencia), cadena in zip(finales, esperados, CADENAS):
+        assert aceptada == esperada
+        # La simulación detallada se detiene donde el AFD se bloquea
+        assert final == (secuencia[-1] if len(secuencia) == len(cadena) + 1 else None)
+
+def test_simular_lote_numpy():
+    pytest.importorskip("numpy")
+    afd = afd_minimo("(a|b)*abb")
+    assert simular_lote_numpy(afd, CADENAS, incluir_estado_final=True) == \
+        simular_lote(afd, CADENAS, incluir_estado_final=True)
+
+@pytest.mark.parametrize("usar_mmap", [True, False])
+def test_simular_flujo(usar_mmap, tmp_path):
+    ruta = tmp_path / "entrada.txt"
+    # Una línea con un byte que no es UTF-8 válido y un final de línea de Windows
+    ruta.write_bytes(b"aabb\nab\r\nbabb\n\xffabb\nabb")
+    afd = afd_minimo("(a|b)*abb")
+    
+    salida = io.StringIO()
+    assert simular_flujo(afd, str(ruta), salida, usar_mmap=usar_mmap) == (5, 3)
+    assert salida.getvalue() == "aabb\nbabb\nabb\n"
+    
+    marcas = io.StringIO()
+    simular_flujo(afd, str(ruta), marcas, solo_marcas=True, usar_mmap=usar_mmap)
+    assert marcas.getvalue() == "1\n0\n1\n0\n1\n"
+
+def test_leer_lineas_conserva_bytes_invalidos(tmp_path):
+    ruta = tmp_path / "entrada.bin"
+    ruta.write_bytes(b"a\xffb\n\xe9t\xe9\n")
+    binaria = io.BytesIO()
+    salida = io.TextIOWrapper(binaria, encoding='utf-8', errors='surrogateescape', newline='\n')
+    for linea in leer_lineas(str(ruta)):
+        salida.write(linea + '\n')
+    salida.flush()
+    assert binaria.getvalue() == b"a\xffb\n\xe9t\xe9\n"
+
+def test_simular_flujo_archivo_vacio(tmp_path):
+    ruta = tmp_path / "vacio.txt"
+    ruta.write_bytes(b"")
+    assert simular_flujo(afd_minimo("a*"), str(ruta), io.StringIO()) == (0, 0)
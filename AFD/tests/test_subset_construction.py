@@ -0,0 +1,71 @@
+'''
+Pruebas de la construcción de subconjuntos (AFN -> AFD)
+Ejecutar desde la raíz del proyecto: python -m pytest -q
+'''
+import pytest
+
+from models.automata import AFN, EPSILON
+from AFD.algorithms.thompson import regexp_a_afn
+from AFD.algorithms.subset_construction import afn_a_afd
+from AFD.algorithms.simulation import simular_afn
+from .corpus import CADENAS, EXPRESIONES, aceptadas
+
+def clausura_ingenua(afn: AFN, estado: int):
+    """ε-clausura de referencia: recorrido en profundidad por las transiciones ε"""
+    visitados = {estado}
+    pila = [estado]
+    while pila:
+        actual = pila.pop()
+        for t in afn.transiciones:
+            if t.origen == actual and t.simbolo == EPSILON and t.destino not in visitados:
+                visitados.add(t.destino)
+                pila.append(t.destino)
+    return visitados
+
+def test_clausuras_con_ciclos_epsilon():
+    afn = AFN()
+    q = [afn.agregar_estado() for _ in range(5)]
+    afn.establecer_inicial(q[0])
+    afn.establecer_aceptacion(q[4])
+    # Ciclo ε 0 -> 1 -> 2 -> 0 con salida ε 2 -> 3; 3 -a-> 4
+    afn.agregar_transicion(q[0], EPSILON, q[1])
+    afn.agregar_transicion(q[1], EPSILON, q[2])
+    afn.agregar_transicion(q[2], EPSILON, q[0])
+    afn.agregar_transicion(q[2], EPSILON, q[3])
+    afn.agregar_transicion(q[3], 'a', q[4])
+    
+    for estado in q:
+        assert afn.clausura_epsilon(estado) == clausura_ingenua(afn, estado)
+    assert simular_afn(afn, 'a')[0]
+    assert aceptadas(afn_a_afd(afn), ['', 'a', 'aa']) == {'a'}
+
+@pytest.mark.parametrize("regexp", EXPRESIONES)
+def test_clausuras_precalculadas(regexp):
+    afn = regexp_a_afn(regexp)
+    for estado in afn.estados:
+        assert afn.clausura_epsilon(estado) == clausura_ingenua(afn, estado)
+
+@pytest.mark.parametrize("regexp", EXPRESIONES)
+def test_afd_acepta_lo_mismo_que_el_afn(regexp):
+    afn = regexp_a_afn(regexp)
+    esperadas = {cadena for cadena in CADENAS if simular_afn(afn, cadena)[0]}
+    assert aceptadas(afn_a_afd(afn)) == esperadas
+
+@pytest.mark.parametrize("regexp", EXPRESIONES)
+def test_bitsets_igual_que_conjuntos(regexp):
+    afn = regexp_a_afn(regexp)
+    con_conjuntos = afn_a_afd(afn)
+    con_bitsets = afn_a_afd(afn, usar_bitsets=True)
+    
+    assert len(con_bitsets.estados) == len(con_conjuntos.estados)
+    assert len(con_bitsets.transiciones) == len(con_conjuntos.transiciones)
+    assert aceptadas(con_bitsets) == aceptadas(con_conjuntos)
+
+def test_bitsets_con_muchos_estados_del_afn():
+    # Más de 64 estados en el AFN: las máscaras no caben en una palabra
+    afn = regexp_a_afn("(ab|a){40}b")
+    assert len(afn.estados) > 64
+    afd = afn_a_afd(afn, usar_bitsets=True)
+    cadenas = ["a" * 40 + "b", "ab" * 40 + "b", "ab" * 20 + "a" * 20 + "b", "a" * 39 + "b", "a" * 41 + "b"]
+    assert aceptadas(afd, cadenas) == {c for c in cadenas if simular_afn(afn, c)[0]}
+    assert len(afd.estados) == len(afn_a_afd(afn).estados)
@@ -0,0 +1,41 @@
+'''
+Pruebas del árbol sintáctico y de la simplificación algebraica
+Ejecutar desde la raíz del proyecto: python -m pytest -q
+'''
+import pytest
+
+from AFD.algorithms.shunting_yard import shunting_yard
+from AFD.algorithms.syntax_tree import regexp_a_arbol, simplificar_postfix
+from AFD.algorithms.thompson import construir_afn_thompson
+from AFD.algorithms.simulation import simular_afn
+from .corpus import CADENAS, EXPRESIONES
+
+@pytest.mark.parametrize("regexp", EXPRESIONES + ["(a+)*", "εa", "(a|b)|(c|a)", "abc|abd", "(a|ε)*"])
+def test_simplificacion_no_cambia_el_lenguaje(regexp):
+    postfix = shunting_yard(regexp)
+    simplificado = construir_afn_thompson(simplificar_postfix(postfix))
+    original = construir_afn_thompson(postfix)
+    for cadena in CADENAS:
+        assert simular_afn(simplificado, cadena)[0] == simular_afn(original, cadena)[0], cadena
+
+@pytest.mark.parametrize("regexp, equivalente", [
+    ("(a*)*", "a*"),
+    ("(a+)*", "a*"),
+    ("a|a", "a"),
+    ("εa", "a"),
+    ("(a|b)|(c|a)", "[abc]"),
+    ("abc|abd", "ab(c|d)"),
+])
+def test_simplificacion_normaliza(regexp, equivalente):
+    assert simplificar_postfix(shunting_yard(regexp)) == simplificar_postfix(shunting_yard(equivalente))
+    assert regexp_a_arbol(regexp) == regexp_a_arbol(equivalente)
+
+def test_simplificacion_reduce_el_afn():
+    postfix = shunting_yard("if|in|int|for")
+    assert len(construir_afn_thompson(simplificar_postfix(postfix)).estados) < \
+        len(construir_afn_thompson(postfix).estados)
+
+def test_simplificar_es_idempotente():
+    for regexp in EXPRESIONES:
+        simplificado = simplificar_postfix(shunting_yard(regexp))
+        assert simplificar_postfix(simplificado) == simplificado, regexp
@@ -0,0 +1,43 @@
+'''
+Pruebas de la construcción de Thompson
+Ejecutar desde la raíz del proyecto: python -m pytest -q
+'''
+import pytest
+
+from AFD.algorithms.thompson import regexp_a_afn
+from AFD.algorithms.simulation import simular_afn
+from .corpus import EXPRESIONES
+
+@pytest.mark.parametrize("regexp, aceptadas, rechazadas", [
+    ("a", ["a"], ["", "b", "aa"]),
+    ("ab", ["ab"], ["", "a", "ba", "abb"]),
+    ("a|b", ["a", "b"], ["", "ab"]),
+    ("a*", ["", "a", "aaaa"], ["b", "ab"]),
+    ("a+", ["a", "aaa"], [""]),
+    ("a?", ["a?"], ["a", ""]),
+    ("(a|b)*abb", ["abb", "aabb", "babb"], ["ab", "abba", ""]),
+    ("(a|ε)b", ["b", "ab"], ["", "a"]),
+])
+def test_lenguaje(regexp, aceptadas, rechazadas):
+    afn = regexp_a_afn(regexp)
+    for cadena in aceptadas:
+        assert simular_afn(afn, cadena)[0], cadena
+    for cadena in rechazadas:
+        assert not simular_afn(afn, cadena)[0], cadena
+
+@pytest.mark.parametrize("regexp", EXPRESIONES)
+def test_estados_contiguos(regexp):
+    # Todo se construye en una sola arena: no quedan estados huérfanos ni huecos
+    afn = regexp_a_afn(regexp)
+    assert sorted(afn.estados) == list(range(afn.contador_estados))
+
+@pytest.mark.parametrize("regexp, cadena", [
+    ("ab" * 500, "ab" * 500),
+    ("(a|b)" * 500, "ba" * 250),
+    ("(ab)*" * 300, "ab" * 700),
+])
+def test_tamano_lineal(regexp, cadena):
+    afn = regexp_a_afn(regexp)
+    assert len(afn.estados) <= 2 * len(regexp)
+    assert simular_afn(afn, cadena)[0]
+    assert not simular_afn(afn, cadena + "a")[0]
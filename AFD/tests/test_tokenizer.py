@@ -0,0 +1,53 @@
+'''
+Pruebas del tokenizador: clases de caracteres, rangos, escapes y comodín
+Ejecutar desde la raíz del proyecto: python -m pytest -q
+'''
+import pytest
+
+from AFD.algorithms.shunting_yard import shunting_yard
+from AFD.algorithms.tokenizer import CLASE, OPERADOR, SIMBOLO, UNIVERSO, tokenizar
+from AFD.algorithms.compiler import compilar_afd
+
+@pytest.mark.parametrize("regexp, mensaje", [
+    ("[ab", "sin cerrar"),
+    ("[z-a]", "Rango inválido"),
+    ("ab\\", "Escape incompleto"),
+    ("[a\\", "Escape incompleto"),
+    ("[aε]", "no puede ir dentro de una clase"),
+    ("a\\ε", "no se puede escapar"),
+    ("[\\ε]", "no se puede escapar"),
+])
+def test_errores(regexp, mensaje):
+    with pytest.raises(ValueError, match=mensaje):
+        shunting_yard(regexp)
+
+def test_tokens():
+    clase, escape, comodin, simbolo = tokenizar("[a-c\\]]\\*.x")
+    
+    assert clase.tipo == CLASE and clase.valor == (False, frozenset("abc]"))
+    assert escape.tipo == SIMBOLO and escape.valor == '*'
+    assert comodin.tipo == CLASE and comodin.simbolos() == UNIVERSO
+    assert simbolo.tipo == SIMBOLO and simbolo.valor == 'x'
+
+@pytest.mark.parametrize("regexp, aceptadas, rechazadas", [
+    ("[a-c]+", ["a", "cab"], ["", "d", "aD"]),
+    ("[^0-9]", ["a", "ñ", " "], ["5", "€", ""]),
+    ("[a-]", ["a", "-"], ["b"]),
+    ("a.b", ["añb", "a b", "a\tb", "a.b"], ["a€b", "ab", "a\nb"]),
+    ("\\.\\*\\[", [".*["], ["a*[", ""]),
+    ("a\\nb", ["a\nb"], ["anb"]),
+    ("(ab|ε)c", ["c", "abc"], ["ac", "εc"]),
+])
+def test_lenguaje(regexp, aceptadas, rechazadas):
+    compilado = compilar_afd(regexp)
+    for cadena in aceptadas:
+        assert compilado.acepta(cadena), cadena
+    for cadena in rechazadas:
+        assert not compilado.acepta(cadena), cadena
+
+@pytest.mark.parametrize("regexp", ["[a-c]+x", "[^ab]*", "\\(a\\|b\\)", "a.b", "[\\]\\-^]"])
+def test_postfix_se_vuelve_a_tokenizar(regexp):
+    # shunting_yard escapa lo necesario para que su salida se pueda volver a leer
+    postfix = shunting_yard(regexp)
+    assert [t.valor for t in tokenizar(postfix, postfix=True) if t.tipo != OPERADOR] == \
+        [t.valor for t in tokenizar(regexp) if t.tipo != OPERADOR]
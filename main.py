@@ -5,15 +5,24 @@ Autor: Camila Richter 23183, Marinés García 23391 y Carlos Alburez 231311
 Fecha: Septiembre 2025
 """
 # Importar todos los módulos
-from models.automata import AFD
+from models.automata import AFD, AFN
 from AFD.algorithms.shunting_yard import shunting_yard
-from AFD.algorithms.thompson import construir_afn_thompson
-from AFD.algorithms.subset_construction import afn_a_afd, afn_a_afd_completo, mostrar_tabla_transiciones, optimizar_nombres_estados, es_afd_completo
+from AFD.algorithms.syntax_tree import simplificar_postfix
+from AFD.algorithms.subset_construction import afn_a_afd, afn_a_afd_completo, completar_afd, mostrar_tabla_transiciones, optimizar_nombres_estados, es_afd_completo
 from AFD.algorithms.hopcroft import minimizar_afd_hopcroft
-from AFD.algorithms.simulation import simular_afd_detallado, mostrar_simulacion
+from AFD.algorithms.alphabet import comprimir_alfabeto, componer_clases, expandir_alfabeto
+from AFD.algorithms.simulation import simular_afd_detallado, mostrar_simulacion, simular_afn, simular_flujo
+from AFD.algorithms.search import construir_buscador, buscar_en_flujo
+from AFD.algorithms.compiler import (CONSTRUCCIONES, CONSTRUCCIONES_AFD, CONSTRUCCION_POR_DEFECTO, MAXIMO_ESTADOS_AFD,
+                                    compilar, construir_afn, establecer_directorio_cache)
+from AFD.algorithms.tokenizer import tokenizar
 
+import argparse
+import json
+import logging
 import os
 import sys
+import time
 from typing import Optional
 
 def limpiar_pantalla():
@@ -30,71 +39,112 @@ def mostrar_banner():
 ╚═══════════════════════════════════════════════════════════════════════════════╝
     """)
 
-def validar_regexp(regexp: str) -> bool:
-    """Valida si una expresión regular tiene la sintaxis correcta"""
+def error_regexp(regexp: str) -> Optional[str]:
+    """Retorna el motivo por el que una expresión regular es inválida, o None si es válida"""
     try:
-        # Caracteres permitidos
-        permitidos = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789|*+()εÎµ')
-        
-        # Verificar caracteres válidos
-        for char in regexp:
-            if char not in permitidos:
-                print(f"ERROR: Carácter no permitido '{char}'")
-                return False
+        # Separar en tokens (valida clases [..] y escapes \x)
+        try:
+            tokens = list(tokenizar(regexp))
+        except ValueError as e:
+            return str(e)
         
-        # Verificar paréntesis balanceados
+        # Verificar paréntesis balanceados (los escapados son símbolos)
         balance = 0
-        for char in regexp:
-            if char == '(':
+        for token in tokens:
+            if token.es_operador('('):
                 balance += 1
-            elif char == ')':
+            elif token.es_operador(')'):
                 balance -= 1
                 if balance < 0:
-                    print("ERROR: Paréntesis no balanceados")
-                    return False
+                    return "Paréntesis no balanceados"
         
         if balance != 0:
-            print("ERROR: Paréntesis no balanceados")
-            return False
+            return "Paréntesis no balanceados"
         
         # Verificar que no esté vacía
         if not regexp.strip():
-            print("ERROR: Expresión regular vacía")
-            return False
-        
-        return True
+            return "Expresión regular vacía"
         
+        return None
+    
     except Exception as e:
-        print(f"ERROR validando expresión: {e}")
+        return f"validando expresión: {e}"
+
+def validar_regexp(regexp: str) -> bool:
+    """Valida si una expresión regular tiene la sintaxis correcta (imprime el error si no)"""
+    error = error_regexp(regexp)
+    if error is not None:
+        print(f"ERROR: {error}")
         return False
+    return True
 
-def construir_automata_completo(regexp: str) -> Optional[AFD]:
-    """Construye el autómata completo paso a paso"""
-    print(f"\n{'='*70}")
-    print(f"PROCESANDO EXPRESIÓN REGULAR: {regexp}")
-    print(f"{'='*70}")
+def construir_automata_completo(regexp: str, mostrar_detalles: bool = True, exportar: bool = True,
+                                metricas: Optional[dict] = None,
+                                construccion: str = CONSTRUCCION_POR_DEFECTO) -> Optional[AFD]:
+    """
+    Construye el autómata completo paso a paso
+    
+    Args:
+        regexp: Expresión regular a procesar
+        mostrar_detalles: Si imprimir el detalle de cada paso; con False no se
+                          formatea ningún mensaje ni tabla
+        exportar: Si generar los archivos JSON y los gráficos PNG de cada etapa
+        metricas: Diccionario opcional donde se guardan los estados por etapa,
+                  los tiempos (ms) y el error si lo hubo
+        construccion: Construcción del AFN ('thompson' o 'glushkov')
+    
+    Subconjuntos y Hopcroft trabajan sobre el alfabeto comprimido (un
+    representante por clase de símbolos equivalentes), como en compilar; los
+    AFD que se muestran, exportan y retornan se expanden al alfabeto original
+    """
+    tiempos = {}
+    if mostrar_detalles:
+        print(f"\n{'='*70}")
+        print(f"PROCESANDO EXPRESIÓN REGULAR: {regexp}")
+        print(f"{'='*70}")
     
     try:
         # Paso 1: Shunting Yard
-        print("\nPaso 1: Convertir a notación postfix (Shunting Yard)")
+        inicio = time.perf_counter()
         postfix = shunting_yard(regexp)
-        print(f"   Expresión infija:  {regexp}")
-        print(f"   Expresión postfix: {postfix}")
-        
-        # Paso 2: Construir AFN (Thompson)
-        print("\nPaso 2: Construir AFN (Algoritmo de Thompson)")
-        afn = construir_afn_thompson(postfix)
-        afn.establecer_inicial(0)
-        
-        # Encontrar y establecer estados de aceptación
-        if afn.transiciones:
-            max_estado = max(max(t.origen, t.destino) for t in afn.transiciones)
-            afn.establecer_aceptacion(max_estado)
-        
-        print(f"   AFN creado con {len(afn.estados)} estados")
-        print(f"   Alfabeto: {sorted(afn.alfabeto)}")
-        print(f"   Estado inicial: {afn.estado_inicial}")
-        print(f"   Estados de aceptación: {sorted(afn.estados_aceptacion)}")
+        tiempos['shunting_yard'] = (time.perf_counter() - inicio) * 1000
+        if mostrar_detalles:
+            print("\nPaso 1: Convertir a notación postfix (Shunting Yard)")
+            print(f"   Expresión infija:  {regexp}")
+            print(f"   Expresión postfix: {postfix}")
+        
+        # Paso 1b: Simplificación algebraica sobre el árbol sintáctico
+        inicio = time.perf_counter()
+        simplificado = simplificar_postfix(postfix)
+        tiempos['simplificacion'] = (time.perf_counter() - inicio) * 1000
+        if simplificado != postfix:
+            if mostrar_detalles:
+                print(f"   Postfix simplificado: {simplificado}")
+            postfix = simplificado
+        
+        if construccion in CONSTRUCCIONES_AFD:
+            # Paso 2: Construir el AFD directamente (derivadas de Brzozowski, sin AFN)
+            inicio = time.perf_counter()
+            afn = None
+            afd_directo = CONSTRUCCIONES_AFD[construccion](postfix, MAXIMO_ESTADOS_AFD)
+            tiempos[construccion] = (time.perf_counter() - inicio) * 1000
+            
+            if mostrar_detalles:
+                print(f"\nPaso 2: Construir AFD sin AFN (Derivadas de {construccion.capitalize()})")
+                print(f"   AFD creado con {len(afd_directo.estados)} estados")
+        else:
+            # Paso 2: Construir AFN (Thompson o Glushkov)
+            # (La construcción ya establece el estado inicial y los de aceptación)
+            inicio = time.perf_counter()
+            afn = construir_afn(postfix, construccion)
+            tiempos[construccion] = (time.perf_counter() - inicio) * 1000
+            
+            if mostrar_detalles:
+                print(f"\nPaso 2: Construir AFN (Algoritmo de {construccion.capitalize()})")
+                print(f"   AFN creado con {len(afn.estados)} estados")
+                print(f"   Alfabeto: {sorted(afn.alfabeto)}")
+                print(f"   Estado inicial: {afn.estado_inicial}")
+                print(f"   Estados de aceptación: {sorted(afn.estados_aceptacion)}")
         
         
         nombre_base = (regexp.replace('|', '_or_')
@@ -108,64 +158,109 @@ def construir_automata_completo(regexp: str) -> Optional[AFD]:
                             .replace('.', '_dot'))      
         
         # Exportar AFN
-        afn.exportar_json(f"afn_{nombre_base}.json")
-        afn.visualizar(f"afn_{nombre_base}")
-        print(f"   Archivo AFN: afn_{nombre_base}.json")
-        print(f"   Gráfico AFN: afn_{nombre_base}.png")
-        
-        # Paso 3: Convertir AFN a AFD COMPLETO (CON ESTADOS TRAMPA)
-        print("\nPaso 3: Convertir AFN a AFD (Construcción de Subconjuntos)")
-        print("   Creando AFD completo con estados trampa...")
-        
-        # Usar afn_a_afd_completo con completar=True
-        afd = afn_a_afd_completo(afn, completar=True, mostrar_detalles=True)
-        afd = optimizar_nombres_estados(afd)
-        
-        print(f"   AFD completo creado con {len(afd.estados)} estados")
-        print(f"   Alfabeto: {sorted(afd.alfabeto)}")
-        print(f"   Estado inicial: {afd.estado_inicial}")
-        print(f"   Estados de aceptación: {sorted(afd.estados_aceptacion)}")
-        
-        # Verificar que esté completo
-        if es_afd_completo(afd):
-            print(f"   AFD está completo (tiene transiciones para todos los símbolos)")
+        if exportar and afn is not None:
+            afn.exportar_json(f"afn_{nombre_base}.json")
+            grafico = afn.visualizar(f"afn_{nombre_base}")
+            if mostrar_detalles:
+                print(f"   Archivo AFN: afn_{nombre_base}.json")
+                print(f"   Gráfico AFN: {grafico}")
+        
+        if afn is None:
+            # Paso 3: Completar el AFD de las derivadas (CON ESTADOS TRAMPA)
+            if mostrar_detalles:
+                print("\nPaso 3: Completar AFD (estado trampa)")
+            inicio = time.perf_counter()
+            afd_directo, clases = comprimir_alfabeto(optimizar_nombres_estados(afd_directo))
+            afd_comprimido = completar_afd(afd_directo, mostrar_detalles=mostrar_detalles)
+            tiempos['completar'] = (time.perf_counter() - inicio) * 1000
         else:
-            print(f"   WARNING: AFD no está completo")
+            # Paso 3: Convertir AFN a AFD COMPLETO (CON ESTADOS TRAMPA)
+            if mostrar_detalles:
+                print("\nPaso 3: Convertir AFN a AFD (Construcción de Subconjuntos)")
+                print("   Creando AFD completo con estados trampa...")
+            
+            # Usar afn_a_afd_completo con completar=True
+            inicio = time.perf_counter()
+            afn_comprimido, clases = comprimir_alfabeto(afn)
+            afd_comprimido = afn_a_afd_completo(afn_comprimido, completar=True, mostrar_detalles=mostrar_detalles,
+                                                maximo_estados=MAXIMO_ESTADOS_AFD)
+            afd_comprimido = optimizar_nombres_estados(afd_comprimido)
+            tiempos['subconjuntos'] = (time.perf_counter() - inicio) * 1000
+        
+        # El AFD completo sobre el alfabeto original solo hace falta para mostrarlo o exportarlo
+        afd = expandir_alfabeto(afd_comprimido, clases) if mostrar_detalles or exportar else afd_comprimido
+        
+        if mostrar_detalles:
+            num_clases = len(set(clases.values()))
+            if num_clases < len(clases):
+                print(f"   Alfabeto comprimido: {len(clases)} símbolos en {num_clases} clases")
+            print(f"   AFD completo creado con {len(afd.estados)} estados")
+            print(f"   Alfabeto: {sorted(afd.alfabeto)}")
+            print(f"   Estado inicial: {afd.estado_inicial}")
+            print(f"   Estados de aceptación: {sorted(afd.estados_aceptacion)}")
+            
+            # Verificar que esté completo
+            if es_afd_completo(afd):
+                print(f"   AFD está completo (tiene transiciones para todos los símbolos)")
+            else:
+                print(f"   WARNING: AFD no está completo")
         
-        afd.exportar_json(f"afd_{nombre_base}.json")
-        afd.visualizar(f"afd_{nombre_base}")
-        print(f"   Archivo AFD: afd_{nombre_base}.json")
-        print(f"   Gráfico AFD: afd_{nombre_base}.png")
+        if exportar:
+            afd.exportar_json(f"afd_{nombre_base}.json")
+            grafico = afd.visualizar(f"afd_{nombre_base}")
+            if mostrar_detalles:
+                print(f"   Archivo AFD: afd_{nombre_base}.json")
+                print(f"   Gráfico AFD: {grafico}")
         
         # Paso 4: Minimizar AFD (SIN ESTADOS TRAMPA)
-        print("\nPaso 4: Minimizar AFD (Algoritmo de Hopcroft)")
-        print("   Eliminando estados trampa durante minimización...")
-        
-        afd_min = minimizar_afd_hopcroft(afd)
-        afd_min = optimizar_nombres_estados(afd_min)
-        
-        print(f"   AFD minimizado con {len(afd_min.estados)} estados")
-        print(f"   Estado inicial: {afd_min.estado_inicial}")
-        print(f"   Estados de aceptación: {sorted(afd_min.estados_aceptacion)}")
-        
-        reduccion = len(afd.estados) - len(afd_min.estados)
-        if reduccion > 0:
-            print(f"   Reducción: {reduccion} estados eliminados")
-            print(f"      (Estados trampa y equivalentes removidos)")
-        else:
-            print(f"   No se pudo reducir más")
-        
-        # Verificar que el minimal NO esté completo (no debe tener estados trampa)
-        if not es_afd_completo(afd_min):
-            print(f"   AFD minimal es incompleto (sin estados trampa) - CORRECTO")
-        else:
-            print(f"   WARNING: AFD minimal está completo (podría tener estados trampa)")
+        if mostrar_detalles:
+            print("\nPaso 4: Minimizar AFD (Algoritmo de Hopcroft)")
+            print("   Eliminando estados trampa durante minimización...")
+        
+        inicio = time.perf_counter()
+        afd_comprimido, clases_afd = comprimir_alfabeto(afd_comprimido)
+        clases = componer_clases(clases, clases_afd)
+        afd_min = minimizar_afd_hopcroft(afd_comprimido, mostrar_detalles=mostrar_detalles)
+        afd_min = expandir_alfabeto(optimizar_nombres_estados(afd_min), clases)
+        tiempos['hopcroft'] = (time.perf_counter() - inicio) * 1000
+        
+        if mostrar_detalles:
+            print(f"   AFD minimizado con {len(afd_min.estados)} estados")
+            print(f"   Estado inicial: {afd_min.estado_inicial}")
+            print(f"   Estados de aceptación: {sorted(afd_min.estados_aceptacion)}")
+            
+            reduccion = len(afd.estados) - len(afd_min.estados)
+            if reduccion > 0:
+                print(f"   Reducción: {reduccion} estados eliminados")
+                print(f"      (Estados trampa y equivalentes removidos)")
+            else:
+                print(f"   No se pudo reducir más")
+            
+            # Verificar que el minimal NO esté completo (no debe tener estados trampa)
+            if not es_afd_completo(afd_min):
+                print(f"   AFD minimal es incompleto (sin estados trampa) - CORRECTO")
+            else:
+                print(f"   WARNING: AFD minimal está completo (podría tener estados trampa)")
         
         # Exportar AFD minimizado
-        afd_min.exportar_json(f"afd_min_{nombre_base}.json")
-        afd_min.visualizar(f"afd_min_{nombre_base}")
-        print(f"   Archivo AFD Minimal: afd_min_{nombre_base}.json")
-        print(f"   Gráfico AFD Minimal: afd_min_{nombre_base}.png")
+        if exportar:
+            afd_min.exportar_json(f"afd_min_{nombre_base}.json")
+            grafico = afd_min.visualizar(f"afd_min_{nombre_base}")
+            if mostrar_detalles:
+                print(f"   Archivo AFD Minimal: afd_min_{nombre_base}.json")
+                print(f"   Gráfico AFD Minimal: {grafico}")
+        
+        if metricas is not None:
+            metricas['postfix'] = postfix
+            metricas['estados'] = {
+                'afn': len(afn.estados) if afn is not None else None,
+                'afd': len(afd.estados),
+                'afd_min': len(afd_min.estados),
+            }
+            metricas['tiempos_ms'] = {etapa: round(ms, 3) for etapa, ms in tiempos.items()}
+        
+        if not mostrar_detalles:
+            return afd_min
         
         # Mostrar tabla de transiciones final
         print(f"\nTabla de transiciones del AFD minimizado:")
@@ -173,25 +268,103 @@ def construir_automata_completo(regexp: str) -> Optional[AFD]:
         
         # Resumen de archivos generados
         print(f"\nCONSTRUCCIÓN COMPLETA")
-        print(f"Archivos generados:")
-        print(f"   - afn_{nombre_base}.json/png")
-        print(f"   - afd_{nombre_base}.json/png (COMPLETO con estados trampa)")
-        print(f"   - afd_min_{nombre_base}.json/png (MINIMAL sin estados trampa)")
+        if exportar:
+            print(f"Archivos generados:")
+            if afn is not None:
+                print(f"   - afn_{nombre_base}.json/png")
+            print(f"   - afd_{nombre_base}.json/png (COMPLETO con estados trampa)")
+            print(f"   - afd_min_{nombre_base}.json/png (MINIMAL sin estados trampa)")
         
         # Mostrar resumen de reducciones mejorado
         print(f"\nResumen de reducciones:")
-        print(f"   AFN -> AFD:        {len(afn.estados)} -> {len(afd.estados)} estados (completo)")
+        if afn is not None:
+            print(f"   AFN -> AFD:        {len(afn.estados)} -> {len(afd.estados)} estados (completo)")
         print(f"   AFD -> Minimal:    {len(afd.estados)} -> {len(afd_min.estados)} estados (sin trampa)")
-        print(f"   Total (AFN -> Min): {len(afn.estados)} -> {len(afd_min.estados)} estados")
+        if afn is not None:
+            print(f"   Total (AFN -> Min): {len(afn.estados)} -> {len(afd_min.estados)} estados")
         
         return afd_min
-        
+    
     except Exception as e:
-        print(f"\nERROR durante la construcción: {e}")
-        import traceback
-        traceback.print_exc()
+        if metricas is not None:
+            metricas['error'] = str(e)
+        if mostrar_detalles:
+            print(f"\nERROR durante la construcción: {e}")
+            import traceback
+            traceback.print_exc()
         return None
 
+def modo_flujo(regexp: str, ruta: str, solo_marcas: bool, usar_mmap: bool, buscar: bool = False,
+               construccion: str = CONSTRUCCION_POR_DEFECTO) -> int:
+    """
+    Procesa un archivo (o stdin) línea por línea y escribe el resultado en stdout
+    Con buscar=True reporta las coincidencias dentro de cada línea en lugar de
+    evaluar la línea completa
+    """
+    error = error_regexp(regexp)
+    if error is not None:
+        print(f"ERROR: {error}", file=sys.stderr)
+        return 1
+    
+    # Las líneas se leen como UTF-8 con 'surrogateescape' (ver leer_lineas):
+    # escribirlas igual reproduce exactamente los bytes inválidos de la entrada
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8', errors='surrogateescape')
+    
+    try:
+        if buscar:
+            buscador = construir_buscador(regexp)
+            total = buscar_en_flujo(buscador, ruta, sys.stdout, usar_mmap)
+            print(f"Coincidencias encontradas: {total}", file=sys.stderr)
+            return 0
+        
+        # Usa la caché de compilación en disco (ver AFD.algorithms.compiler)
+        afd_minimal = compilar(regexp, construccion=construccion)
+        procesadas, aceptadas = simular_flujo(afd_minimal, ruta, sys.stdout, solo_marcas, usar_mmap)
+    except OSError as e:
+        print(f"ERROR leyendo '{ruta}': {e}", file=sys.stderr)
+        return 1
+    
+    print(f"Líneas procesadas: {procesadas}, aceptadas: {aceptadas}", file=sys.stderr)
+    return 0
+
+def modo_lote(ruta_regexps: str, salida=None, construccion: str = CONSTRUCCION_POR_DEFECTO) -> int:
+    """
+    Compila cada expresión regular de un archivo (una por línea; se ignoran las
+    líneas vacías y las que empiezan con '#') sin imprimir detalles ni generar
+    archivos, y escribe una línea JSON por expresión con los estados por etapa
+    y los tiempos de cada algoritmo
+    """
+    if salida is None:
+        salida = sys.stdout
+    
+    errores = 0
+    with open(ruta_regexps, encoding='utf-8') as archivo:
+        for linea in archivo:
+            regexp = linea.strip()
+            if not regexp or regexp.startswith('#'):
+                continue
+            
+            metricas = {'regexp': regexp}
+            error = error_regexp(regexp)
+            
+            if error is not None:
+                metricas['error'] = f"expresión regular inválida: {error}"
+            else:
+                inicio = time.perf_counter()
+                construir_automata_completo(regexp, mostrar_detalles=False, exportar=False,
+                                            metricas=metricas, construccion=construccion)
+                metricas['tiempo_total_ms'] = round((time.perf_counter() - inicio) * 1000, 3)
+            
+            metricas['ok'] = 'error' not in metricas
+            if not metricas['ok']:
+                errores += 1
+            
+            salida.write(json.dumps(metricas, ensure_ascii=False) + '\n')
+            salida.flush()
+    
+    return 1 if errores else 0
+
 def generar_cadenas_basicas(alfabeto, max_long=3):
     """Genera cadenas básicas de prueba"""
     cadenas = []
@@ -248,18 +421,15 @@ def simular_cadena_con_transiciones(afd: AFD, cadena: str) -> tuple[bool, str]:
             return False, error_msg
         
         # Buscar transición
-        transicion_encontrada = False
-        for t in afd.transiciones:
-            if t.origen == estado_actual and t.simbolo == simbolo:
-                estado_actual = t.destino
-                transiciones.append(f"--{simbolo}-->")
-                transiciones.append(f"q{estado_actual}")
-                transicion_encontrada = True
-                break
+        destino = afd.obtener_destino(estado_actual, simbolo)
         
-        if not transicion_encontrada:
+        if destino is None:
             error_msg = f"ERROR: No hay transición desde q{estado_actual} con símbolo '{simbolo}'"
             return False, error_msg
+        
+        estado_actual = destino
+        transiciones.append(f"--{simbolo}-->")
+        transiciones.append(f"q{estado_actual}")
     
     # Determinar si la cadena es aceptada
     es_aceptada = estado_actual in afd.estados_aceptacion
@@ -276,12 +446,39 @@ def simular_cadena_con_transiciones(afd: AFD, cadena: str) -> tuple[bool, str]:
     
     return es_aceptada, mensaje
 
+def simular_cadena_afn(afn: AFN, cadena: str) -> tuple[bool, str]:
+    """
+    Simula una cadena directamente sobre el AFN (sin determinizar)
+    Retorna: (es_aceptada, mensaje_resultado)
+    """
+    if not cadena:
+        cadena_display = "ε (cadena vacía)"
+    else:
+        cadena_display = f"'{cadena}'"
+    
+    es_aceptada, estados_activos = simular_afn(afn, cadena)
+    
+    if estados_activos:
+        activos = "{" + ", ".join(f"q{e}" for e in sorted(estados_activos)) + "}"
+    else:
+        activos = "ninguno (la simulación se bloqueó)"
+    resultado_simbolo = "ACEPTA" if es_aceptada else "RECHAZA"
+    
+    mensaje = f"""   Cadena: {cadena_display}
+   Estados activos al final: {activos}
+   Resultado: {resultado_simbolo}"""
+    
+    return es_aceptada, mensaje
+
 def simulacion_interactiva(afd: AFD):
-    """Permite al usuario probar cadenas interactivamente"""
+    """Permite al usuario probar cadenas interactivamente (AFD minimal o AFN directo)"""
+    es_afn = isinstance(afd, AFN)
+    tipo = "AFN" if es_afn else "AFD"
+    
     print(f"\n{'='*50}")
-    print(f"SIMULACIÓN DE CADENAS - AFD MINIMAL")
+    print(f"SIMULACIÓN DE CADENAS - {'AFN (SIMULACIÓN DIRECTA)' if es_afn else 'AFD MINIMAL'}")
     print(f"{'='*50}")
-    print(f"AFD con {len(afd.estados)} estados")
+    print(f"{tipo} con {len(afd.estados)} estados")
     print(f"Alfabeto: {sorted(afd.alfabeto)}")
     print(f"Estado inicial: q{afd.estado_inicial}")
     print(f"Estados de aceptación: {[f'q{e}' for e in sorted(afd.estados_aceptacion)]}")
@@ -307,17 +504,93 @@ def simulacion_interactiva(afd: AFD):
             
             # Simular la cadena con transiciones
             print(f"\nSimulando...")
-            es_aceptada, mensaje = simular_cadena_con_transiciones(afd, cadena)
+            if es_afn:
+                es_aceptada, mensaje = simular_cadena_afn(afd, cadena)
+            else:
+                es_aceptada, mensaje = simular_cadena_con_transiciones(afd, cadena)
             print(mensaje)
-            
+        
         except KeyboardInterrupt:
             print(f"\n\nFinalizando simulación...")
             break
         except Exception as e:
             print(f"   ERROR inesperado: {e}")
 
+def parsear_argumentos(argv=None) -> argparse.Namespace:
+    """Define los argumentos de línea de comandos (todos opcionales)"""
+    parser = argparse.ArgumentParser(
+        description="Conversor Regex -> AFN -> AFD -> AFD Minimal. "
+                    "Sin argumentos inicia el modo interactivo.")
+    parser.add_argument('-r', '--regexp',
+                        help="expresión regular (evita pedirla por teclado)")
+    parser.add_argument('-l', '--lote',
+                        help="archivo con una expresión regular por línea: las compila sin "
+                             "interacción ni gráficos y escribe un resumen JSON por línea")
+    parser.add_argument('-a', '--archivo',
+                        help="procesa el archivo línea por línea sin interacción ('-' para stdin)")
+    parser.add_argument('--marcas', action='store_true',
+                        help="con --archivo, escribe 1/0 por línea en lugar de las líneas aceptadas")
+    parser.add_argument('--sin-mmap', action='store_true',
+                        help="con --archivo, lee por bloques en lugar de mapear el archivo en memoria")
+    parser.add_argument('--buscar', action='store_true',
+                        help="con --archivo, reporta cada coincidencia dentro de las líneas "
+                             "(línea:inicio:fin:texto) en lugar de evaluar líneas completas")
+    parser.add_argument('-c', '--construccion', choices=sorted({**CONSTRUCCIONES, **CONSTRUCCIONES_AFD}),
+                        default=CONSTRUCCION_POR_DEFECTO,
+                        help="construcción del autómata: thompson (por defecto), glushkov "
+                             "(AFN sin transiciones ε, más rápido de determinizar en patrones largos) "
+                             "o brzozowski (AFD directo por derivadas, sin AFN)")
+    parser.add_argument('-v', '--verbose', action='count', default=0,
+                        help="muestra más detalle de los algoritmos (-vv para el detalle por transición)")
+    return parser.parse_args(argv)
+
+def configurar_logging(verbosidad: int, interactivo: bool):
+    """
+    Configura los mensajes de los algoritmos según el modo de ejecución
+    
+    En modo interactivo se muestran en stdout desde el nivel INFO (DEBUG con -v);
+    en los modos no interactivos van a stderr y solo se muestran advertencias,
+    salvo que se pidan con -v (INFO) o -vv (DEBUG)
+    """
+    if interactivo:
+        nivel = logging.DEBUG if verbosidad >= 1 else logging.INFO
+        flujo = sys.stdout
+    else:
+        nivel = {0: logging.WARNING, 1: logging.INFO}.get(verbosidad, logging.DEBUG)
+        flujo = sys.stderr
+    logging.basicConfig(level=nivel, format='%(message)s', stream=flujo)
+
+def activar_cache_disco():
+    """
+    Activa la caché de compilación en disco para las ejecuciones del programa
+    en ~/.cache/afd; la variable de entorno AFD_CACHE_DIR cambia el directorio
+    y, vacía, la desactiva
+    """
+    directorio = os.environ.get('AFD_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'afd'))
+    establecer_directorio_cache(directorio or None)
+
 def main():
     """Función principal simplificada"""
+    args = parsear_argumentos()
+    configurar_logging(args.verbose, args.lote is None and args.archivo is None)
+    activar_cache_disco()
+    
+    # Modo lote: compilar muchas expresiones y emitir un resumen JSON-lines
+    if args.lote is not None:
+        try:
+            sys.exit(modo_lote(args.lote, construccion=args.construccion))
+        except OSError as e:
+            print(f"ERROR leyendo '{args.lote}': {e}", file=sys.stderr)
+            sys.exit(1)
+    
+    # Modo no interactivo: filtrar un archivo o stdin
+    if args.archivo is not None:
+        if not args.regexp:
+            print("ERROR: --archivo requiere --regexp", file=sys.stderr)
+            sys.exit(2)
+        sys.exit(modo_flujo(args.regexp, args.archivo, args.marcas, not args.sin_mmap, args.buscar,
+                            args.construccion))
+    
     try:
         # Limpiar pantalla y mostrar banner
         limpiar_pantalla()
@@ -327,7 +600,10 @@ def main():
         print(f"Conversor Regex -> AFN -> AFD -> AFD Minimal")
         print(f"=" * 70)
         
-        regexp = input("\nIngresa una expresión regular: ").strip()
+        if args.regexp:
+            regexp = args.regexp.strip()
+        else:
+            regexp = input("\nIngresa una expresión regular: ").strip()
         
         if not regexp:
             print("No ingresaste ninguna expresión regular.")
@@ -338,8 +614,26 @@ def main():
             print("Expresión regular inválida. Programa terminado.")
             return
         
+        # Elegir motor de simulación
+        print(f"\nMotores de simulación:")
+        if args.construccion in CONSTRUCCIONES_AFD:
+            print(f"   1. AFD minimal (Derivadas de {args.construccion.capitalize()} -> Hopcroft)")
+        else:
+            print(f"   1. AFD minimal ({args.construccion.capitalize()} -> Subconjuntos -> Hopcroft)")
+        print(f"   2. AFN directo (sin determinizar, para patrones cuyo AFD es muy grande)")
+        motor = input("Elige un motor [1]: ").strip()
+        
+        if motor == "2":
+            # Las construcciones de AFD directo no tienen AFN: se usa la de por defecto
+            construccion_afn = args.construccion if args.construccion in CONSTRUCCIONES else CONSTRUCCION_POR_DEFECTO
+            afn = construir_afn(simplificar_postfix(shunting_yard(regexp)), construccion_afn)
+            print(f"\nAFN creado con {len(afn.estados)} estados")
+            simulacion_interactiva(afn)
+            print(f"\nPrograma completado exitosamente!")
+            return
+        
         # Construir autómata completo
-        afd_minimal = construir_automata_completo(regexp)
+        afd_minimal = construir_automata_completo(regexp, construccion=args.construccion)
         
         if afd_minimal is None:
             print("Error construyendo autómata. Programa terminado.")
@@ -350,7 +644,7 @@ def main():
         simulacion_interactiva(afd_minimal)
         
         print(f"\nPrograma completado exitosamente!")
-        
+    
     except KeyboardInterrupt:
         print(f"\n\nPrograma interrumpido por el usuario.")
     except Exception as e:
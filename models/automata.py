@@ -1,11 +1,17 @@
 ### Estructura Base del Proyecto - Clases y Tipos de Datos ###
-from typing import Set, Dict, List, Tuple, Optional
+from typing import Set, Dict, FrozenSet, List, Tuple, Optional
 import json
+import mmap
+import struct
+import sys
+from array import array
 from collections import defaultdict, deque
-from graphviz import Digraph
+from types import MappingProxyType
 
 class Estado:
     """Representa un estado en el autómata"""
+    __slots__ = ('id', 'es_aceptacion')
+    
     def __init__(self, id: int, es_aceptacion: bool = False):
         self.id = id
         self.es_aceptacion = es_aceptacion
@@ -21,6 +27,8 @@ class Estado:
 
 class Transicion:
     """Representa una transición en el autómata"""
+    __slots__ = ('origen', 'simbolo', 'destino')
+    
     def __init__(self, origen: int, simbolo: str, destino: int):
         self.origen = origen
         self.simbolo = simbolo  # 'ε' para epsilon
@@ -29,15 +37,72 @@ class Transicion:
     def __repr__(self):
         return f"({self.origen}, {self.simbolo}, {self.destino})"
 
+class ListaTransiciones:
+    """
+    Lista de transiciones guardada en arreglos paralelos de enteros
+    
+    Cada transición ocupa 12 bytes (origen, id de símbolo y destino en
+    array('i')) en lugar de un objeto por transición; los símbolos se guardan
+    una sola vez en una tabla. Al iterar o indexar se obtienen objetos
+    Transicion creados al vuelo (vistas, modificarlos no altera la lista).
+    """
+    __slots__ = ('origenes', 'ids_simbolos', 'destinos', 'simbolos', 'simbolo_a_id')
+    
+    def __init__(self):
+        self.origenes = array('i')
+        self.ids_simbolos = array('i')
+        self.destinos = array('i')
+        self.simbolos: List[str] = []
+        self.simbolo_a_id: Dict[str, int] = {}
+    
+    def agregar(self, origen: int, simbolo: str, destino: int):
+        """Agrega una transición"""
+        id_simbolo = self.simbolo_a_id.get(simbolo)
+        if id_simbolo is None:
+            id_simbolo = self.simbolo_a_id[simbolo] = len(self.simbolos)
+            self.simbolos.append(simbolo)
+        self.origenes.append(origen)
+        self.ids_simbolos.append(id_simbolo)
+        self.destinos.append(destino)
+    
+    def append(self, transicion: Transicion):
+        """Compatibilidad con list.append"""
+        self.agregar(transicion.origen, transicion.simbolo, transicion.destino)
+    
+    def tuplas(self):
+        """Genera las transiciones como tuplas (origen, simbolo, destino), sin crear objetos Transicion"""
+        simbolos = self.simbolos
+        for origen, id_simbolo, destino in zip(self.origenes, self.ids_simbolos, self.destinos):
+            yield origen, simbolos[id_simbolo], destino
+    
+    def __iter__(self):
+        for origen, simbolo, destino in self.tuplas():
+            yield Transicion(origen, simbolo, destino)
+    
+    def __len__(self):
+        return len(self.origenes)
+    
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+        return Transicion(self.origenes[indice], self.simbolos[self.ids_simbolos[indice]],
+                          self.destinos[indice])
+    
+    def __repr__(self):
+        return repr(list(self))
+
 class Automata:
     """Clase base para AFN y AFD"""
     def __init__(self):
         self.estados: Dict[int, Estado] = {}
         self.alfabeto: Set[str] = set()
-        self.transiciones: List[Transicion] = []
+        self.transiciones = ListaTransiciones()
         self.estado_inicial: int = 0
         self.estados_aceptacion: Set[int] = set()
         self.contador_estados = 0
+        # Índices de adyacencia: estado -> símbolo -> destinos, y estado -> destinos por ε
+        self.adyacencia: Dict[int, Dict[str, Set[int]]] = {}
+        self.adyacencia_epsilon: Dict[int, Set[int]] = {}
     
     def agregar_estado(self, es_aceptacion: bool = False) -> int:
         """Agrega un nuevo estado y retorna su ID"""
@@ -50,10 +115,26 @@ class Automata:
     
     def agregar_transicion(self, origen: int, simbolo: str, destino: int):
         """Agrega una transición"""
-        self.transiciones.append(Transicion(origen, simbolo, destino))
+        self.transiciones.agregar(origen, simbolo, destino)
+        self._indexar_transicion(origen, simbolo, destino)
         if simbolo != 'ε':  # epsilon no va en el alfabeto
             self.alfabeto.add(simbolo)
     
+    def _indexar_transicion(self, origen: int, simbolo: str, destino: int):
+        """Registra la transición en los índices de adyacencia"""
+        if simbolo == EPSILON:
+            self.adyacencia_epsilon.setdefault(origen, set()).add(destino)
+        else:
+            self.adyacencia.setdefault(origen, {}).setdefault(simbolo, set()).add(destino)
+    
+    def obtener_destinos(self, estado: int, simbolo: str) -> Set[int]:
+        """Retorna los estados alcanzables desde 'estado' con 'simbolo' (sin ε-clausura)"""
+        return self.adyacencia.get(estado, {}).get(simbolo, set())
+    
+    def obtener_destinos_epsilon(self, estado: int) -> Set[int]:
+        """Retorna los estados alcanzables desde 'estado' con una transición ε"""
+        return self.adyacencia_epsilon.get(estado, set())
+    
     def establecer_inicial(self, estado: int):
         """Establece el estado inicial"""
         self.estado_inicial = estado
@@ -64,75 +145,655 @@ class Automata:
             self.estados[estado].es_aceptacion = True
             self.estados_aceptacion.add(estado)
     
-    def exportar_json(self, nombre_archivo: str):
-        """Exporta el autómata a formato JSON"""
+    def exportar_json(self, nombre_archivo: str, compacto: bool = False):
+        """
+        Exporta el autómata a formato JSON
+        Con compacto=True se escribe sin sangría ni espacios (mucho más pequeño
+        para autómatas grandes)
+        """
         automata_dict = {
             "ESTADOS": list(self.estados.keys()),
             "SIMBOLOS": sorted(list(self.alfabeto)),
             "INICIO": self.estado_inicial,
             "ACEPTACION": sorted(list(self.estados_aceptacion)),
-            "TRANSICIONES": [(t.origen, t.simbolo, t.destino) for t in self.transiciones]
+            "TRANSICIONES": list(self.transiciones.tuplas())
         }
         
         with open(nombre_archivo, 'w', encoding='utf-8') as f:
-            json.dump(automata_dict, f, indent=2, ensure_ascii=False)
+            if compacto:
+                json.dump(automata_dict, f, separators=(',', ':'), ensure_ascii=False)
+            else:
+                json.dump(automata_dict, f, indent=2, ensure_ascii=False)
     
-    def visualizar(self, nombre_archivo: str = "automata"):
-        """Genera visualización con Graphviz"""
-        dot = Digraph(comment='Autómata')
-        dot.attr(rankdir='LR')
+    @classmethod
+    def importar_json(cls, nombre_archivo: str) -> 'Automata':
+        """
+        Reconstruye un autómata escrito con exportar_json
+        
+        Se llama sobre la clase deseada (AFN.importar_json o AFD.importar_json;
+        desde Automata se obtiene un AFN). El arreglo TRANSICIONES se lee de
+        forma incremental y cada transición se agrega directamente a los
+        índices, sin cargar el archivo completo en memoria
+        """
+        if cls is Automata:
+            cls = AFN
+        automata = cls()
+        campos = {}
+        pendientes = []
+        
+        with open(nombre_archivo, encoding='utf-8') as f:
+            lector = _LectorJSON(f)
+            lector.consumir('{')
+            if lector.siguiente_caracter() == '}':
+                lector.consumir('}')
+            else:
+                while True:
+                    clave = lector.leer_valor()
+                    lector.consumir(':')
+                    
+                    if clave == "TRANSICIONES":
+                        # Si los estados ya se leyeron, las transiciones se agregan al vuelo
+                        if "ESTADOS" in campos:
+                            automata._importar_estados(campos)
+                        for origen, simbolo, destino in lector.iterar_arreglo():
+                            if "ESTADOS" in campos:
+                                automata.agregar_transicion(origen, simbolo, destino)
+                            else:
+                                pendientes.append((origen, simbolo, destino))
+                    else:
+                        campos[clave] = lector.leer_valor()
+                    
+                    if lector.siguiente_caracter() == ',':
+                        lector.consumir(',')
+                    else:
+                        lector.consumir('}')
+                        break
+        
+        if not automata.estados:
+            automata._importar_estados(campos)
+        for origen, simbolo, destino in pendientes:
+            automata.agregar_transicion(origen, simbolo, destino)
+        
+        automata.alfabeto.update(campos.get("SIMBOLOS", []))
+        automata.establecer_inicial(campos.get("INICIO", 0))
+        for estado in campos.get("ACEPTACION", []):
+            automata.establecer_aceptacion(estado)
+        return automata
+    
+    def _importar_estados(self, campos: dict):
+        """Crea los estados de la lista ESTADOS conservando sus ids"""
+        if self.estados:
+            return
+        for id_estado in campos.get("ESTADOS", []):
+            self.contador_estados = id_estado
+            self.agregar_estado()
+        self.contador_estados = max(self.estados, default=-1) + 1
+    
+    def a_dot(self, fusionar_aristas: bool = False) -> str:
+        """
+        Genera la descripción del autómata en lenguaje DOT
+        
+        Con fusionar_aristas=True las transiciones paralelas entre el mismo
+        par de estados se dibujan como una sola arista con todos los símbolos
+        """
+        lineas = ['// Autómata', 'digraph {', '\trankdir=LR']
         
         # Estados
         for id_estado, estado in self.estados.items():
-            if estado.es_aceptacion:
-                dot.node(str(id_estado), f'q{id_estado}', shape='doublecircle')
-            else:
-                dot.node(str(id_estado), f'q{id_estado}', shape='circle')
+            forma = 'doublecircle' if estado.es_aceptacion else 'circle'
+            lineas.append(f'\t{id_estado} [label=q{id_estado} shape={forma}]')
         
         # Estado inicial
-        dot.node('start', '', shape='point')
-        dot.edge('start', str(self.estado_inicial))
+        lineas.append('\tstart [label="" shape=point]')
+        lineas.append(f'\tstart -> {self.estado_inicial}')
         
         # Transiciones
-        for transicion in self.transiciones:
-            dot.edge(str(transicion.origen), str(transicion.destino), 
-                    label=transicion.simbolo)
+        if fusionar_aristas:
+            etiquetas = defaultdict(list)
+            for origen, simbolo, destino in self.transiciones.tuplas():
+                etiquetas[(origen, destino)].append(simbolo)
+            aristas = [(origen, destino, ','.join(sorted(simbolos)))
+                       for (origen, destino), simbolos in etiquetas.items()]
+        else:
+            aristas = [(origen, destino, simbolo) for origen, simbolo, destino in self.transiciones.tuplas()]
+        
+        for origen, destino, etiqueta in aristas:
+            etiqueta = etiqueta.replace('\\', '\\\\').replace('"', '\\"')
+            lineas.append(f'\t{origen} -> {destino} [label="{etiqueta}"]')
+        
+        lineas.append('}')
+        return '\n'.join(lineas) + '\n'
+    
+    def visualizar(self, nombre_archivo: str = "automata", render: bool = True,
+                   limite_estados: Optional[int] = None) -> str:
+        """
+        Genera visualización con Graphviz y retorna el nombre del archivo creado
         
-        dot.render(nombre_archivo, format='png', cleanup=True)
+        Con render=False solo se escribe el archivo .dot (no requiere Graphviz).
+        Si el autómata tiene más de 'limite_estados' estados (por defecto
+        LIMITE_RENDERIZADO), las transiciones
+        paralelas se fusionan y no se genera el PNG, porque el programa dot
+        tarda más en dibujarlo que los algoritmos en construirlo
+        """
+        if limite_estados is None:
+            limite_estados = LIMITE_RENDERIZADO
+        grande = len(self.estados) > limite_estados
+        texto = self.a_dot(fusionar_aristas=grande)
+        
+        if not render or grande:
+            with open(f"{nombre_archivo}.dot", 'w', encoding='utf-8') as f:
+                f.write(texto)
+            return f"{nombre_archivo}.dot"
+        
+        # Importación diferida: graphviz solo se necesita para dibujar
+        from graphviz import Source
+        Source(texto).render(nombre_archivo, format='png', cleanup=True)
         return f"{nombre_archivo}.png"
 
+class _LectorJSON:
+    """
+    Lector JSON incremental: lee el archivo por bloques y decodifica un
+    valor a la vez con json.JSONDecoder.raw_decode
+    """
+    TAMANO_BLOQUE = 1 << 16
+    
+    def __init__(self, archivo):
+        self.archivo = archivo
+        self.buffer = ''
+        self.posicion = 0
+        self.terminado = False
+        self.decodificador = json.JSONDecoder()
+    
+    def _leer_bloque(self) -> bool:
+        """Agrega un bloque al buffer descartando lo ya consumido"""
+        bloque = self.archivo.read(self.TAMANO_BLOQUE)
+        if not bloque:
+            self.terminado = True
+            return False
+        self.buffer = self.buffer[self.posicion:] + bloque
+        self.posicion = 0
+        return True
+    
+    def siguiente_caracter(self) -> str:
+        """Salta espacios y retorna el siguiente carácter sin consumirlo ('' al final)"""
+        while True:
+            while self.posicion < len(self.buffer) and self.buffer[self.posicion] in ' \t\r\n':
+                self.posicion += 1
+            if self.posicion < len(self.buffer):
+                return self.buffer[self.posicion]
+            if not self._leer_bloque():
+                return ''
+    
+    def consumir(self, esperado: str):
+        """Consume el carácter esperado o falla"""
+        caracter = self.siguiente_caracter()
+        if caracter != esperado:
+            raise ValueError(f"JSON inválido: se esperaba '{esperado}' y se encontró '{caracter}'")
+        self.posicion += 1
+    
+    def leer_valor(self):
+        """Decodifica el siguiente valor JSON completo"""
+        self.siguiente_caracter()
+        while True:
+            try:
+                valor, fin = self.decodificador.raw_decode(self.buffer, self.posicion)
+                # Un número al final del buffer podría continuar en el siguiente bloque
+                if fin < len(self.buffer) or self.terminado:
+                    self.posicion = fin
+                    return valor
+            except json.JSONDecodeError as e:
+                if self.terminado:
+                    raise ValueError(f"JSON inválido: {e}") from e
+            self._leer_bloque()
+    
+    def iterar_arreglo(self):
+        """Genera los elementos del arreglo que empieza en la posición actual"""
+        self.consumir('[')
+        if self.siguiente_caracter() == ']':
+            self.consumir(']')
+            return
+        while True:
+            yield self.leer_valor()
+            if self.siguiente_caracter() == ',':
+                self.consumir(',')
+            else:
+                self.consumir(']')
+                return
+
 class AFN(Automata):
     """Autómata Finito No Determinista"""
-    pass
+    def __init__(self):
+        super().__init__()
+        self._clausuras: Optional[Dict[int, FrozenSet[int]]] = None
+    
+    def agregar_estado(self, es_aceptacion: bool = False) -> int:
+        self._clausuras = None
+        return super().agregar_estado(es_aceptacion)
+    
+    def _indexar_transicion(self, origen: int, simbolo: str, destino: int):
+        if simbolo == EPSILON:
+            self._clausuras = None
+        super()._indexar_transicion(origen, simbolo, destino)
+    
+    def clausura_epsilon(self, estado: int) -> FrozenSet[int]:
+        """Retorna la ε-clausura precalculada de un estado"""
+        if self._clausuras is None:
+            self._clausuras = self.calcular_clausuras_epsilon()
+        clausura = self._clausuras.get(estado)
+        return clausura if clausura is not None else frozenset((estado,))
+    
+    def calcular_clausuras_epsilon(self) -> Dict[int, FrozenSet[int]]:
+        """
+        Calcula la ε-clausura de todos los estados.
+        
+        Condensa el grafo de transiciones ε en componentes fuertemente conexas
+        (Tarjan iterativo). Los estados de una componente comparten la misma
+        clausura, y como Tarjan cierra las componentes en orden topológico
+        inverso, cada una se obtiene uniendo las clausuras ya calculadas de
+        sus sucesoras.
+        """
+        indice: Dict[int, int] = {}
+        bajo: Dict[int, int] = {}
+        pila: List[int] = []
+        en_pila: Set[int] = set()
+        clausuras: Dict[int, FrozenSet[int]] = {}
+        contador = 0
+        
+        for raiz in self.estados:
+            if raiz in indice:
+                continue
+            
+            indice[raiz] = bajo[raiz] = contador
+            contador += 1
+            pila.append(raiz)
+            en_pila.add(raiz)
+            trabajo = [(raiz, iter(self.obtener_destinos_epsilon(raiz)))]
+            
+            while trabajo:
+                estado, sucesores = trabajo[-1]
+                
+                # Avanzar al siguiente sucesor no visitado (DFS)
+                descendio = False
+                for sucesor in sucesores:
+                    if sucesor not in indice:
+                        indice[sucesor] = bajo[sucesor] = contador
+                        contador += 1
+                        pila.append(sucesor)
+                        en_pila.add(sucesor)
+                        trabajo.append((sucesor, iter(self.obtener_destinos_epsilon(sucesor))))
+                        descendio = True
+                        break
+                    if sucesor in en_pila:
+                        bajo[estado] = min(bajo[estado], indice[sucesor])
+                if descendio:
+                    continue
+                
+                trabajo.pop()
+                if trabajo:
+                    padre = trabajo[-1][0]
+                    bajo[padre] = min(bajo[padre], bajo[estado])
+                
+                if bajo[estado] != indice[estado]:
+                    continue
+                
+                # 'estado' es raíz de una componente: sacarla de la pila
+                componente = []
+                while True:
+                    miembro = pila.pop()
+                    en_pila.discard(miembro)
+                    componente.append(miembro)
+                    if miembro == estado:
+                        break
+                
+                clausura = set(componente)
+                for miembro in componente:
+                    for sucesor in self.obtener_destinos_epsilon(miembro):
+                        if sucesor not in clausura:
+                            clausura |= clausuras[sucesor]
+                
+                clausura = frozenset(clausura)
+                for miembro in componente:
+                    clausuras[miembro] = clausura
+        
+        return clausuras
 
 class AFD(Automata):
-    """Autómata Finito Determinista"""
+    """
+    Autómata Finito Determinista
+    
+    En lugar de la adyacencia por conjuntos usa una tabla estado -> símbolo -> destino
+    """
+    def __init__(self):
+        super().__init__()
+        self.tabla: Dict[int, Dict[str, int]] = {}
+        self._compilado: Optional['AFDCompilado'] = None
+    
+    def agregar_estado(self, es_aceptacion: bool = False) -> int:
+        self._compilado = None
+        return super().agregar_estado(es_aceptacion)
+    
+    def establecer_inicial(self, estado: int):
+        self._compilado = None
+        super().establecer_inicial(estado)
+    
+    def establecer_aceptacion(self, estado: int):
+        self._compilado = None
+        super().establecer_aceptacion(estado)
+    
+    def agregar_transicion(self, origen: int, simbolo: str, destino: int):
+        """
+        Agrega una transición. Cada par (origen, símbolo) tiene un solo destino:
+        repetir la misma transición no tiene efecto y una con otro destino es un
+        error (así 'transiciones' y 'tabla' no pueden diferir)
+        """
+        actual = self.tabla.get(origen, {}).get(simbolo)
+        if actual is not None:
+            if actual == destino:
+                return
+            raise ValueError(f"Transición no determinista: q{origen} con '{simbolo}' "
+                             f"ya va a q{actual} (se intentó agregar q{destino})")
+        super().agregar_transicion(origen, simbolo, destino)
+    
+    def _indexar_transicion(self, origen: int, simbolo: str, destino: int):
+        """Registra la transición en la tabla"""
+        self._compilado = None
+        self.tabla.setdefault(origen, {})[simbolo] = destino
+    
+    def obtener_destino(self, estado: int, simbolo: str) -> Optional[int]:
+        """Obtiene el estado destino para una transición dada"""
+        return self.tabla.get(estado, {}).get(simbolo)
+    
+    def obtener_destinos(self, estado: int, simbolo: str) -> Set[int]:
+        destino = self.obtener_destino(estado, simbolo)
+        return set() if destino is None else {destino}
+    
+    def obtener_destinos_epsilon(self, estado: int) -> Set[int]:
+        return set()
+    
+    def compilar(self) -> 'AFDCompilado':
+        """
+        Retorna la forma compilada (tabla densa) del AFD.
+        Se reutiliza mientras el AFD no se modifique.
+        """
+        if self._compilado is None:
+            self._compilado = AFDCompilado(self)
+        return self._compilado
     
     def simular(self, cadena: str) -> Tuple[bool, List[int]]:
         """Simula la ejecución de una cadena y retorna si es aceptada y la secuencia de estados"""
-        estado_actual = self.estado_inicial
-        secuencia_estados = [estado_actual]
+        return self.compilar().simular(cadena)
+    
+    def guardar(self, ruta: str):
+        """Guarda el AFD compilado en el formato binario (ver AFDCompilado.guardar)"""
+        self.compilar().guardar(ruta)
+    
+    @staticmethod
+    def cargar(ruta: str) -> 'AFDCompilado':
+        """Carga un AFD guardado con guardar(), listo para simular y sin reconstruirlo"""
+        return AFDCompilado.cargar(ruta)
+
+class AFDCompilado:
+    """
+    AFD compilado a una tabla densa para simulación rápida
+    
+    - Los símbolos se mapean a ids (columnas) contiguos 0..k-1; con clases de
+      equivalencia varios símbolos comparten columna y 'simbolos' guarda el
+      representante de cada una
+    - Los estados se mapean a índices contiguos 0..n-1
+    - δ se guarda en un array('i') plano de n*k enteros: delta[estado * k + simbolo]
+    - ESTADO_MUERTO marca las transiciones inexistentes
+    - aceptacion es un bytearray con 1 en los estados de aceptación
+    
+    Formato binario (guardar/cargar), little-endian:
+    
+    - Encabezado: FORMATO_BINARIO (magia, versión, campo reservado, nº de
+      estados, nº de símbolos, estado inicial y bytes de la tabla de símbolos)
+    - Tabla de símbolos: por cada símbolo, su largo (uint16), su UTF-8 y su
+      columna (int32)
+    - Relleno hasta múltiplo de 4 bytes
+    - Ids originales de los estados: n int32
+    - Matriz de transiciones: n*k int32 (ESTADO_MUERTO = sin transición)
+    - Mapa de bits de aceptación: ceil(n/8) bytes
+    """
+    def __init__(self, afd: AFD, clases: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            afd: AFD a compilar
+            clases: Mapa símbolo -> representante de su clase de equivalencia,
+                    si el AFD se construyó sobre el alfabeto comprimido
+        """
+        self.estados: List[int] = sorted(afd.estados.keys())
+        self.estado_a_indice: Dict[int, int] = {e: i for i, e in enumerate(self.estados)}
+        self.simbolos: List[str] = sorted(afd.alfabeto)
+        self.simbolo_a_id: Dict[str, int] = {s: i for i, s in enumerate(self.simbolos)}
+        self.num_simbolos = len(self.simbolos)
+        
+        # Cada símbolo usa la columna de su representante
+        for simbolo, representante in (clases or {}).items():
+            columna = self.simbolo_a_id.get(representante)
+            if columna is not None:
+                self.simbolo_a_id.setdefault(simbolo, columna)
+        
+        k = self.num_simbolos
+        self.delta = array('i', [ESTADO_MUERTO]) * (len(self.estados) * k)
+        for origen, fila in afd.tabla.items():
+            base = self.estado_a_indice[origen] * k
+            for simbolo, destino in fila.items():
+                self.delta[base + self.simbolo_a_id[simbolo]] = self.estado_a_indice[destino]
+        
+        self.aceptacion = bytearray(len(self.estados))
+        for estado in afd.estados_aceptacion:
+            self.aceptacion[self.estado_a_indice[estado]] = 1
+        
+        self.estado_inicial_original = afd.estado_inicial
+        self.inicial = self.estado_a_indice.get(afd.estado_inicial, ESTADO_MUERTO)
+    
+    def ejecutar(self, cadena: str) -> int:
+        """Retorna el índice del estado final alcanzado, o ESTADO_MUERTO si se bloquea"""
+        estado = self.inicial
+        delta = self.delta
+        k = self.num_simbolos
+        simbolo_a_id = self.simbolo_a_id
         
         for simbolo in cadena:
-            if simbolo not in self.alfabeto:
-                return False, secuencia_estados
-            
-            # Buscar transición
-            transicion_encontrada = False
-            for t in self.transiciones:
-                if t.origen == estado_actual and t.simbolo == simbolo:
-                    estado_actual = t.destino
-                    secuencia_estados.append(estado_actual)
-                    transicion_encontrada = True
-                    break
-            
-            if not transicion_encontrada:
-                return False, secuencia_estados
+            if estado < 0:
+                return ESTADO_MUERTO
+            id_simbolo = simbolo_a_id.get(simbolo)
+            if id_simbolo is None:
+                return ESTADO_MUERTO
+            estado = delta[estado * k + id_simbolo]
         
-        es_aceptada = estado_actual in self.estados_aceptacion
-        return es_aceptada, secuencia_estados
+        return estado
+    
+    def acepta(self, cadena: str) -> bool:
+        """Retorna si la cadena es aceptada"""
+        estado = self.ejecutar(cadena)
+        return estado >= 0 and self.aceptacion[estado] == 1
+    
+    def simular(self, cadena: str) -> Tuple[bool, List[int]]:
+        """
+        Igual que AFD.simular: retorna si es aceptada y la secuencia de estados
+        (con los ids originales del AFD) hasta donde se pudo avanzar
+        """
+        estado = self.inicial
+        if estado < 0:
+            return False, [self.estado_inicial_original]
+        
+        delta = self.delta
+        k = self.num_simbolos
+        simbolo_a_id = self.simbolo_a_id
+        secuencia = [estado]
+        
+        for simbolo in cadena:
+            id_simbolo = simbolo_a_id.get(simbolo)
+            if id_simbolo is None:
+                break
+            estado = delta[estado * k + id_simbolo]
+            if estado < 0:
+                break
+            secuencia.append(estado)
+        else:
+            return self.aceptacion[estado] == 1, [self.estados[e] for e in secuencia]
+        
+        return False, [self.estados[e] for e in secuencia]
+    
+    def compilar(self) -> 'AFDCompilado':
+        """Ya está compilado: permite usarlo donde se espera un AFD"""
+        return self
+    
+    def solo_lectura(self) -> 'AFDCompilado':
+        """
+        Retorna una copia inmutable (ver AFDCompiladoInmutable) que se puede
+        compartir entre hilos; este objeto no se modifica
+        """
+        return AFDCompiladoInmutable(self)
+    
+    def guardar(self, ruta: str):
+        """Escribe el AFD compilado en el formato binario versionado"""
+        n = len(self.estados)
+        k = self.num_simbolos
+        
+        tabla_simbolos = bytearray()
+        for simbolo, columna in self.simbolo_a_id.items():
+            codificado = simbolo.encode('utf-8')
+            tabla_simbolos += struct.pack('<H', len(codificado)) + codificado + struct.pack('<i', columna)
+        
+        mapa_aceptacion = bytearray((n + 7) // 8)
+        for indice in range(n):
+            if self.aceptacion[indice]:
+                mapa_aceptacion[indice >> 3] |= 1 << (indice & 7)
+        
+        estados = array('i', self.estados)
+        delta = array('i', self.delta)
+        if sys.byteorder != 'little':
+            estados.byteswap()
+            delta.byteswap()
+        
+        encabezado = struct.pack(FORMATO_BINARIO, MAGIA_BINARIO, VERSION_BINARIO, 0,
+                                 n, k, self.inicial, len(tabla_simbolos))
+        relleno = -(len(encabezado) + len(tabla_simbolos)) % 4
+        
+        with open(ruta, 'wb') as f:
+            f.write(encabezado)
+            f.write(tabla_simbolos)
+            f.write(bytes(relleno))
+            f.write(estados.tobytes())
+            f.write(delta.tobytes())
+            f.write(mapa_aceptacion)
+    
+    @classmethod
+    def cargar(cls, ruta: str) -> 'AFDCompilado':
+        """
+        Mapea en memoria un archivo escrito con guardar(). La matriz de
+        transiciones se usa directamente desde el mapa, sin copiarla ni
+        interpretarla; solo se decodifican la tabla de símbolos y los estados
+        """
+        with open(ruta, 'rb') as f:
+            try:
+                mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # un archivo vacío no se puede mapear
+                raise ValueError(f"'{ruta}' no es un AFD compilado (archivo demasiado corto)") from None
+        
+        tamano_encabezado = struct.calcsize(FORMATO_BINARIO)
+        if len(mapa) < tamano_encabezado:
+            raise ValueError(f"'{ruta}' no es un AFD compilado (archivo demasiado corto)")
+        magia, version, _, n, k, inicial, bytes_simbolos = struct.unpack_from(FORMATO_BINARIO, mapa)
+        if magia != MAGIA_BINARIO:
+            raise ValueError(f"'{ruta}' no es un AFD compilado")
+        if version != VERSION_BINARIO:
+            raise ValueError(f"'{ruta}': versión de formato {version} no soportada "
+                             f"(se esperaba {VERSION_BINARIO})")
+        
+        posicion = tamano_encabezado
+        fin_simbolos = posicion + bytes_simbolos
+        simbolo_a_id = {}
+        simbolos = [None] * k
+        while posicion < fin_simbolos:
+            (largo,) = struct.unpack_from('<H', mapa, posicion)
+            posicion += 2
+            simbolo = mapa[posicion:posicion + largo].decode('utf-8')
+            (columna,) = struct.unpack_from('<i', mapa, posicion + largo)
+            posicion += largo + 4
+            if not 0 <= columna < k:
+                raise ValueError(f"'{ruta}' está dañado (columna de símbolo inválida)")
+            simbolo_a_id[simbolo] = columna
+            # El representante de cada columna es su símbolo menor
+            if simbolos[columna] is None or simbolo < simbolos[columna]:
+                simbolos[columna] = simbolo
+        posicion += -posicion % 4
+        
+        fin_estados = posicion + 4 * n
+        fin_delta = fin_estados + 4 * n * k
+        if len(mapa) < fin_delta + (n + 7) // 8 or None in simbolos:
+            raise ValueError(f"'{ruta}' está truncado o dañado")
+        
+        if sys.byteorder == 'little':
+            estados = memoryview(mapa)[posicion:fin_estados].cast('i').tolist()
+            delta = memoryview(mapa)[fin_estados:fin_delta].cast('i')
+        else:
+            estados = array('i', mapa[posicion:fin_estados])
+            estados.byteswap()
+            estados = estados.tolist()
+            delta = array('i', mapa[fin_estados:fin_delta])
+            delta.byteswap()
+        
+        mapa_aceptacion = mapa[fin_delta:fin_delta + (n + 7) // 8]
+        aceptacion = bytearray(n)
+        for indice in range(n):
+            if mapa_aceptacion[indice >> 3] >> (indice & 7) & 1:
+                aceptacion[indice] = 1
+        
+        compilado = cls.__new__(cls)
+        compilado.estados = estados
+        compilado.estado_a_indice = {e: i for i, e in enumerate(estados)}
+        compilado.simbolos = simbolos
+        compilado.simbolo_a_id = simbolo_a_id
+        compilado.num_simbolos = k
+        compilado.delta = delta
+        compilado.aceptacion = aceptacion
+        compilado.inicial = inicial
+        compilado.estado_inicial_original = estados[inicial] if inicial >= 0 else None
+        compilado._mapa = mapa
+        return compilado
+
+class AFDCompiladoInmutable(AFDCompilado):
+    """
+    Copia de un AFDCompilado que no se puede modificar: las tablas se copian
+    a contenedores de solo lectura (tuplas, MappingProxyType, bytes y una
+    memoryview de solo lectura de δ) y asignar o borrar atributos falla
+    """
+    def __init__(self, compilado: AFDCompilado):
+        delta = array('i')
+        delta.frombytes(memoryview(compilado.delta).cast('B'))
+        
+        fijar = object.__setattr__
+        fijar(self, 'estados', tuple(compilado.estados))
+        fijar(self, 'estado_a_indice', MappingProxyType(dict(compilado.estado_a_indice)))
+        fijar(self, 'simbolos', tuple(compilado.simbolos))
+        fijar(self, 'simbolo_a_id', MappingProxyType(dict(compilado.simbolo_a_id)))
+        fijar(self, 'num_simbolos', compilado.num_simbolos)
+        fijar(self, 'delta', memoryview(delta).toreadonly())
+        fijar(self, 'aceptacion', bytes(compilado.aceptacion))
+        fijar(self, 'inicial', compilado.inicial)
+        fijar(self, 'estado_inicial_original', compilado.estado_inicial_original)
+    
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("AFDCompiladoInmutable es inmutable")
+    
+    def __delattr__(self, nombre):
+        raise AttributeError("AFDCompiladoInmutable es inmutable")
+    
+    def solo_lectura(self) -> 'AFDCompilado':
+        """Ya es inmutable: no hace falta copiarlo"""
+        return self
 
 # Constantes
 EPSILON = 'ε'  # Símbolo para epsilon
+ESTADO_MUERTO = -1  # Destino de las transiciones inexistentes en AFDCompilado
+LIMITE_RENDERIZADO = 300  # Máximo de estados que visualizar dibuja como PNG
+# Formato binario de AFDCompilado: magia, versión, reservado, estados, símbolos, inicial, bytes de símbolos
+FORMATO_BINARIO = '<4sHHIIiI'
+MAGIA_BINARIO = b'AFDC'
+VERSION_BINARIO = 2
 OPERADORES = {'|', '*', '+', '(', ')'}
 PRECEDENCIA = {'|': 1, '+': 2, '*': 2, '(': 0}
@@ -1,4 +1,4 @@
-from .automata import Estado, Transicion, Automata, AFN, AFD, EPSILON
+from .automata import Estado, Transicion, ListaTransiciones, Automata, AFN, AFD, AFDCompilado, EPSILON
 from AFD.fragmento_afn import FragmentoAFN
 
-__all__ = ['Estado', 'Transicion', 'Automata', 'AFN', 'AFD', 'EPSILON', 'FragmentoAFN']
\ No newline at end of file
+__all__ = ['Estado', 'Transicion', 'ListaTransiciones', 'Automata', 'AFN', 'AFD', 'AFDCompilado', 'EPSILON', 'FragmentoAFN']
\ No newline at end of file